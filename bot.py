@@ -4,15 +4,28 @@ Teeshoot Telegram Bot - Compact Version with Admin Price Management
 
 import os
 import re
+import pickle
+import sys
 import json
+import bisect
+import functools
+import heapq
+import itertools
 import time
+import asyncio
 import logging
-from dataclasses import dataclass, field, asdict
-from typing import Dict, Any, Optional, List
+import sqlite3
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, make_dataclass
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timezone, timedelta
 
 from telegram import Update, ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton, InputMediaPhoto
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -29,6 +42,24 @@ ADMIN_IDS = {CLIENT_ID}  # Set with the main owner, others can be added
 
 
 def now_ng(): return datetime.now(NIGERIA_TZ).strftime("%Y-%m-%d %H:%M:%S")
+def now_ts() -> int: return int(time.time())
+
+_NG_OFFSET = int(NIGERIA_TZ.utcoffset(None).total_seconds())  # fixed, no DST
+
+@functools.lru_cache(maxsize=4096)
+def _ng_date(day: int) -> str: return datetime.fromtimestamp(day * 86400, timezone.utc).strftime("%Y-%m-%d")
+
+def fmt_ts(ts: int) -> str:
+    """Epoch seconds as YYYY-MM-DD HH:MM:SS Nigeria time; runs for every record encoded"""
+    local = ts + _NG_OFFSET
+    secs = local % 86400
+    return f"{_ng_date(local // 86400)} {secs // 3600:02d}:{secs // 60 % 60:02d}:{secs % 60:02d}"
+
+def parse_ts(value: Any) -> int:
+    """Epoch seconds from a stored timestamp ("YYYY-MM-DD HH:MM:SS" Nigeria time, or a number)"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(datetime.fromisoformat(value).replace(tzinfo=NIGERIA_TZ).timestamp())
 
 # Dynamic pricing structure with model-specific prices
 ITEM_PRICES: Dict[str, Dict[str, int]] = {
@@ -55,7 +86,7 @@ PAYMENT_INFO = {
     "bank_name": "First Bank"  # You can change this
 }
 
-@dataclass
+@dataclass(slots=True)
 class UserProfile:
     name: str = ""
     phone: str = ""
@@ -67,8 +98,9 @@ class UserProfile:
     last_order: str = "None"
     preferred_tech: str = ""
     notifications_enabled: bool = True
+    version: int = 0  # bumped on every write; see _merge_entity()
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     user_id: int
     username: Optional[str]
@@ -76,9 +108,10 @@ class Order:
     item: str
     details: Dict[str, Any] = field(default_factory=dict)
     status: str = "collecting_info"
-    timestamp: str = field(default_factory=now_ng)
+    timestamp: int = field(default_factory=now_ts)  # epoch seconds; stored as text
+    version: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     user_id: int
     username: Optional[str]
@@ -86,18 +119,20 @@ class Issue:
     type: str
     details: Dict[str, Any] = field(default_factory=dict)
     status: str = "reported"
-    timestamp: str = field(default_factory=now_ng)
+    timestamp: int = field(default_factory=now_ts)  # epoch seconds; stored as text
+    version: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class CallbackReq:
     user_id: int
     username: Optional[str]
     name: str
     phone_and_issue: str
     status: str = "pending"
-    timestamp: str = field(default_factory=now_ng)
+    timestamp: int = field(default_factory=now_ts)  # epoch seconds; stored as text
+    version: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Inquiry:
     user_id: int
     username: Optional[str]
@@ -105,7 +140,8 @@ class Inquiry:
     inquiry_type: str
     inquiry_text: str
     status: str = "pending_response"
-    timestamp: str = field(default_factory=now_ng)
+    timestamp: int = field(default_factory=now_ts)  # epoch seconds; stored as text
+    version: int = 0
 
 # Global storage with proper typing
 user_data_store: Dict[int, UserProfile] = {}
@@ -117,221 +153,2532 @@ user_states: Dict[int, Dict[str, Any]] = {}
 inquiry_responses: Dict[str, str] = {}  # Store predefined responses
 tips_guides: Dict[str, str] = {}  # Store custom tips and guides
 
-# Track last data load time to ensure fresh data
-_last_data_load: float = 0
-_DATA_RELOAD_INTERVAL = 5  # seconds
+# Sharded storage: every persisted section lives in its own files under DATA_DIR,
+# <section>.json (snapshot) and <section>.journal (write-ahead log). A mutation
+# appends to its section's journal only, and a snapshot is rewritten only for the
+# shards that changed. DATA_FILE is the old single-file layout, migrated on startup.
+DATA_DIR = "teeshoot_data"
+LEGACY_JOURNAL_FILE = DATA_FILE + ".journal"
+LEGACY_COMPACTING_FILE = LEGACY_JOURNAL_FILE + ".compacting"
+JOURNAL_COMPACT_BYTES = 512 * 1024  # compact a shard once its journal grows past this
 
-def save_all():
-    backup_file = DATA_FILE + ".bak" 
+# Snapshot codecs (TEESHOOT_CODEC). "json" is the default, streamed on load and
+# encoded with orjson when it is installed. The binary codecs write SNAPSHOT_MAGIC,
+# the codec name and a newline, then the encoded section; load_all() detects the
+# format from the header, so shards written by any codec can be mixed. Loading a
+# pickle shard runs whatever code the file asks for: DATA_DIR and BACKUP_DIR must
+# be writable by the bot alone, as they are trusted like the bot's own code.
+SNAPSHOT_MAGIC = b"TEESHOOT-SNAPSHOT "
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, run a single process
+    fcntl = None
+
+
+def _stdlib_json_dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _orjson_dumps(value: Any) -> str:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+_json_dumps = _orjson_dumps if orjson else _stdlib_json_dumps
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def _binary_codecs() -> Dict[str, Tuple[Any, Any]]:
+    """Codec name -> (dumps, loads). pickle trusts the data directory; see SNAPSHOT_MAGIC."""
+    codecs = {"pickle": (lambda obj: pickle.dumps(obj, protocol=5), pickle.loads)}
     try:
-        data = {
-            "user_data": {str(k): asdict(v) for k, v in user_data_store.items()},
-            "orders": {k: asdict(v) for k, v in orders.items()},
-            "issues": {k: asdict(v) for k, v in issues.items()},
-            "callbacks": {k: asdict(v) for k, v in callbacks.items()},
-            "inquiries": {k: asdict(v) for k, v in inquiries.items()},
-            "user_states": user_states,
-            "item_prices": ITEM_PRICES,
-            "admin_ids": list(ADMIN_IDS),
-            "technicians": TECHNICIANS,
-            "payment_info": PAYMENT_INFO,
-            "inquiry_responses": inquiry_responses,
-            "tips_guides": tips_guides,
-        }
-        
-        # Write to temporary file first
-        temp_file = DATA_FILE + ".tmp"
-        with open(temp_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.flush()
-            os.fsync(f.fileno())  # Force write to disk
-            
-        # Create backup of existing file if it exists
-        if os.path.exists(DATA_FILE):
-            backup_file = DATA_FILE + ".bak"
-            try:
-                os.replace(DATA_FILE, backup_file)
-            except Exception as e:
-                logger.warning("Failed to create backup: %s", e)
-                
-        # Atomically rename temp file to actual file
-        os.replace(temp_file, DATA_FILE)
-        
-        # Remove old backup if everything succeeded
-        if os.path.exists(backup_file):
-            try:
-                os.remove(backup_file)
-            except Exception as e:
-                logger.warning("Failed to remove backup: %s", e)
-                
-    except Exception as e:
-        logger.exception("Failed saving data: %s", e)
-        # Try to restore from backup if available
-        backup_file = DATA_FILE + ".bak"
-        if os.path.exists(backup_file):
-            try:
-                os.replace(backup_file, DATA_FILE)
-                logger.info("Restored data from backup file")
-            except Exception as restore_e:
-                logger.exception("Failed to restore from backup: %s", restore_e)
+        import msgpack
+        codecs["msgpack"] = (
+            lambda obj: msgpack.packb(obj, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+        )
+    except ImportError:
+        pass
+    return codecs
+
+
+BINARY_CODECS = _binary_codecs()
+SNAPSHOT_CODEC = os.environ.get("TEESHOOT_CODEC", "json").lower()
+if SNAPSHOT_CODEC != "json" and SNAPSHOT_CODEC not in BINARY_CODECS:
+    logger.warning("Snapshot codec %r is not available, writing JSON", SNAPSHOT_CODEC)
+    SNAPSHOT_CODEC = "json"
+
+# Persisted sections -> module global holding them
+KEYED_SECTIONS = {
+    "user_data": "user_data_store",
+    "orders": "orders",
+    "issues": "issues",
+    "callbacks": "callbacks",
+    "inquiries": "inquiries",
+    "user_states": "user_states",
+    "item_prices": "ITEM_PRICES",
+    "inquiry_responses": "inquiry_responses",
+    "tips_guides": "tips_guides",
+}
+WHOLE_SECTIONS = {
+    "admin_ids": "ADMIN_IDS",
+    "technicians": "TECHNICIANS",
+    "payment_info": "PAYMENT_INFO",
+}
+RECORD_TYPES = {"user_data": UserProfile, "orders": Order, "issues": Issue, "callbacks": CallbackReq, "inquiries": Inquiry}
+REQUEST_SECTIONS = ("orders", "issues", "callbacks", "inquiries")
+INT_KEY_SECTIONS = {"user_data", "user_states"}
+
+_compaction_thread: Optional[threading.Thread] = None
+_compaction_task: Optional[asyncio.Task] = None
+# Live sessions belong to this process; they are only restored once at startup
+_sessions_restored = False
+
+
+def _section_key(section: str, key: Any) -> Any:
+    return int(key) if section in INT_KEY_SECTIONS else key
+
+# Record fields drawn from a small vocabulary share one string object per value
+INTERNED_FIELDS = ("status", "type", "inquiry_type", "item")
+
+
+def _decode_record(section: str, value: Dict[str, Any]) -> Any:
+    """Build a record object from its stored dict"""
+    value = dict(value)
+    for name in INTERNED_FIELDS:
+        if isinstance(value.get(name), str):
+            value[name] = sys.intern(value[name])
+    if "timestamp" in value:
+        value["timestamp"] = parse_ts(value["timestamp"])
+    if value.get("version", 0) is None:
+        del value["version"]  # rows saved before records were versioned
+    return RECORD_TYPES[section](**value)
+
+
+_RECORD_FIELDS = {section: tuple(f.name for f in fields(cls)) for section, cls in RECORD_TYPES.items()}
+
+
+def _encode_value(section: str, value: Any) -> Any:
+    if section in RECORD_TYPES:
+        # Much cheaper than asdict(); details only ever holds flat values
+        data = {name: getattr(value, name) for name in _RECORD_FIELDS[section]}
+        if "details" in data:
+            data["details"] = dict(data["details"])  # the writer thread gets its own copy
+        if "timestamp" in data:
+            data["timestamp"] = fmt_ts(data["timestamp"])
+        return data
+    if section == "admin_ids":
+        return list(value)
+    return value
+
+def _snapshot_data() -> Dict[str, Any]:
+    data = {}
+    for section, var in KEYED_SECTIONS.items():
+        data[section] = {str(k): _encode_value(section, v) for k, v in globals()[var].items()}
+    for section, var in WHOLE_SECTIONS.items():
+        data[section] = _encode_value(section, globals()[var])
+    return data
+
+
+# Per-record cache of already-encoded JSON fragments. save_record() drops a record's
+# fragment; snapshots re-encode only records without one and splice in the rest.
+# user_states is mutated in place all over the flows, so it is always re-encoded.
+_fragments: Dict[str, Dict[Any, str]] = {s: {} for s in KEYED_SECTIONS if s != "user_states"}
+_whole_fragments: Dict[str, str] = {}
+# A cached fragment is also the record as last synced with disk. Once a record is
+# edited its fragment moves here until the edit is written, so a concurrent change
+# from another process can be three-way merged against it.
+_bases: Dict[Tuple[str, Any], str] = {}
+
+
+def _fragment(section: str, key: Any, value: Any) -> str:
+    """Encode one record and remember the result"""
+    frag = _json_dumps(value)
+    cache = _fragments.get(section)
+    if cache is not None:
+        cache[key] = frag
+    elif section in WHOLE_SECTIONS:
+        _whole_fragments[section] = frag
+    return frag
+
+
+def _invalidate_fragment(section: str, key: Any = None):
+    SHARDS[section].dirty = True
+    if section in WHOLE_SECTIONS:
+        _whole_fragments.pop(section, None)
+    elif section in _fragments:
+        _fragments[section].pop(key, None)
+
+
+def _merge_fields(base: Dict[str, Any], mine: Dict[str, Any], theirs: Dict[str, Any]) -> Dict[str, Any]:
+    """Three-way merge: fields we changed since base keep our value, the rest take theirs"""
+    merged = {}
+    for name in {**theirs, **mine}:
+        if name not in mine:
+            merged[name] = theirs[name]
+        elif mine[name] == base.get(name) and name in theirs:
+            merged[name] = theirs[name]
+        elif isinstance(mine[name], dict) and isinstance(theirs.get(name), dict):
+            merged[name] = _merge_fields(base.get(name) or {}, mine[name], theirs[name])
+        else:
+            merged[name] = mine[name]
+    return merged
 
 
-def load_all():
-    """Load all data from file with proper error handling and backup management"""
-    global ITEM_PRICES, _last_data_load, orders, issues, callbacks, inquiries, user_data_store
-    
-    # Skip reload if data is fresh enough
-    now = time.time()
-    if now - _last_data_load < _DATA_RELOAD_INTERVAL:
-        return
-        
-    # Initialize empty data structures if they don't exist
-    if not hasattr(load_all, 'initialized'):
-        orders = {}
-        issues = {}
-        callbacks = {}
-        inquiries = {}
-        user_data_store = {}
-        load_all.initialized = True
-
-    if not os.path.exists(DATA_FILE):
-        # Check for backup file
-        backup_file = DATA_FILE + ".bak"
-        if os.path.exists(backup_file):
-            try:
-                os.replace(backup_file, DATA_FILE)
-                logger.info("Restored data from backup file")
-            except Exception as e:
-                logger.exception("Failed to restore backup: %s", e)
-                return
+def _shard_payload(section: str) -> bytes:
+    """One shard's snapshot encoded with SNAPSHOT_CODEC"""
+    if SNAPSHOT_CODEC != "json":
+        dumps = BINARY_CODECS[SNAPSHOT_CODEC][0]
+        if section in WHOLE_SECTIONS:
+            data = _encode_value(section, globals()[WHOLE_SECTIONS[section]])
         else:
-            # If no backup exists, this might be first run
-            logger.info("No data file exists yet")
-            save_all()  # Create initial empty data file
-            return
-            
+            data = {str(k): _encode_value(section, v) for k, v in globals()[KEYED_SECTIONS[section]].items()}
+        return SNAPSHOT_MAGIC + SNAPSHOT_CODEC.encode() + b"\n" + dumps(data)
+    return _shard_json(section).encode("utf-8")
+
+
+def _shard_json(section: str) -> str:
+    """One shard's snapshot as JSON text, one record per line, reusing cached fragments"""
+    if section in WHOLE_SECTIONS:
+        frag = _whole_fragments.get(section)
+        if frag is None:
+            frag = _fragment(section, None, _encode_value(section, globals()[WHOLE_SECTIONS[section]]))
+        return frag + "\n"
+    store = globals()[KEYED_SECTIONS[section]]
+    cache = _fragments.get(section)
+    if cache is not None and len(cache) > len(store):
+        for stale in [k for k in cache if k not in store]:
+            del cache[stale]
+    entries = []
+    for k, v in store.items():
+        frag = cache.get(k) if cache is not None else None
+        if frag is None:
+            frag = _fragment(section, k, _encode_value(section, v))
+        entries.append(f"{json.dumps(str(k), ensure_ascii=False)}: {frag}")
+    return "{\n" + ",\n".join(entries) + "\n}\n" if entries else "{}\n"
+
+
+def _current_value(section: str, key: Any = None) -> Any:
+    """Encoded value of one record or whole section; None when the record is gone"""
+    if section in WHOLE_SECTIONS:
+        return _encode_value(section, globals()[WHOLE_SECTIONS[section]])
+    store = globals()[KEYED_SECTIONS[section]]
+    return _encode_value(section, store[key]) if key in store else None
+
+
+# Durability of a journal append, i.e. of one commit (TEESHOOT_DURABILITY):
+#   strict   fsync every append before the save counts as written
+#   group    appends are only written; one background fsync covers every file written
+#            since and releases all its waiters together. A lone writer is synced
+#            straight away; when several commit at a time, the fsync waits up to
+#            GROUP_COMMIT_MS for as many commits as the previous group held
+#   relaxed  never fsync; the OS writes its page cache back on its own schedule
+# Snapshots are fsynced unless relaxed; strict also fsyncs DATA_DIR after the rename.
+DURABILITY_LEVELS = ("strict", "group", "relaxed")
+DURABILITY = os.environ.get("TEESHOOT_DURABILITY", "strict").lower()
+if DURABILITY not in DURABILITY_LEVELS:
+    logger.warning("Unknown durability level %r, using strict", DURABILITY)
+    DURABILITY = "strict"
+GROUP_COMMIT_MS = float(os.environ.get("TEESHOOT_GROUP_COMMIT_MS", "10"))
+
+
+class GroupCommitter:
+    """Shared fsync for DURABILITY=group"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.syncs = 0
+        self._cond = threading.Condition()
+        self._fds: Dict[Tuple[int, int], int] = {}  # (device, inode) -> fd awaiting fsync
+        self._waiters: Optional[Future] = None
+        self._joined = 0  # commits waiting on the next fsync
+        self._last_group = 0  # commits the previous fsync covered
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, fd: int):
+        """Remember a file written since the last group fsync"""
+        st = os.fstat(fd)
+        with self._cond:
+            if (st.st_dev, st.st_ino) not in self._fds:
+                # A duplicate of our own: the journal may be rotated and closed before the fsync
+                self._fds[(st.st_dev, st.st_ino)] = os.dup(fd)
+
+    def barrier(self) -> Future:
+        """Future resolved by the next group fsync, which covers every add() so far"""
+        with self._cond:
+            if self._waiters is None:
+                self._waiters = Future()
+            self._joined += 1
+            self._cond.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+            return self._waiters
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._waiters is None:
+                    self._cond.wait()
+                # Leader-style: sync at once, unless the last group showed other writers
+                # at work; then give as many a chance to join, for at most the interval
+                self._cond.wait_for(lambda: self._joined >= self._last_group, self.interval)
+                fds, self._fds = self._fds, {}
+                waiters, self._waiters = self._waiters, None
+                self._last_group, self._joined = self._joined, 0
+            error = None
+            for fd in fds.values():
+                try:
+                    os.fsync(fd)
+                except OSError as e:
+                    error = e
+                finally:
+                    os.close(fd)
+            self.syncs += 1
+            if error is not None:
+                waiters.set_exception(error)
+            else:
+                waiters.set_result(len(fds))
+
+group_commit = GroupCommitter(GROUP_COMMIT_MS / 1000)
+
+
+def _fsync_dir(path: str):
+    """Make renames inside a directory durable (a no-op where directories cannot be opened)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
     try:
-        # Try to read the data file
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Shard:
+    """Files of one persisted section, plus what this process last saw of them"""
+
+    def __init__(self, section: str):
+        self.section = section
+        self.data_file = os.path.join(DATA_DIR, section + ".json")
+        self.backup_file = self.data_file + ".bak"  # left behind by older versions
+        self.journal_file = os.path.join(DATA_DIR, section + ".journal")
+        self.compacting_file = self.journal_file + ".compacting"
+        self.lock_file = os.path.join(DATA_DIR, section + ".lock")
+        self.lock = threading.Lock()  # between threads; flock() is between processes
+        self.dirty = False  # changed since the last snapshot?
+        # (inode, size, mtime) of each file as of the last time memory matched it
+        self.seen: Dict[str, Any] = {"data": None, "compacting": None, "journal": None}
+        self._journal_fh = None
+
+    def sigs(self) -> Dict[str, Any]:
+        return {"data": _file_sig(self.data_file), "compacting": _file_sig(self.compacting_file), "journal": _file_sig(self.journal_file)}
+
+    def journal_exists(self) -> bool:
+        return os.path.exists(self.journal_file) or os.path.exists(self.compacting_file)
+
+    def needs_snapshot(self) -> bool:
+        return self.dirty or self.journal_exists() or not os.path.exists(self.data_file)
+
+    def acquire_flock(self, exclusive: bool = True) -> int:
+        """Take the advisory lock every process sharing DATA_DIR honours; returns its fd"""
+        os.makedirs(DATA_DIR, exist_ok=True)
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return fd
+
+    @staticmethod
+    def release_flock(fd: int):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    @contextmanager
+    def flock(self, exclusive: bool = True):
+        fd = self.acquire_flock(exclusive)
         try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except json.JSONDecodeError:
-            # If main file is corrupted, try backup
-            backup_file = DATA_FILE + ".bak"
-            if os.path.exists(backup_file):
-                with open(backup_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                logger.info("Loaded data from backup file due to corrupted main file")
-            else:
-                raise
-        
-        # Clear existing data before loading
-        user_data_store.clear()
-        orders.clear()
-        issues.clear()
-        callbacks.clear()
-        inquiries.clear()
-        user_states.clear()
-        
-        # Load each section with proper error handling
-        for k, v in data.get("user_data", {}).items():
+            yield
+        finally:
+            self.release_flock(fd)
+
+    def _foreign_keys(self) -> Optional[set]:
+        """Keys other processes wrote since memory last synced with this shard, or None
+        when the shard was compacted behind our back and we cannot tell. Caller holds self.lock."""
+        sigs = self.sigs()
+        if sigs == self.seen:
+            return set()
+        seen_journal, journal = self.seen["journal"], sigs["journal"]
+        if (sigs["data"] != self.seen["data"] or sigs["compacting"] != self.seen["compacting"]
+                or journal is None or (seen_journal is not None and journal[0] != seen_journal[0])):
+            return None
+        touched = set()
+        with open(self.journal_file, "rb") as f:
+            f.seek(seen_journal[1] if seen_journal else 0)
+            for line in f:
+                try:
+                    entry = _json_loads(line)
+                except ValueError:
+                    continue
+                touched.add(_section_key(self.section, entry["k"]) if "k" in entry else None)
+        return touched
+
+    def append(self, lines: Dict[Any, str]) -> Tuple[int, set, bool]:
+        """Append and fsync one journal line per key, skipping keys another process has
+        written since we last synced. Returns (journal size, conflicting keys, whether
+        memory is behind the files)."""
+        with self.flock(), self.lock:
+            foreign = self._foreign_keys()
+            conflicts = set(lines) if foreign is None else foreign & set(lines)
+            if self._journal_fh is not None:
+                # Another process may have rotated the journal out from under our handle
+                current = _file_sig(self.journal_file)
+                if current is None or current[0] != os.fstat(self._journal_fh.fileno()).st_ino:
+                    self._journal_fh.close()
+                    self._journal_fh = None
+            if self._journal_fh is None:
+                self._journal_fh = open(self.journal_file, "a", encoding="utf-8")
+            before = os.fstat(self._journal_fh.fileno())
+            if len(conflicts) == len(lines):
+                return before.st_size, conflicts, True
+            self._journal_fh.write("".join(line for key, line in lines.items() if key not in conflicts))
+            self._journal_fh.flush()
+            if DURABILITY == "strict":
+                os.fsync(self._journal_fh.fileno())
+            elif DURABILITY == "group":
+                group_commit.add(self._journal_fh.fileno())
+            after = os.fstat(self._journal_fh.fileno())
+            # Our own append should not look like a foreign change to load_all()
+            seen = self.seen["journal"]
+            if (seen is None and before.st_size == 0) or (seen is not None and seen[:2] == (before.st_ino, before.st_size)):
+                self.seen["journal"] = (after.st_ino, after.st_size, after.st_mtime_ns)
+            return after.st_size, conflicts, foreign != set()
+
+    def take_snapshot(self) -> bytes:
+        """Encode the snapshot and move the journal aside. Caller must hold self.lock."""
+        payload = _shard_payload(self.section)
+        self.dirty = False
+        self._rotate_journal()
+        return payload
+
+    def _rotate_journal(self):
+        """Move the live journal aside so compaction can drop it once the snapshot is safe"""
+        if self._journal_fh is not None:
+            self._journal_fh.close()
+            self._journal_fh = None
+        current = _file_sig(self.journal_file)
+        if current is None:
+            return
+        if os.path.exists(self.compacting_file):
+            # A previous compaction never finished; keep its entries ahead of ours
+            with open(self.journal_file, "r", encoding="utf-8") as src, open(self.compacting_file, "a", encoding="utf-8") as dst:
+                dst.write(src.read())
+            os.remove(self.journal_file)
+            self.seen["compacting"] = None
+        else:
+            os.replace(self.journal_file, self.compacting_file)
+            # A rename keeps inode, size and mtime
+            self.seen["compacting"] = current if current == self.seen["journal"] else None
+        self.seen["journal"] = None
+
+    def write_snapshot(self, payload: bytes):
+        try:
+            # Write to temporary file first
+            temp_file = self.data_file + ".tmp"
+            with open(temp_file, "wb") as f:
+                f.write(payload)
+                f.flush()
+                if DURABILITY != "relaxed":
+                    os.fsync(f.fileno())  # Force write to disk
+
+            # Atomically rename temp file to actual file; the old one stays intact until then
+            os.replace(temp_file, self.data_file)
+            if DURABILITY == "strict":
+                _fsync_dir(DATA_DIR)
+
+            # The snapshot now covers everything the rotated journal held
+            if os.path.exists(self.compacting_file):
+                os.remove(self.compacting_file)
+            self.seen["data"] = _file_sig(self.data_file)
+            self.seen["compacting"] = None
+
+        except Exception as e:
+            logger.exception("Failed saving %s: %s", self.section, e)
+
+    def _snapshot_entries(self, path: str):
+        """Stream a snapshot file as (section, key, value[, JSON text]) entries"""
+        with open(path, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC:
+                codec = f.readline().strip().decode("ascii")
+                if codec not in BINARY_CODECS:
+                    raise ValueError(f"{path} was written with the unavailable codec {codec!r}")
+                data = BINARY_CODECS[codec][1](f.read())
+                if self.section in WHOLE_SECTIONS:
+                    yield self.section, None, data
+                    return
+                yield self.section, None, {}
+                yield from ((self.section, k, v) for k, v in data.items())
+                return
+        with open(path, "r", encoding="utf-8") as f:
+            s = _JsonStream(f)
+            if self.section in WHOLE_SECTIONS:
+                yield self.section, None, s.value()
+                return
+            yield from _iter_object(s, self.section)
+
+    def _install_file(self, path: str, diff: bool) -> int:
+        return _install_entries(self._snapshot_entries(path), diff=diff)
+
+    def read_changes(self) -> Optional[Tuple]:
+        """The disk half of a reload, safe on any thread: what other processes wrote since
+        memory last matched the files, or None when nothing changed. Memory is untouched;
+        apply_changes() installs the result. Caller holds the flock."""
+        with self.lock:
+            sigs = self.sigs()
+            if sigs == self.seen:
+                return None
+            seen_journal, journal = self.seen["journal"], sigs["journal"]
+            if (sigs["data"] == self.seen["data"] and sigs["compacting"] == self.seen["compacting"]
+                    and journal is not None and (seen_journal is None or journal[0] == seen_journal[0])):
+                # Only the live journal grew: just the new tail
+                entries, end = _read_journal(self.journal_file, seen_journal[1] if seen_journal else 0)
+                return "tail", None, entries, {"journal": (journal[0], end, journal[2])}
             try:
-                user_data_store[int(k)] = UserProfile(**v)
-            except Exception as e:
-                logger.error(f"Failed to load user data for {k}: {e}")
-                
-        for k, v in data.get("orders", {}).items():
+                if sigs["data"] is not None:
+                    snapshot = list(self._snapshot_entries(self.data_file))
+                elif os.path.exists(self.backup_file):
+                    raise ValueError("snapshot missing next to its .bak")
+                else:
+                    snapshot = None
+            except ValueError:
+                return "corrupt", None, [], {}  # apply_changes() falls back to a backup
+            entries = _read_journal(self.compacting_file)[0]
+            tail, end = _read_journal(self.journal_file)
+            if sigs["journal"] is not None:
+                sigs["journal"] = (sigs["journal"][0], end, sigs["journal"][2])
+            return "full", snapshot, entries + tail, sigs
+
+    def apply_changes(self, changes: Optional[Tuple]) -> int:
+        """The memory half of a reload, for the thread that owns the stores; returns the
+        entries applied"""
+        if changes is None:
+            return 0
+        kind, snapshot, entries, sigs = changes
+        if kind == "corrupt":
+            return self._load_files(diff=True)  # rare enough to read the backups right here
+        applied = _install_entries(snapshot, diff=True) if snapshot is not None else 0
+        applied += _apply_journal(entries)
+        self.seen.update(sigs)
+        if kind == "full":
+            self.dirty = False
+        return applied
+
+    def load(self, first_load: bool) -> int:
+        """Bring the section up to date with its files; returns the entries applied"""
+        if first_load:
+            return self._load_files(diff=False)
+        return self.apply_changes(self.read_changes())
+
+    def _load_files(self, diff: bool) -> int:
+        """Stream the snapshot (or the newest readable backup of it) and both journals"""
+        with self.lock:
+            sigs = self.sigs()
+            applied = 0
+            # Stream the snapshot straight into the store
             try:
-                orders[k] = Order(**v)
-            except Exception as e:
-                logger.error(f"Failed to load order {k}: {e}")
-                
-        for k, v in data.get("issues", {}).items():
+                if sigs["data"] is not None:
+                    applied = self._install_file(self.data_file, diff=diff)
+                elif os.path.exists(self.backup_file):
+                    raise ValueError("snapshot missing next to its .bak")
+            except ValueError as e:
+                # If the shard is corrupted, fall back to the newest backup of it
+                applied = self._install_fallback(diff=diff, error=e)
+
+            # Replay everything written since the snapshot
+            replayed, _ = _replay_journal(self.compacting_file)
+            tail, end = _replay_journal(self.journal_file)
+            if sigs["journal"] is not None:
+                sigs["journal"] = (sigs["journal"][0], end, sigs["journal"][2])
+            self.seen.update(sigs)
+            self.dirty = False
+        return applied + replayed + tail
+
+    def _install_fallback(self, diff: bool, error: Exception) -> int:
+        """Install the newest readable backup of this shard plus the journals saved with it"""
+        name = os.path.basename(self.data_file)
+        # Newest first, but data an owner restored over only as a last resort
+        generations = sorted(reversed(list_backups()), key=lambda g: g.endswith("-pre-restore"))
+        candidates = [self.backup_file] + [os.path.join(BACKUP_DIR, g, name) for g in generations]
+        for path in candidates:
+            if not os.path.exists(path):
+                continue
             try:
-                issues[k] = Issue(**v)
-            except Exception as e:
-                logger.error(f"Failed to load issue {k}: {e}")
-                
-        for k, v in data.get("callbacks", {}).items():
+                applied = self._install_file(path, diff=diff)
+            except ValueError:
+                continue
+            folder = os.path.dirname(path)
+            if folder != DATA_DIR:
+                for journal in (self.compacting_file, self.journal_file):
+                    applied += _replay_journal(os.path.join(folder, os.path.basename(journal)))[0]
+            logger.warning("Loaded %s from %s: %s", self.section, path, error)
+            return applied
+        raise error
+
+
+SHARDS: Dict[str, Shard] = {section: Shard(section) for section in (*KEYED_SECTIONS, *WHOLE_SECTIONS)}
+
+
+def _journal_append(batch: List[Tuple[str, Any, Any, Optional[str], Optional[str]]]) -> Tuple[set, list, set]:
+    """Append one journal line per (section, key, value, fragment, base) to its shard's
+    journal. Returns the sections due for compaction, the entries that conflicted with
+    another process and the sections that process has written to."""
+    lines: Dict[str, Dict[Any, str]] = {}
+    for section, key, value, frag, _ in batch:
+        s = json.dumps(section)
+        if section in WHOLE_SECTIONS:
+            line = f'{{"op": "set", "s": {s}, "v": {frag}}}\n'
+        elif value is not None:
+            line = f'{{"op": "put", "s": {s}, "k": {json.dumps(key, ensure_ascii=False)}, "v": {frag}}}\n'
+        else:
+            line = f'{{"op": "del", "s": {s}, "k": {json.dumps(key, ensure_ascii=False)}}}\n'
+        lines.setdefault(section, {})[key] = line
+    oversized, conflicts, stale = set(), set(), set()
+    for section, shard_lines in lines.items():
+        size, conflicted, behind = SHARDS[section].append(shard_lines)
+        if size > JOURNAL_COMPACT_BYTES:
+            oversized.add(section)
+        if behind:
+            stale.add(section)
+        conflicts.update((section, key) for key in conflicted)
+    return oversized, [entry for entry in batch if entry[:2] in conflicts], stale
+
+
+def _write_batch(batch: List[Tuple[str, Any, Any, Optional[str], Optional[str]]]) -> Tuple[set, list, set]:
+    """Runs on the save worker thread; see _journal_append() for the result"""
+    if STORAGE_BACKEND == "sqlite":
+        conflicts = _sqlite_store().write_batch(batch)
+        return set(), conflicts, {"sqlite"} if conflicts else set()
+    return _journal_append(batch)
+
+
+# Write-behind persistence: save_record() only marks a record dirty. Bursts are
+# coalesced into one write SAVE_DELAY seconds later (or as soon as SAVE_MAX_DIRTY
+# records are waiting) and the file I/O runs on a single worker thread.
+SAVE_DELAY = float(os.environ.get("TEESHOOT_SAVE_DELAY", "0.5"))  # seconds
+SAVE_MAX_DIRTY = int(os.environ.get("TEESHOOT_SAVE_MAX_DIRTY", "100"))
+
+
+class SaveScheduler:
+    def __init__(self, delay: float, max_dirty: int):
+        self.delay = delay
+        self.max_dirty = max_dirty
+        self.pending: Dict[Tuple[str, Any], None] = {}  # ordered set of dirty (section, key)
+        self.saves_requested = 0
+        self.writes_performed = 0
+        self.records_written = 0
+        self.conflicts_merged = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_write: Optional[Future] = None
+        self._oversized: set = set()  # shards whose journal is due for compaction
+        self._inflight: Dict[Tuple[str, Any], int] = {}  # handed to the worker, not yet settled
+        self._results: List[Tuple[list, list, set]] = []  # finished writes for the loop thread
+        self._tasks: set = set()  # catch-ups running on the loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save-worker")
+
+    def is_local(self, section: str, key: Any) -> bool:
+        """Has this process changed the entry without the change being settled on disk?"""
+        return (section, key) in self.pending or (section, key) in self._inflight
+
+    def request(self, section: str, key: Any = None):
+        self.saves_requested += 1
+        self.pending[(section, key)] = None
+        if len(self.pending) >= self.max_dirty:
+            self.flush()
+        elif self._timer is None:
             try:
-                callbacks[k] = CallbackReq(**v)
-            except Exception as e:
-                logger.error(f"Failed to load callback {k}: {e}")
-                
-        for k, v in data.get("inquiries", {}).items():
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No event loop (startup, scripts): nothing to coalesce with, write now
+                self.flush(wait=True)
+                return
+            self._arm()
+
+    def requeue(self, section: str, key: Any = None):
+        """Write an entry again (after a merge) without flushing right now"""
+        self.pending[(section, key)] = None
+        self._arm()
+
+    async def run(self, fn, *args):
+        """Await blocking disk work on the worker thread. It runs after every write handed
+        over so far, so reads see them, and anything edited meanwhile is still local."""
+        return await asyncio.wrap_future(self._executor.submit(fn, *args))
+
+    def _spawn(self, coro):
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _arm(self):
+        if self._timer is None and self._loop is not None and self._loop.is_running():
+            self._timer = self._loop.call_later(self.delay, self.flush)
+
+    def flush(self, wait: bool = False):
+        """Encode the dirty records here and hand the write to the worker thread"""
+        for _ in range(5):
+            self._flush_once()
+            if not wait or self._last_write is None:
+                return
+            durable = self._last_write.result()
+            if durable is not None:
+                try:
+                    durable.result()  # group commit: wait for the shared fsync
+                except OSError as e:
+                    logger.exception("Group commit fsync failed: %s", e)
+            self._settle(blocking=True)
+            if not self.pending:
+                return
+        logger.error("Gave up retrying %d conflicting saves; they stay queued", len(self.pending))
+
+    def _flush_once(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.pending:
+            dirty, self.pending = list(self.pending), {}
             try:
-                inquiries[k] = Inquiry(**v)
+                batch = []
+                for section, key in dirty:
+                    if section in RECORD_TYPES and key in globals()[KEYED_SECTIONS[section]]:
+                        globals()[KEYED_SECTIONS[section]][key].version += 1
+                    value = _current_value(section, key)
+                    # The journal reuses the fragment; the snapshot cache keeps it
+                    frag = _fragment(section, key, value) if value is not None else None
+                    batch.append((section, key, value, frag, _bases.get((section, key))))
             except Exception as e:
-                logger.error(f"Failed to load inquiry {k}: {e}")
-        
+                logger.exception("Failed encoding %d dirty records: %s", len(dirty), e)
+                return
+            for section, key, *_ in batch:
+                self._inflight[(section, key)] = self._inflight.get((section, key), 0) + 1
+            self._last_write = self._executor.submit(self._write, batch)
+            if self._oversized:
+                sections, self._oversized = self._oversized, set()
+                compact_in_background(sections)
+
+    def _write(self, batch: List[Tuple[str, Any, Any, Optional[str], Optional[str]]]) -> Optional[Future]:
+        """Returns the pending group fsync covering this batch, if any"""
+        conflicts, stale, durable = [], set(), None
         try:
-            user_states.update({int(k): v for k, v in data.get("user_states", {}).items()})
+            oversized, conflicts, stale = _write_batch(batch)
+            self._oversized |= oversized
+            self.writes_performed += 1
+            self.records_written += len(batch) - len(conflicts)
+            if DURABILITY == "group" and STORAGE_BACKEND != "sqlite" and len(conflicts) < len(batch):
+                durable = group_commit.barrier()
         except Exception as e:
-            logger.error(f"Failed to load user states: {e}")
-            
-        if "item_prices" in data:
+            logger.exception("Failed writing %d records: %s", len(batch), e)
+        self._results.append((batch, conflicts, stale))
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._settle)
+        return durable
+
+    def _settle(self, blocking: bool = False):
+        """On the loop thread once writes finished: retire bases of saved entries, catch up
+        with other processes and queue conflicting entries to be merged and written again"""
+        stale = set()
+        while self._results:
+            batch, conflicts, behind = self._results.pop(0)
+            stale |= behind
+            conflicted = {entry[:2] for entry in conflicts}
+            for section, key, value, frag, base in batch:
+                token = (section, key)
+                count = self._inflight.get(token, 0) - 1
+                if count > 0:
+                    self._inflight[token] = count
+                else:
+                    self._inflight.pop(token, None)
+                if token in conflicted:
+                    self.pending[token] = None
+                    stale.add(section)
+                elif token in self.pending and frag is not None and section in RECORD_TYPES:
+                    _bases[token] = frag  # newer edits now build on what we just wrote
+                elif not self.is_local(section, key):
+                    _bases.pop(token, None)
+        if stale:
+            if blocking or self._loop is None or not self._loop.is_running():
+                _catch_up(stale)
+            else:
+                self._spawn(_catch_up_async(stale))
+        self._arm()
+
+    def close(self):
+        """Flush synchronously; used on shutdown"""
+        self.flush(wait=True)
+        self._executor.shutdown(wait=True)
+
+save_scheduler = SaveScheduler(SAVE_DELAY, SAVE_MAX_DIRTY)
+
+def save_record(section: str, key: Any = None):
+    """Mark one record (or a whole small section) for saving. Call it after every
+    mutation: the snapshot reuses the record's cached fragment until then."""
+    frag = _fragments.get(section, {}).get(key)
+    if frag is not None and section in RECORD_TYPES:
+        _bases.setdefault((section, key), frag)
+    _invalidate_fragment(section, key)
+    _reindex(section, key)
+    save_scheduler.request(section, key)
+
+def flush_saves():
+    """Block until every requested save has reached the backend"""
+    save_scheduler.flush(wait=True)
+
+
+def save_all():
+    """Compact: snapshot every shard that changed and retire its journal"""
+    if STORAGE_BACKEND == "sqlite":
+        try:
+            _sqlite_store().replace_all(_snapshot_data())
+        except Exception as e:
+            logger.exception("Failed saving data to SQLite: %s", e)
+        return
+    if _compaction_thread is not None:
+        _compaction_thread.join()
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for shard in SHARDS.values():
+        with shard.flock():
+            if _loaded:
+                shard.load(first_load=False)  # never snapshot over another process's writes
+            if not shard.needs_snapshot():
+                continue  # nothing changed since the last snapshot
             try:
-                ITEM_PRICES.update(data["item_prices"])
+                with shard.lock:
+                    payload = shard.take_snapshot()
             except Exception as e:
-                logger.error(f"Failed to load item prices: {e}")
-                
-        if "admin_ids" in data:
+                logger.exception("Failed saving %s: %s", shard.section, e)
+                continue
+            shard.write_snapshot(payload)
+
+
+def _write_snapshots(jobs: List[Tuple[Shard, bytes, int]]):
+    for shard, payload, fd in jobs:
+        try:
+            shard.write_snapshot(payload)
+        finally:
+            shard.release_flock(fd)
+
+
+def _lock_for_compaction(sections) -> List[Tuple["Shard", int, Optional[Tuple]]]:
+    """Blocking half of starting a compaction: take each shard's flock, held until its
+    snapshot is on disk so no process appends to a journal we retire, and read what other
+    processes wrote first. All in one go, so no queued append waits on our own flock."""
+    locked = []
+    for section in sections:
+        shard = SHARDS[section]
+        fd = shard.acquire_flock()
+        try:
+            locked.append((shard, fd, shard.read_changes()))
+        except Exception as e:
+            shard.release_flock(fd)
+            logger.exception("Failed to start compaction of %s: %s", section, e)
+    return locked
+
+
+def _snapshot_locked(locked: List[Tuple["Shard", int, Optional[Tuple]]]):
+    """Fold in the changes read, snapshot memory and hand the writing to a thread"""
+    global _compaction_thread
+    jobs = []
+    for shard, fd, changes in locked:
+        try:
+            shard.apply_changes(changes)
+            with shard.lock:
+                jobs.append((shard, shard.take_snapshot(), fd))
+        except Exception as e:
+            shard.release_flock(fd)
+            logger.exception("Failed to start compaction of %s: %s", shard.section, e)
+    if jobs:
+        _compaction_thread = threading.Thread(target=_write_snapshots, args=(jobs,), name="journal-compaction", daemon=True)
+        _compaction_thread.start()
+
+
+async def _compact_async(sections):
+    try:
+        locked = await save_scheduler.run(_lock_for_compaction, sections)
+    except Exception as e:
+        logger.exception("Failed to start compaction: %s", e)
+        return
+    _snapshot_locked(locked)
+
+
+def compact_in_background(sections):
+    """Snapshot the given shards in memory now, write them to disk from a worker thread.
+    With the event loop running, the flocks and reads happen on the save worker first."""
+    global _compaction_task
+    if _compaction_thread is not None and _compaction_thread.is_alive():
+        return  # still oversized next time the journal grows
+    if _compaction_task is not None and not _compaction_task.done():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _snapshot_locked(_lock_for_compaction(sections))
+        return
+    _compaction_task = loop.create_task(_compact_async(sections))
+
+
+# Optional SQLite backend (TEESHOOT_STORAGE=sqlite). The module-level dicts stay the
+# in-memory view handlers work with; every save_record() becomes one UPSERT/DELETE.
+# Each write also stamps its entry in the changes table with a new change number, so
+# a reload reads just the entries changed past the last number it saw. A restore
+# starts a new epoch, which makes every process reread the database in full.
+STORAGE_BACKEND = os.environ.get("TEESHOOT_STORAGE", "json").lower()
+SQLITE_FILE = "teeshoot_data.db"
+
+# Record section -> (table, primary key column)
+SQL_TABLES = {
+    "user_data": ("users", "user_id"),
+    "orders": ("orders", "id"),
+    "issues": ("issues", "id"),
+    "callbacks": ("callbacks", "id"),
+    "inquiries": ("inquiries", "id"),
+}
+SQL_JSON_COLUMNS = {"details"}
+SQL_BOOL_COLUMNS = {"notifications_enabled"}
+SQLITE_SYNCHRONOUS = {"strict": "FULL", "group": "NORMAL", "relaxed": "OFF"}
+
+
+class SqliteStore:
+    """Repository with one table per record type and a key/value table for everything else"""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only syncs at checkpoints: SQLite's own group commit
+        self.conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS[DURABILITY]}")
+        self._create_schema()
+
+    def _columns(self, section: str) -> List[str]:
+        return [f.name for f in fields(RECORD_TYPES[section])]
+
+    def _create_schema(self):
+        for section, (table, pk) in SQL_TABLES.items():
+            pk_type = "INTEGER" if section in INT_KEY_SECTIONS else "TEXT"
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({pk} {pk_type} PRIMARY KEY)")
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for col in self._columns(section):
+                if col not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {col}")
+            if section != "user_data":
+                for col in ("user_id", "status", "timestamp"):
+                    self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{col} ON {table} ({col})")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS settings (section TEXT, key TEXT, value TEXT, PRIMARY KEY (section, key))")
+        # One row per entry ever written; REPLACE gives it a new, higher seq each time
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "section TEXT NOT NULL, key TEXT NOT NULL, UNIQUE (section, key))"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('epoch', ?)", (os.urandom(8).hex(),))
+
+    def _to_row(self, section: str, value: Dict[str, Any]) -> List[Any]:
+        return [json.dumps(value[c], ensure_ascii=False) if c in SQL_JSON_COLUMNS else value[c] for c in self._columns(section)]
+
+    def _from_row(self, section: str, row) -> Dict[str, Any]:
+        value = {}
+        for col, v in zip(self._columns(section), row):
+            if col in SQL_JSON_COLUMNS:
+                v = json.loads(v) if v else {}
+            elif col in SQL_BOOL_COLUMNS:
+                v = bool(v)
+            value[col] = v
+        return value
+
+    def _write(self, section: str, key: Any, value: Any, check_version: bool = False) -> bool:
+        """Upsert or delete one entry; False when check_version finds a newer row"""
+        skey = "" if section in WHOLE_SECTIONS else str(key)
+        if section in SQL_TABLES:
+            table, pk = SQL_TABLES[section]
+            if value is None:
+                self.conn.execute(f"DELETE FROM {table} WHERE {pk} = ?", (key,))
+                self._stamp(section, skey)
+                return True
+            if check_version:
+                row = self.conn.execute(f"SELECT version FROM {table} WHERE {pk} = ?", (key,)).fetchone()
+                if row is not None and (row[0] or 0) >= value["version"]:
+                    return False  # another process wrote this version (or a later one) first
+            cols = self._columns(section)
+            updates = ", ".join(f"{c} = excluded.{c}" for c in cols)
+            self.conn.execute(
+                f"INSERT INTO {table} ({pk}, {', '.join(cols)}) VALUES ({', '.join('?' * (len(cols) + 1))}) "
+                f"ON CONFLICT({pk}) DO UPDATE SET {updates}",
+                [key] + self._to_row(section, value),
+            )
+        else:
+            if value is None:
+                self.conn.execute("DELETE FROM settings WHERE section = ? AND key = ?", (section, skey))
+            else:
+                self.conn.execute(
+                    "INSERT INTO settings (section, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT(section, key) DO UPDATE SET value = excluded.value",
+                    (section, skey, json.dumps(value, ensure_ascii=False)),
+                )
+        self._stamp(section, skey)
+        return True
+
+    def _stamp(self, section: str, skey: str):
+        self.conn.execute("INSERT OR REPLACE INTO changes (section, key) VALUES (?, ?)", (section, skey))
+
+    def _read(self, section: str, skey: str) -> Tuple[Any, Any]:
+        """(key, value) of one entry as _iter_entries() yields it; value None when deleted"""
+        if section in SQL_TABLES:
+            table, pk = SQL_TABLES[section]
+            key = _section_key(section, skey)
+            row = self.conn.execute(f"SELECT {', '.join(self._columns(section))} FROM {table} WHERE {pk} = ?", (key,)).fetchone()
+            return key, None if row is None else self._from_row(section, row)
+        row = self.conn.execute("SELECT value FROM settings WHERE section = ? AND key = ?", (section, skey)).fetchone()
+        key = None if section in WHOLE_SECTIONS else _section_key(section, skey)
+        return key, None if row is None else json.loads(row[0])
+
+    def write_batch(self, batch: List[Tuple[str, Any, Any, Optional[str], Optional[str]]]) -> list:
+        """Apply a batch of (section, key, value, fragment, base) writes in one transaction;
+        returns the entries skipped because another process saved a newer version"""
+        conflicts = []
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
             try:
-                ADMIN_IDS.update(data["admin_ids"])
-                ADMIN_IDS.add(CLIENT_ID)
-            except Exception as e:
-                logger.error(f"Failed to load admin IDs: {e}")
-                
-        if "technicians" in data:
+                for entry in batch:
+                    if not self._write(*entry[:3], check_version=True):
+                        conflicts.append(entry)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return conflicts
+
+    def replace_all(self, data: Dict[str, Any]):
+        """Rewrite every table from a snapshot-shaped dict in one transaction"""
+        with self.lock:
+            self.conn.execute("BEGIN")
             try:
-                global TECHNICIANS
-                TECHNICIANS = data["technicians"]
-            except Exception as e:
-                logger.error(f"Failed to load technicians: {e}")
-                
-        if "payment_info" in data:
+                # Stamp what is deleted too, so other processes drop entries not written back
+                for section, (table, pk) in SQL_TABLES.items():
+                    self.conn.execute(f"INSERT OR REPLACE INTO changes (section, key) SELECT ?, {pk} FROM {table}", (section,))
+                    self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute("INSERT OR REPLACE INTO changes (section, key) SELECT section, key FROM settings")
+                self.conn.execute("DELETE FROM settings")
+                for section, value in data.items():
+                    if section in WHOLE_SECTIONS:
+                        self._write(section, None, value)
+                    else:
+                        for k, v in value.items():
+                            self._write(section, _section_key(section, k), v)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def iter_entries(self):
+        """Stream every row as (section, key, value), in the same shape _iter_snapshot() yields"""
+        with self.lock:
+            yield from self._iter_entries()
+
+    def _iter_entries(self):
+        for section, (table, pk) in SQL_TABLES.items():
+            cols = self._columns(section)
+            yield section, None, {}
+            for row in self.conn.execute(f"SELECT {pk}, {', '.join(cols)} FROM {table}"):
+                yield section, row[0], self._from_row(section, row[1:])
+        current = None
+        for section, key, value in self.conn.execute("SELECT section, key, value FROM settings ORDER BY section"):
+            if section in WHOLE_SECTIONS:
+                yield section, None, json.loads(value)
+                continue
+            if section != current:
+                current = section
+                yield section, None, {}
+            yield section, key, json.loads(value)
+
+    def _position(self) -> Tuple[str, int]:
+        epoch = self.conn.execute("SELECT value FROM meta WHERE name = 'epoch'").fetchone()[0]
+        return epoch, self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def position(self) -> Tuple[str, int]:
+        """(epoch, newest change number): where a reader that has seen everything stands"""
+        with self.lock:
+            return self._position()
+
+    def changes_since(self, epoch: Optional[str], seq: int) -> Tuple[str, int, bool, list]:
+        """Entries changed after change number seq of epoch, read in one transaction, as
+        (epoch, newest change number, full, entries). Entries are (section, key, value),
+        value None for a deleted entry; full means the epoch moved on and entries are
+        every row, in iter_entries() form."""
+        with self.lock:
+            self.conn.execute("BEGIN")
             try:
-                global PAYMENT_INFO
-                PAYMENT_INFO = data["payment_info"]
-            except Exception as e:
-                logger.error(f"Failed to load payment info: {e}")
-                
-        if "inquiry_responses" in data:
+                current, last = self._position()
+                if current != epoch:
+                    return current, last, True, list(self._iter_entries())
+                rows = self.conn.execute("SELECT section, key FROM changes WHERE seq > ? ORDER BY seq", (seq,)).fetchall()
+                return current, last, False, [(section, *self._read(section, skey)) for section, skey in rows]
+            finally:
+                self.conn.execute("COMMIT")
+
+    def new_epoch(self):
+        """Make every reader reload in full, after the database was replaced wholesale"""
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('epoch', ?)", (os.urandom(8).hex(),))
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database"""
+        with self.lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def is_empty(self) -> bool:
+        with self.lock:
+            return all(
+                self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+                for table in [t for t, _ in SQL_TABLES.values()] + ["settings"]
+            )
+
+
+_sqlite: Optional[SqliteStore] = None
+
+def _sqlite_store() -> SqliteStore:
+    global _sqlite
+    if _sqlite is None:
+        _sqlite = SqliteStore(SQLITE_FILE)
+    return _sqlite
+
+
+# Secondary indexes over the request stores. Every mutation of a request ends in
+# save_record() and every entry read from disk goes through _put_entity() or
+# _drop_entity(); those call _reindex(), which files the request again wherever
+# what an index keys it by has changed. Each index keeps one structure per
+# section, because the shards are loaded in parallel threads.
+class RequestIndex:
+    """Base class: remembers the key each request is filed under"""
+
+    def __init__(self, sections: Tuple[str, ...] = REQUEST_SECTIONS):
+        self.placed: Dict[str, Dict[str, Any]] = {s: {} for s in sections}  # section -> id -> key
+
+    def key_of(self, record: Any) -> Any:
+        raise NotImplementedError
+
+    def _add(self, section: str, rid: str, key: Any):
+        raise NotImplementedError
+
+    def _remove(self, section: str, rid: str, key: Any):
+        raise NotImplementedError
+
+    def update(self, section: str, rid: str, record: Any):
+        """File a request under its current key; record=None removes it"""
+        new = self.key_of(record) if record is not None else None
+        placed = self.placed[section]
+        old = placed.get(rid)
+        if old == new:
+            return
+        if old is not None:
+            self._remove(section, rid, old)
+            del placed[rid]
+        if new is not None:
+            self._add(section, rid, new)
+            placed[rid] = new
+
+    def clear_section(self, section: str):
+        for rid in list(self.placed[section]):
+            self.update(section, rid, None)
+
+
+class UserRequestIndex(RequestIndex):
+    """user_id -> that user's request IDs per category, in creation order"""
+
+    def __init__(self):
+        super().__init__()
+        self.by_user: Dict[str, Dict[int, List[Tuple[int, str]]]] = {s: {} for s in REQUEST_SECTIONS}
+
+    def key_of(self, record: Any) -> Tuple[int, int]:
+        return record.user_id, record.timestamp
+
+    def _add(self, section: str, rid: str, key: Tuple[int, int]):
+        user_id, ts = key
+        bisect.insort(self.by_user[section].setdefault(user_id, []), (ts, rid))
+
+    def _remove(self, section: str, rid: str, key: Tuple[int, int]):
+        user_id, ts = key
+        entries = self.by_user[section][user_id]
+        i = bisect.bisect_left(entries, (ts, rid))
+        if i < len(entries) and entries[i] == (ts, rid):
+            del entries[i]
+        if not entries:
+            del self.by_user[section][user_id]
+
+    def ids(self, user_id: int, section: str) -> List[str]:
+        """One user's request IDs in a category, newest first"""
+        return [rid for _, rid in reversed(self.by_user[section].get(user_id, ()))]
+
+    def recent(self, user_id: int):
+        """(section, id) of one user's requests across all categories, newest first"""
+        def newest_first(section: str):
+            for ts, rid in reversed(self.by_user[section].get(user_id, ())):
+                yield ts, rid, section
+
+        merged = heapq.merge(*map(newest_first, REQUEST_SECTIONS), reverse=True)
+        return ((section, rid) for _, rid, section in merged)
+
+
+class StatusIndex(RequestIndex):
+    """Per category: status -> request IDs in that status, in creation order"""
+
+    def __init__(self):
+        super().__init__()
+        self.by_status: Dict[str, Dict[str, List[Tuple[int, str]]]] = {s: {} for s in REQUEST_SECTIONS}
+
+    def key_of(self, record: Any) -> Tuple[str, int]:
+        return record.status, record.timestamp
+
+    def _add(self, section: str, rid: str, key: Tuple[str, int]):
+        status, ts = key
+        bisect.insort(self.by_status[section].setdefault(status, []), (ts, rid))
+
+    def _remove(self, section: str, rid: str, key: Tuple[str, int]):
+        status, ts = key
+        entries = self.by_status[section][status]
+        i = bisect.bisect_left(entries, (ts, rid))
+        if i < len(entries) and entries[i] == (ts, rid):
+            del entries[i]
+        if not entries:
+            del self.by_status[section][status]
+
+    def newest(self, section: str, statuses=None):
+        """IDs in the given statuses (all when None), newest first"""
+        by_status = self.by_status[section]
+        lists = [by_status[s] for s in (by_status if statuses is None else statuses) if s in by_status]
+        return (rid for _, rid in heapq.merge(*map(reversed, lists), reverse=True))
+
+    def oldest(self, section: str, status: str) -> List[Tuple[int, str]]:
+        """(timestamp, id) of the requests in one status, oldest first"""
+        return self.by_status[section].get(status, [])
+
+
+class TimeIndex(RequestIndex):
+    """Per category: every request ID in creation order"""
+
+    def __init__(self):
+        super().__init__()
+        self.by_time: Dict[str, List[Tuple[int, str]]] = {s: [] for s in REQUEST_SECTIONS}
+
+    def key_of(self, record: Any) -> int:
+        return record.timestamp
+
+    def _add(self, section: str, rid: str, ts: int):
+        bisect.insort(self.by_time[section], (ts, rid))
+
+    def _remove(self, section: str, rid: str, ts: int):
+        entries = self.by_time[section]
+        i = bisect.bisect_left(entries, (ts, rid))
+        if i < len(entries) and entries[i] == (ts, rid):
+            del entries[i]
+
+
+def keyset_page(lists: List[List[Tuple[int, str]]], cursor: Optional[Tuple[int, str]] = None,
+                older: bool = True, size: int = 30) -> Tuple[List[Tuple[int, str]], bool]:
+    """One page of (timestamp, id), newest first, from lists sorted oldest first: the
+    rows just older than cursor (or the newest rows without one), or with older=False
+    the rows just newer. Also returns whether more rows lie beyond the page in that
+    direction. Costs O(log n) per list plus the page, however long the lists are."""
+    def backwards(entries, end):
+        for i in range(end - 1, -1, -1):
+            yield entries[i]
+
+    def forwards(entries, start):
+        for i in range(start, len(entries)):
+            yield entries[i]
+
+    if older:
+        ends = [len(l) if cursor is None else bisect.bisect_left(l, cursor) for l in lists]
+        merged = heapq.merge(*map(backwards, lists, ends), reverse=True)
+    else:
+        merged = heapq.merge(*(forwards(l, bisect.bisect_right(l, cursor)) for l in lists))
+    page = list(itertools.islice(merged, size + 1))
+    more = len(page) > size
+    page = page[:size]
+    return (page if older else page[::-1]), more
+
+
+def keyset_has(lists: List[List[Tuple[int, str]]], cursor: Tuple[int, str], older: bool) -> bool:
+    """Are there rows older (or newer) than cursor?"""
+    if older:
+        return any(l and l[0] < cursor for l in lists)
+    return any(l and l[-1] > cursor for l in lists)
+
+
+class RequestRegistry(RequestIndex):
+    """Request ID -> its category, for every request in memory. IDs are unique
+    across categories, so routing never needs to look at the prefix."""
+
+    def __init__(self):
+        super().__init__()
+        self.sections: Dict[str, str] = {}
+
+    def key_of(self, record: Any) -> bool:
+        return True
+
+    def _add(self, section: str, rid: str, key: bool):
+        self.sections[rid] = section
+
+    def _remove(self, section: str, rid: str, key: bool):
+        self.sections.pop(rid, None)
+
+    def get(self, rid: str) -> Optional[Tuple[str, Any]]:
+        """(category, record) of a request in memory, or None"""
+        section = self.sections.get(rid)
+        if section is None:
+            return None
+        record = globals()[KEYED_SECTIONS[section]].get(rid)
+        return (section, record) if record is not None else None
+
+
+
+class RequestStats(RequestIndex):
+    """Per category: running counts by status and by Nigeria-time day, and order totals
+    by status and day. Each create or status change moves one record between buckets,
+    so every figure is a dict lookup however many requests are held."""
+
+    def __init__(self):
+        super().__init__()
+        self.by_status: Dict[str, Dict[str, int]] = {s: {} for s in REQUEST_SECTIONS}
+        self.by_day: Dict[str, Dict[int, int]] = {s: {} for s in REQUEST_SECTIONS}
+        self.revenue: Dict[str, Dict[str, int]] = {s: {} for s in REQUEST_SECTIONS}
+        self.revenue_by_day: Dict[str, Dict[int, int]] = {s: {} for s in REQUEST_SECTIONS}
+
+    def key_of(self, record: Any) -> Tuple[str, int, int]:
+        try:
+            amount = int(record.details.get("total") or 0)
+        except (AttributeError, TypeError, ValueError):
+            amount = 0
+        return record.status, (record.timestamp + _NG_OFFSET) // 86400, amount
+
+    @staticmethod
+    def _bump(counts: Dict[Any, int], key: Any, delta: int):
+        value = counts.get(key, 0) + delta
+        if value:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+
+    def _add(self, section: str, rid: str, key: Tuple[str, int, int], sign: int = 1):
+        status, day, amount = key
+        self._bump(self.by_status[section], status, sign)
+        self._bump(self.by_day[section], day, sign)
+        if amount:
+            self._bump(self.revenue[section], status, sign * amount)
+            self._bump(self.revenue_by_day[section], day, sign * amount)
+
+    def _remove(self, section: str, rid: str, key: Tuple[str, int, int]):
+        self._add(section, rid, key, -1)
+
+    def count(self, section: str, statuses=None) -> int:
+        by_status = self.by_status[section]
+        if statuses is None:
+            return sum(by_status.values())
+        return sum(by_status.get(status, 0) for status in statuses)
+
+    def amount(self, section: str, statuses=None) -> int:
+        revenue = self.revenue[section]
+        if statuses is None:
+            return sum(revenue.values())
+        return sum(revenue.get(status, 0) for status in statuses)
+
+    def days(self, section: str, n: int = 7, now: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """(date, requests, order total) for the last n days, newest first"""
+        today = ((now if now is not None else now_ts()) + _NG_OFFSET) // 86400
+        by_day, revenue = self.by_day[section], self.revenue_by_day[section]
+        return [(_ng_date(d), by_day.get(d, 0), revenue.get(d, 0)) for d in range(today, today - n, -1)]
+
+
+user_requests = UserRequestIndex()
+requests_by_status = StatusIndex()
+requests_by_time = TimeIndex()
+request_registry = RequestRegistry()
+request_stats = RequestStats()
+# Full-text search: each request is filed under the words and phone numbers in its
+# text, and each profile under those in the user's fields, standing for all of that
+# user's requests. Every term of a query has to match the start of a token, so the
+# vocabulary is kept sorted for bisecting. Phone numbers are indexed and queried in
+# one form (0XXXXXXXXXX), however they were written.
+SEARCH_SECTIONS = REQUEST_SECTIONS + ("user_data",)
+SEARCH_MIN_TERM = 2
+_NUMBER_RE = re.compile(r"\+?\d(?:[ -]?\d){6,}")  # seven digits or more
+_PHONE_RE = re.compile(r"(?<!\d)(?:(?:\+?234|0)[ -]?)?[789][01]\d(?:[ -]?\d){7}(?!\d)")
+_WORD_RE = re.compile(r"[^\W_]{%d,}" % SEARCH_MIN_TERM)
+
+
+def search_tokens(text: str) -> set:
+    """Lower-case words and normalized phone numbers in text"""
+    tokens = set()
+
+    def take_phones(number):
+        # Long runs of digits are rare and short, so only they get the costly pattern
+        run = number.group()
+        for match in _PHONE_RE.finditer(run):
+            digits = re.sub(r"\D", "", match.group())
+            if digits.startswith("234"):
+                digits = "0" + digits[3:]
+            elif len(digits) == 10:
+                digits = "0" + digits
+            tokens.add(digits)
+        return _PHONE_RE.sub(" ", run)
+
+    text = _NUMBER_RE.sub(take_phones, text).lower()
+    words = set(_WORD_RE.findall(text))
+    for word in [w for w in words if w.startswith("234") and len(w) >= 7 and w.isdigit()]:
+        words.remove(word)
+        words.add("0" + word[3:])  # the start of an international number
+    return tokens | words
+
+
+def _search_text(record: Any) -> str:
+    if isinstance(record, UserProfile):
+        return " ".join((record.name, record.phone, record.email, record.department, record.room, record.room_number))
+    parts = [record.name, record.username or ""]
+    if isinstance(record, (Order, Issue)):
+        parts.append(record.item if isinstance(record, Order) else record.type)
+        parts.extend(v for v in record.details.values() if isinstance(v, str))
+    elif isinstance(record, CallbackReq):
+        parts.append(record.phone_and_issue)
+    elif isinstance(record, Inquiry):
+        parts.extend((record.inquiry_type, record.inquiry_text))
+    return " ".join(parts)
+
+
+class SearchIndex(RequestIndex):
+    """Per section: token -> IDs whose text contains it, and the sorted tokens. New
+    tokens are only merged into the sorted list by the next search, so loading
+    hundreds of thousands of records does not pay for an insort each."""
+
+    def __init__(self):
+        super().__init__(SEARCH_SECTIONS)
+        self.postings: Dict[str, Dict[str, set]] = {s: {} for s in SEARCH_SECTIONS}
+        self.vocab: Dict[str, List[str]] = {s: [] for s in SEARCH_SECTIONS}
+        self.added: Dict[str, List[str]] = {s: [] for s in SEARCH_SECTIONS}
+        self.removed: Dict[str, bool] = dict.fromkeys(SEARCH_SECTIONS, False)
+
+    def key_of(self, record: Any) -> frozenset:
+        return frozenset(search_tokens(_search_text(record)))
+
+    def _add(self, section: str, rid: Any, tokens: frozenset):
+        postings = self.postings[section]
+        for token in tokens:
+            ids = postings.get(token)
+            if ids is None:
+                ids = postings[token] = set()
+                self.added[section].append(token)
+            ids.add(rid)
+
+    def _remove(self, section: str, rid: Any, tokens: frozenset):
+        postings = self.postings[section]
+        for token in tokens:
+            ids = postings[token]
+            ids.discard(rid)
+            if not ids:
+                del postings[token]
+                self.removed[section] = True
+
+    def _sorted_vocab(self, section: str) -> List[str]:
+        added, postings = self.added[section], self.postings[section]
+        if added or self.removed[section]:
+            added.sort()
+            merged = self.vocab[section] + added
+            merged.sort()  # two sorted runs: a linear merge
+            # A token removed and added again is in both runs
+            self.vocab[section] = [t for t, _ in itertools.groupby(merged) if t in postings]
+            added.clear()
+            self.removed[section] = False
+        return self.vocab[section]
+
+    def tokens(self, section: str, term: str) -> List[str]:
+        """Tokens in section starting with term"""
+        vocab = self._sorted_vocab(section)
+        start = bisect.bisect_left(vocab, term)
+        return vocab[start:bisect.bisect_left(vocab, term + "\uffff", start)]
+
+    def matching(self, section: str, tokens: List[str]) -> set:
+        postings = self.postings[section]
+        return set().union(*(postings[token] for token in tokens))
+
+    def weight(self, section: str, tokens: List[str]) -> int:
+        postings = self.postings[section]
+        return sum(len(postings[token]) for token in tokens)
+
+
+search_index = SearchIndex()
+
+
+def search_requests(query: str, limit: int = 20) -> Tuple[List[Tuple[str, str]], int]:
+    """(category, id) of the newest requests matching every term of query, and the
+    number of matches. The most selective term picks the candidates; the others only
+    need their matches as sets to filter them."""
+    terms = search_tokens(query)
+    if not terms:
+        return [], 0
+    # Per term: section -> the tokens it expands to
+    expanded = [{section: search_index.tokens(section, term) for section in SEARCH_SECTIONS} for term in terms]
+    per_user = len(request_registry.sections) / max(1, len(user_data_store))
+
+    def weight(term_tokens):
+        profile = search_index.weight("user_data", term_tokens["user_data"]) * per_user
+        return profile + sum(search_index.weight(s, term_tokens[s]) for s in REQUEST_SECTIONS)
+
+    expanded.sort(key=weight)
+    first, rest = expanded[0], expanded[1:]
+    users = search_index.matching("user_data", first["user_data"])
+    filters = [({s: search_index.matching(s, term_tokens[s]) for s in REQUEST_SECTIONS},
+                search_index.matching("user_data", term_tokens["user_data"])) for term_tokens in rest]
+    total, newest = 0, []
+    for section in REQUEST_SECTIONS:
+        store, by_user = globals()[section], user_requests.by_user[section]
+        hits = search_index.matching(section, first[section])
+        for user_id in users:
+            hits.update(rid for _, rid in by_user.get(user_id, ()))
+        for term_hits, term_users in filters:
+            hits = [rid for rid in hits if rid in term_hits[section] or store[rid].user_id in term_users]
+        total += len(hits)
+        newest.extend((store[rid].timestamp, rid, section) for rid in heapq.nlargest(limit, hits, key=lambda rid: (store[rid].timestamp, rid)))
+    newest = heapq.nlargest(limit, newest)
+    return [(section, rid) for _, rid, section in newest], total
+
+
+REQUEST_INDEXES: List[RequestIndex] = [user_requests, requests_by_status, requests_by_time, request_registry, request_stats, search_index]
+
+
+def _reindex(section: str, key: Any):
+    if section in REQUEST_SECTIONS:
+        record = globals()[KEYED_SECTIONS[section]].get(key)
+        for index in REQUEST_INDEXES:
+            index.update(section, key, record)
+    elif section == "user_data":
+        search_index.update(section, key, user_data_store.get(key))
+        _customer_cards.pop(key, None)
+    elif section in RENDER_SECTIONS:
+        _content_changed(section, key)
+
+
+def find_requests(section: str, user_id: Optional[int] = None, statuses: Optional[List[str]] = None) -> List[str]:
+    """Request IDs in one category filtered by owner and/or status, newest first"""
+    if user_id is not None:
+        store = globals()[KEYED_SECTIONS[section]]
+        return [rid for rid in user_requests.ids(user_id, section) if not statuses or store[rid].status in statuses]
+    return list(requests_by_status.newest(section, statuses or None))
+
+
+def _load_section(section: str, value: Any):
+    """Install one section read from the snapshot"""
+    global TECHNICIANS, PAYMENT_INFO, inquiry_responses, tips_guides
+    if section in WHOLE_SECTIONS and save_scheduler.is_local(section, None):
+        return  # our unsaved version is written next and wins
+    if section in RECORD_TYPES:
+        for k, v in value.items():
+            _put_entity(section, _section_key(section, k), v)
+    elif section == "user_states":
+        if not _sessions_restored:
+            user_states.update({int(k): v for k, v in value.items()})
+    elif section == "item_prices":
+        ITEM_PRICES.update(value)
+    elif section == "admin_ids":
+        ADMIN_IDS.clear()
+        ADMIN_IDS.update(value)
+        ADMIN_IDS.add(CLIENT_ID)
+    elif section == "technicians":
+        TECHNICIANS = value
+    elif section == "payment_info":
+        PAYMENT_INFO = value
+    elif section == "inquiry_responses":
+        inquiry_responses = value
+    elif section == "tips_guides":
+        tips_guides = value
+    if section in RENDER_SECTIONS:
+        _content_changed(section)
+
+
+def _put_entity(section: str, key: Any, value: Any, frag: Optional[str] = None):
+    """Install one keyed entry read from disk; frag is its JSON text when known"""
+    if section == "user_states" and _sessions_restored:
+        return
+    if save_scheduler.is_local(section, key):
+        _merge_entity(section, key, value)
+        return
+    try:
+        globals()[KEYED_SECTIONS[section]][key] = _decode_record(section, value) if section in RECORD_TYPES else value
+    except Exception as e:
+        logger.error(f"Failed to load {section} entry {key}: {e}")
+        return
+    _reindex(section, key)
+    cache = _fragments.get(section)
+    if cache is not None:
+        # Matches disk, so it doubles as the merge base if we edit the record later
+        cache[key] = frag if frag is not None else _json_dumps(value)
+
+
+def _drop_entity(section: str, key: Any):
+    if section == "user_states" and _sessions_restored:
+        return
+    if save_scheduler.is_local(section, key):
+        if (section, key) in _bases and key in globals()[KEYED_SECTIONS[section]]:
+            logger.warning("Keeping %s %s: edited here, deleted by another process", section, key)
+        return
+    globals()[KEYED_SECTIONS[section]].pop(key, None)
+    _invalidate_fragment(section, key)
+    _bases.pop((section, key), None)
+    _reindex(section, key)
+
+
+def _merge_entity(section: str, key: Any, theirs: Dict[str, Any]):
+    """Another process saved an entry we have unsaved edits to. Records are merged field
+    by field against the version both sides started from; other entries keep ours."""
+    store = globals()[KEYED_SECTIONS[section]]
+    local = store.get(key)
+    if section not in RECORD_TYPES or local is None:
+        return  # ours (or our delete) is written next
+    base_frag = _bases.get((section, key))
+    base = _json_loads(base_frag) if base_frag else None
+    if base == theirs:
+        return  # they have not changed it since we last synced
+    mine = _encode_value(section, local)
+    if {**theirs, "version": mine["version"]} == mine:
+        return  # our own write (or a snapshot of it) read back before it settled
+    if base is None:
+        logger.warning("Conflicting %s %s without a common version; keeping ours", section, key)
+        merged = dict(mine)
+    else:
+        merged = _merge_fields(base, mine, theirs)
+    merged["version"] = max(mine["version"], theirs.get("version", 0))
+    try:
+        updated = _decode_record(section, merged)
+    except Exception as e:
+        logger.error(f"Failed to merge {section} entry {key}: {e}")
+        return
+    # Update in place: handlers may hold a reference to this record across awaits
+    for name in _RECORD_FIELDS[section]:
+        setattr(local, name, getattr(updated, name))
+    _reindex(section, key)
+    _bases[(section, key)] = _json_dumps(theirs)  # what disk has now
+    _invalidate_fragment(section, key)
+    save_scheduler.requeue(section, key)
+    save_scheduler.conflicts_merged += 1
+    logger.info("Merged concurrent changes to %s %s", section, key)
+
+
+def _read_changes(sections) -> List[Tuple["Shard", Optional[Tuple]]]:
+    """Disk half of a catch-up: each changed shard's new entries, read under its shared flock"""
+    changes = []
+    for section in sections:
+        shard = SHARDS[section]
+        if shard.sigs() == shard.seen:
+            continue
+        try:
+            with shard.flock(exclusive=False):
+                changes.append((shard, shard.read_changes()))
+        except Exception as e:
+            logger.exception("Failed catching up with %s: %s", section, e)
+    return changes
+
+
+def _apply_changes(changes: List[Tuple["Shard", Optional[Tuple]]]) -> int:
+    applied = 0
+    for shard, change in changes:
+        try:
+            applied += shard.apply_changes(change)
+        except Exception as e:
+            logger.exception("Failed catching up with %s: %s", shard.section, e)
+    return applied
+
+
+def _catch_up(sections):
+    """Apply what other processes wrote to these sections, merging into our unsaved edits"""
+    if STORAGE_BACKEND == "sqlite":
+        _load_sqlite()
+        return
+    _apply_changes(_read_changes(sections))
+
+
+async def _catch_up_async(sections) -> int:
+    """_catch_up() from the event loop: the files are read on the save worker"""
+    if STORAGE_BACKEND == "sqlite":
+        return _apply_sqlite_changes(await save_scheduler.run(_read_sqlite_changes))
+    return _apply_changes(await save_scheduler.run(_read_changes, sections))
+
+
+async def refresh_data():
+    """load_all() for handlers. Our queued saves are handed to the worker without waiting
+    for them and the files are read there behind them; only installing what other
+    processes changed runs on the loop."""
+    save_scheduler.flush()
+    applied = await _catch_up_async(SHARDS)
+    if applied:
+        logger.info("Reload applied %d changes", applied)
+
+
+def _apply_journal_entry(entry: Dict[str, Any]):
+    section = entry["s"]
+    if entry["op"] == "set":
+        _load_section(section, entry["v"])
+        _invalidate_fragment(section)
+    elif section not in KEYED_SECTIONS:
+        return
+    elif entry["op"] == "put":
+        _put_entity(section, _section_key(section, entry["k"]), entry["v"])
+    elif entry["op"] == "del":
+        _drop_entity(section, _section_key(section, entry["k"]))
+
+
+def _read_journal(path: str, start: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Parse complete journal lines from byte offset `start`; returns (entries, end offset)"""
+    if not os.path.exists(path):
+        return [], 0
+    entries = []
+    pos = start
+    with open(path, "rb") as f:
+        f.seek(start)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # another writer is mid-append; pick it up next time
+            pos += len(line)
+            if not line.strip():
+                continue
             try:
-                global inquiry_responses
-                inquiry_responses = data["inquiry_responses"]
+                entries.append(_json_loads(line))
+            except ValueError as e:
+                # A torn line after a crash is expected; anything else is logged and skipped
+                logger.warning("Skipping journal entry in %s at byte %d: %s", path, pos - len(line), e)
+    return entries, pos
+
+
+def _apply_journal(entries: List[Dict[str, Any]]) -> int:
+    applied = 0
+    for entry in entries:
+        try:
+            _apply_journal_entry(entry)
+            applied += 1
+        except Exception as e:
+            logger.warning("Skipping journal entry for %s: %s", entry.get("s") if isinstance(entry, dict) else entry, e)
+    return applied
+
+
+def _replay_journal(path: str, start: int = 0) -> Tuple[int, int]:
+    """Apply complete journal lines from byte offset `start`; returns (applied, end offset)"""
+    entries, end = _read_journal(path, start)
+    return _apply_journal(entries), end
+
+
+# Change detection for reloads lives on each Shard; our own writes keep it current,
+# so load_all() only does work when another process touched the data.
+_sqlite_data_version: Optional[int] = None
+_sqlite_epoch: Optional[str] = None  # changes-table epoch and change number memory is at
+_sqlite_seq = 0
+_loaded = False
+
+def _file_sig(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+def load_all():
+    """Bring memory up to date with the data on disk; a no-op when nothing changed"""
+    # Anything still waiting in the write-behind queue must land before we reread
+    flush_saves()
+
+    startup = not _loaded
+    started = time.perf_counter()
+    if STORAGE_BACKEND == "sqlite":
+        _load_sqlite()
+    else:
+        _load_json()
+    if startup:
+        rss = _peak_rss_mb()
+        logger.info(
+            "Startup load: %d users, %d orders, %d issues, %d callbacks, %d inquiries in %.2fs, peak RSS %s",
+            len(user_data_store), len(orders), len(issues), len(callbacks), len(inquiries),
+            time.perf_counter() - started, f"{rss:.1f} MB" if rss is not None else "n/a",
+        )
+
+
+# Streaming snapshot reader. A keyed section is announced as (section, None, {})
+# and then yielded one (section, key, value) entry at a time; whole sections come
+# through as (section, None, value). Only one record is materialized at a time.
+_json_decoder = json.JSONDecoder()
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+STREAM_CHUNK = 64 * 1024
+
+
+class _JsonStream:
+    """Pull parser over a text file with a bounded read buffer"""
+
+    def __init__(self, f, chunk: int = STREAM_CHUNK):
+        self.f = f
+        self.chunk = chunk
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        # Drop what was consumed; read at least as much again as we hold so a
+        # value bigger than one chunk is not reparsed once per chunk
+        data = self.f.read(max(self.chunk, len(self.buf) - self.pos))
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _JSON_WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            raise ValueError(f"Expected {ch!r} in snapshot, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        return self.raw_value()[0]
+
+    def raw_value(self) -> Tuple[Any, str]:
+        """Next value together with its JSON text"""
+        self.peek()
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue  # a number could continue in the next chunk
+            raw = self.buf[self.pos:end]
+            self.pos = end
+            return value, raw
+
+
+def _iter_object(s: _JsonStream, section: str):
+    """Stream one keyed section: a header entry, then one (section, key, value, text)
+    entry per key"""
+    s.expect("{")
+    yield section, None, {}
+    if s.peek() != "}":
+        while True:
+            key = s.value()
+            s.expect(":")
+            yield (section, key, *s.raw_value())
+            if s.peek() != ",":
+                break
+            s.pos += 1
+    s.expect("}")
+
+
+def _iter_snapshot(f):
+    """Stream the legacy single-file snapshot"""
+    s = _JsonStream(f)
+    s.expect("{")
+    if s.peek() == "}":
+        return
+    while True:
+        section = s.value()
+        s.expect(":")
+        if section in KEYED_SECTIONS and s.peek() == "{":
+            yield from _iter_object(s, section)
+        else:
+            yield section, None, s.value()
+        if s.peek() != ",":
+            break
+        s.pos += 1
+    s.expect("}")
+
+
+def _install_entries(entries, diff: bool = False) -> int:
+    """Install streamed (section, key, value[, JSON text]) entries. With diff=True only
+    entities that differ from memory are replaced or removed; otherwise each section is
+    rebuilt from its header onwards. Returns the number of entities applied."""
+    seen_keys: Dict[str, set] = {}
+    applied = 0
+    for section, key, value, *raw in entries:
+        if section not in KEYED_SECTIONS:
+            if section not in WHOLE_SECTIONS:
+                continue
+            if diff and _encode_value(section, globals()[WHOLE_SECTIONS[section]]) == value:
+                continue
+            try:
+                _load_section(section, value)
             except Exception as e:
-                logger.error(f"Failed to load inquiry responses: {e}")
-                
-        if "tips_guides" in data:
+                logger.error(f"Failed to load {section}: {e}")
+            _invalidate_fragment(section)
+            applied += 1
+            continue
+
+        if key is None:
+            # Section header
+            seen_keys[section] = set()
+            if not diff:
+                _fragments.get(section, {}).clear()
+                # Prices merge into the built-in defaults; live sessions stay put after startup
+                if section != "item_prices" and not (section == "user_states" and _sessions_restored):
+                    globals()[KEYED_SECTIONS[section]].clear()
+                    if section in REQUEST_SECTIONS:
+                        for index in REQUEST_INDEXES:
+                            index.clear_section(section)
+                    elif section == "user_data":
+                        search_index.clear_section(section)
+                        _customer_cards.clear()
+            continue
+
+        key = _section_key(section, key)
+        seen_keys[section].add(key)
+        if section == "user_states":
+            if not _sessions_restored:
+                user_states[key] = value
+            continue
+        store = globals()[KEYED_SECTIONS[section]]
+        # Text from an indented file (the legacy layout) is re-encoded, not spliced
+        # into our one-record-per-line snapshots
+        frag = raw[0] if raw and "\n" not in raw[0] else None
+        if diff and key in store:
+            if frag is not None and _fragments.get(section, {}).get(key) == frag:
+                continue  # byte-identical to what we last synced
+            if _encode_value(section, store[key]) == value:
+                continue
+        _put_entity(section, key, value, frag)
+        applied += 1
+
+    if diff:
+        for section, keys in seen_keys.items():
+            if section == "user_states":
+                continue
+            store = globals()[KEYED_SECTIONS[section]]
+            for key in [k for k in store if k not in keys]:
+                _drop_entity(section, key)
+                applied += 1
+    return applied
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _read_sqlite_changes() -> Optional[Tuple]:
+    """Disk half of a SQLite reload: None when no other connection has committed since
+    we last looked, else the data version plus what changes_since() read"""
+    store = _sqlite_store()
+    version = store.data_version()
+    if version == _sqlite_data_version:
+        return None
+    return (version, *store.changes_since(_sqlite_epoch, _sqlite_seq))
+
+
+def _apply_sqlite_rows(rows: List[Tuple[str, Any, Any]]) -> int:
+    """Install changed (section, key, value) rows; a None value is a delete"""
+    applied = 0
+    for section, key, value in rows:
+        if section in WHOLE_SECTIONS:
+            if value is None or _encode_value(section, globals()[WHOLE_SECTIONS[section]]) == value:
+                continue
             try:
-                global tips_guides
-                tips_guides = data["tips_guides"]
+                _load_section(section, value)
             except Exception as e:
-                logger.error(f"Failed to load tips and guides: {e}")
-                
-        logger.info("Data loaded successfully")
-        
-        # After successful load, create a backup
-        backup_file = DATA_FILE + ".bak"
+                logger.error(f"Failed to load {section}: {e}")
+            _invalidate_fragment(section)
+        elif section in KEYED_SECTIONS:
+            store = globals()[KEYED_SECTIONS[section]]
+            if value is None:
+                if key not in store:
+                    continue
+                _drop_entity(section, key)
+            elif key in store and _encode_value(section, store[key]) == value:
+                continue  # our own write, or one we have already seen
+            else:
+                _put_entity(section, key, value)
+        applied += 1
+    return applied
+
+
+def _apply_sqlite_changes(changes: Optional[Tuple]) -> int:
+    global _sqlite_data_version, _sqlite_epoch, _sqlite_seq
+    if changes is None:
+        return 0
+    version, epoch, seq, full, entries = changes
+    applied = _install_entries(entries, diff=True) if full else _apply_sqlite_rows(entries)
+    _sqlite_data_version, _sqlite_epoch, _sqlite_seq = version, epoch, seq
+    return applied
+
+
+def _load_sqlite():
+    global _sessions_restored, _sqlite_data_version, _sqlite_epoch, _sqlite_seq, _loaded
+    try:
+        store = _sqlite_store()
+        if _loaded:
+            applied = _apply_sqlite_changes(_read_sqlite_changes())
+            if applied:
+                logger.info("Reload applied %d changed entities", applied)
+            return
+        # Taken first: anything committed while we read is read again, harmlessly
+        version = store.data_version()
+        epoch, seq = store.position()
+        if store.is_empty() and (os.path.isdir(DATA_DIR) or any(os.path.exists(p) for p in _legacy_paths())):
+            # First start on SQLite: import the JSON data, then write it to the database
+            logger.info("Importing JSON data into %s", SQLITE_FILE)
+            _load_json()
+            save_all()
+        else:
+            _install_entries(store.iter_entries())
+            _sessions_restored = True
+            logger.info("Data loaded successfully from %s", SQLITE_FILE)
+        _sqlite_data_version, _sqlite_epoch, _sqlite_seq = version, epoch, seq
+        _loaded = True
+    except Exception as e:
+        logger.exception("Critical error loading data from SQLite: %s", e)
+
+
+def _legacy_paths() -> List[str]:
+    return [DATA_FILE, DATA_FILE + ".bak", LEGACY_COMPACTING_FILE, LEGACY_JOURNAL_FILE]
+
+
+def _migrate_legacy():
+    """Split the old single data file (plus its journals) into per-section shards"""
+    global _sessions_restored, _loaded
+    source = DATA_FILE if os.path.exists(DATA_FILE) else DATA_FILE + ".bak"
+    if os.path.exists(source):
         try:
-            import shutil
-            shutil.copy2(DATA_FILE, backup_file)
-        except Exception as e:
-            logger.warning("Failed to create backup after load: %s", e)
-            
+            with open(source, "r", encoding="utf-8") as f:
+                _install_entries(_iter_snapshot(f))
+        except ValueError:
+            if source != DATA_FILE or not os.path.exists(DATA_FILE + ".bak"):
+                raise
+            with open(DATA_FILE + ".bak", "r", encoding="utf-8") as f:
+                _install_entries(_iter_snapshot(f))
+            logger.info("Loaded data from backup file due to corrupted main file")
+    replayed = _replay_journal(LEGACY_COMPACTING_FILE)[0] + _replay_journal(LEGACY_JOURNAL_FILE)[0]
+    save_all()
+    # Keep the old files around, out of the way
+    for path in _legacy_paths():
+        if os.path.exists(path):
+            os.replace(path, path + ".migrated")
+    _sessions_restored = True
+    _loaded = True
+    logger.info("Migrated %s (%d journal entries) into per-section shards in %s/", DATA_FILE, replayed, DATA_DIR)
+
+
+def _load_shard(shard: Shard, first_load: bool) -> int:
+    try:
+        with shard.flock(exclusive=False):
+            return shard.load(first_load)
     except Exception as e:
-        logger.exception("Critical error loading data: %s", e)
-        # Try to restore from backup
-        backup_file = DATA_FILE + ".bak"
-        if os.path.exists(backup_file):
+        logger.exception("Critical error loading %s: %s", shard.section, e)
+        return 0
+
+
+def _load_json():
+    """Load the shards in parallel, each one's journal replayed on top of its snapshot"""
+    global _sessions_restored, _loaded
+
+    # Never read half of an in-flight compaction
+    if _compaction_thread is not None:
+        _compaction_thread.join()
+
+    first_load = not _loaded
+    if first_load and not os.path.isdir(DATA_DIR) and any(os.path.exists(p) for p in _legacy_paths()):
+        fd = os.open(DATA_FILE + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            if not os.path.isdir(DATA_DIR):  # another worker may have migrated while we waited
+                _migrate_legacy()
+                return
+        except Exception as e:
+            logger.exception("Critical error migrating %s: %s", DATA_FILE, e)
+            return
+        finally:
+            os.close(fd)  # closing drops the lock
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    todo = [shard for shard in SHARDS.values() if first_load or shard.sigs() != shard.seen]
+    if not todo:
+        return
+    # Every shard feeds a different store, so they can be parsed side by side
+    with ThreadPoolExecutor(max_workers=min(8, len(todo)), thread_name_prefix="shard-load") as pool:
+        applied = sum(pool.map(lambda shard: _load_shard(shard, first_load), todo))
+    _sessions_restored = True
+    _loaded = True
+    if first_load:
+        logger.info("Data loaded successfully from %d shards", len(todo))
+        if any(not os.path.exists(shard.data_file) for shard in SHARDS.values()):
+            save_all()  # Create the missing shard files
+    else:
+        logger.info("Reload applied %d changes from %d shards", applied, len(todo))
+
+# Request IDs: the category prefix plus ID_WIDTH Crockford base32 characters of a
+# counter in 1/ID_TICKS_PER_SECOND second steps since ID_EPOCH. IDs are compact
+# enough to type, sort by creation time, and never repeat: the last value issued
+# (the high-water mark) is kept in ID_STATE_FILE and advanced under a file lock, so
+# every process allocates past it. A burst faster than the tick rate borrows ticks
+# from the next second. Older IDs are the prefix plus four random digits.
+ID_STATE_FILE = "teeshoot_ids.hwm"
+ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ID_EPOCH = 1735689600  # 2025-01-01 UTC
+ID_TICKS_PER_SECOND = 32
+ID_WIDTH = 7  # 32**7 ticks last about 34 years
+REQUEST_ID_RE = re.compile(r"\b(ORD|ISS|CB|INQ)(\d{4}|[0-9A-HJKMNP-TV-Z]{%d})\b" % ID_WIDTH)
+_ID_LOOKALIKES = str.maketrans("ILO", "110")
+
+
+class IdAllocator:
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def _next_value(self) -> int:
+        with self.lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
             try:
-                os.replace(backup_file, DATA_FILE)
-                logger.info("Restored data from backup file after critical error")
-                # Recursively try to load again
-                load_all()
-            except Exception as restore_e:
-                logger.exception("Failed to restore from backup: %s", restore_e)
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    hwm = int(os.read(fd, 32) or 0)
+                except ValueError:
+                    hwm = 0  # unreadable mark: the clock alone still moves forward
+                value = max(int((time.time() - ID_EPOCH) * ID_TICKS_PER_SECOND), hwm + 1)
+                # Fixed-width record, so the file is always overwritten in full
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, b"%020d" % value)
+                if DURABILITY != "relaxed":
+                    os.fsync(fd)
+            finally:
+                os.close(fd)  # releases the flock
+        return value
+
+    def next(self, section: str) -> str:
+        value = self._next_value()
+        digits = []
+        while value:
+            value, d = divmod(value, 32)
+            digits.append(ID_ALPHABET[d])
+        return CATEGORY_PREFIXES[section] + "".join(reversed(digits)).rjust(ID_WIDTH, "0")
+
+
+id_allocator = IdAllocator(ID_STATE_FILE)
+
+
+def new_request_id(section: str) -> str:
+    """Allocate the next ID for a request in section. Blocking (one small fsync), so
+    handlers call it through asyncio.to_thread."""
+    return id_allocator.next(section)
+
+
+def parse_request_id(text: str) -> Optional[str]:
+    """Canonical request ID typed by a user, or None. Accepts lower case and the
+    look-alikes I, L and O for 1, 1 and 0 in the ID part, as Crockford base32 does."""
+    text = text.strip().upper()
+    for prefix in CATEGORY_PREFIXES.values():
+        if text.startswith(prefix):
+            candidate = prefix + text[len(prefix):].translate(_ID_LOOKALIKES)
+            if REQUEST_ID_RE.fullmatch(candidate):
+                return candidate
+    return None
+
+
+def request_id_ts(req_id: str) -> Optional[int]:
+    """Creation time encoded in an allocated ID (epoch seconds), None for old IDs"""
+    match = REQUEST_ID_RE.fullmatch(req_id)
+    if not match or len(match.group(2)) != ID_WIDTH:
+        return None
+    value = 0
+    for ch in match.group(2):
+        value = value * 32 + ID_ALPHABET.index(ch)
+    return ID_EPOCH + value // ID_TICKS_PER_SECOND
+
+# Cold storage: requests in a terminal status are moved out of memory into
+# append-only gzip JSONL segments, one per category and month. index.jsonl maps
+# each archived ID to its segment. Lookups go through the index, so an ID that was
+# never archived costs a dict lookup; the file is read in full once, then only what
+# was appended to it since (by any process).
+ARCHIVE_DIR = "teeshoot_archive"
+ARCHIVE_INDEX_FILE = os.path.join(ARCHIVE_DIR, "index.jsonl")
+ARCHIVE_AFTER_DAYS = int(os.environ.get("TEESHOOT_ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_INTERVAL = 6 * 60 * 60  # seconds between archive passes
+
+CATEGORY_PREFIXES = {"orders": "ORD", "issues": "ISS", "callbacks": "CB", "inquiries": "INQ"}
+PENDING_STATUSES = {
+    "orders": ("pending_confirmation", "payment_submitted", "confirmed"),
+    "issues": ("reported", "under_review"),
+    "callbacks": ("pending",),
+    "inquiries": ("pending_response",),
+}
+TERMINAL_STATUSES = {
+    "orders": {"delivered", "cancelled"},
+    "issues": {"resolved", "closed"},
+    "callbacks": {"completed"},
+    "inquiries": {"resolved"},
+}
+
+_archive_index: Dict[str, Tuple[str, str]] = {}  # id -> (category, segment file)
+_archive_index_read: Optional[Tuple[int, int]] = None  # (inode, bytes) of index.jsonl read so far
+_archive_cache: Dict[str, Any] = {}  # recently read archived records
+_archive_lock = threading.Lock()
+
+
+def _load_archive_index() -> Dict[str, Tuple[str, str]]:
+    """The archive index, caught up with index.jsonl. Blocking I/O when the file grew."""
+    global _archive_index_read
+    with _archive_lock:
+        sig = _file_sig(ARCHIVE_INDEX_FILE)
+        if sig is None:
+            return _archive_index
+        read = _archive_index_read
+        if read is not None and read[0] == sig[0] and read[1] <= sig[1]:
+            if read[1] == sig[1]:
+                return _archive_index
+            start = read[1]
+        else:
+            _archive_index.clear()  # replaced, say by a restore: read it again
+            start = 0
+        pos = start
+        with open(ARCHIVE_INDEX_FILE, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # another process is mid-append
+                pos += len(line)
+                try:
+                    entry = json.loads(line)
+                    _archive_index[entry["id"]] = (entry["c"], entry["seg"])
+                except (ValueError, KeyError):
+                    continue  # torn line from a crash mid-append
+        _archive_index_read = (sig[0], pos)
+        return _archive_index
+
+
+def _write_archive(batches: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]]):
+    """Append records to their segments, then to the index. Runs off the event loop."""
+    import gzip
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    index_lines = []
+    for (category, month), records in batches.items():
+        segment = f"{category}-{month}.jsonl.gz"
+        lines = "".join(json.dumps({"id": rid, "v": value}, ensure_ascii=False) + "\n" for rid, value in records)
+        # Each append adds a new gzip member; readers see one continuous stream
+        with gzip.open(os.path.join(ARCHIVE_DIR, segment), "ab") as f:
+            f.write(lines.encode("utf-8"))
+        index_lines.extend(json.dumps({"id": rid, "c": category, "seg": segment}) + "\n" for rid, _ in records)
+    with open(ARCHIVE_INDEX_FILE, "a", encoding="utf-8") as f:
+        f.write("".join(index_lines))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def archive_cold_requests() -> int:
+    """Move terminal requests older than ARCHIVE_AFTER_DAYS to the archive"""
+    cutoff = now_ts() - ARCHIVE_AFTER_DAYS * 86400
+    batches: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]] = {}
+    moving = []
+    for category, terminal in TERMINAL_STATUSES.items():
+        store = globals()[category]
+        for status in terminal:
+            # Oldest first, so the scan stops at the first request that is still warm
+            for ts, rid in requests_by_status.oldest(category, status):
+                if ts >= cutoff:
+                    break
+                month = fmt_ts(request_id_ts(rid) or ts)[:7]  # allocated IDs carry their month
+                value = _encode_value(category, store[rid])
+                batches.setdefault((category, month), []).append((rid, value))
+                moving.append((category, rid, value))
+    if not moving:
+        return 0
+
+    index = _load_archive_index()
+    # Archive must be durable before the records leave the hot set
+    await asyncio.to_thread(_write_archive, batches)
+    for (category, month), records in batches.items():
+        for rid, _ in records:
+            index[rid] = (category, f"{category}-{month}.jsonl.gz")
+            _archive_cache.pop(rid, None)  # superseded by the copy just written
+    moved = 0
+    for category, rid, value in moving:
+        record = globals()[category].get(rid)
+        if record is None or _encode_value(category, record) != value:
+            # Changed while the archive was written (say, reopened by an admin): it stays
+            # hot, and the copy archived next time supersedes this one
+            continue
+        globals()[category].pop(rid)
+        save_record(category, rid)
+        moved += 1
+    logger.info("Archived %d cold requests", moved)
+    return moved
+
+
+def find_archived(req_id: str) -> Optional[Tuple[str, Any]]:
+    """Look an ID up in the archive; returns (category, record) or None. Blocking I/O."""
+    if req_id in _archive_cache:
+        return _archive_cache[req_id]
+    located = _load_archive_index().get(req_id)
+    if not located:
+        return None  # never archived: no segment is opened
+    category, segment = located
+    import gzip
+    found = None
+    try:
+        with gzip.open(os.path.join(ARCHIVE_DIR, segment), "rt", encoding="utf-8") as f:
+            for line in f:
+                if req_id not in line:
+                    continue
+                entry = json.loads(line)
+                if entry["id"] == req_id:
+                    found = (category, _decode_record(category, entry["v"]))  # last copy wins
+    except (OSError, EOFError, ValueError) as e:
+        logger.warning("Failed reading archive segment %s: %s", segment, e)
+    if found:
+        if len(_archive_cache) >= 256:
+            _archive_cache.pop(next(iter(_archive_cache)))
+        _archive_cache[req_id] = found
+    return found
+
+
+async def locate_request(req_id: str) -> Optional[Tuple[str, Any]]:
+    """(category, record) for any request ID, in memory or archived. Archived records
+    are read-only: code that changes a request uses request_registry.get()."""
+    found = request_registry.get(req_id)
+    if found is None:
+        found = await asyncio.to_thread(find_archived, req_id)
+    return found
+
+
+async def archive_loop():
+    while True:
+        try:
+            await archive_cold_requests()
+        except Exception as e:
+            logger.exception("Archive pass failed: %s", e)
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+
+
+# Backups: BACKUP_KEEP timestamped generations under BACKUP_DIR, taken every
+# BACKUP_INTERVAL_HOURS. Files are reflinked where the filesystem supports it, so
+# unchanged data costs no space. Elsewhere snapshots, which are only ever replaced and
+# never rewritten in place, are hardlinked, and journals (appended in place) copied.
+# On SQLite a generation is an online copy of the database.
+BACKUP_DIR = "teeshoot_backups"
+BACKUP_KEEP = int(os.environ.get("TEESHOOT_BACKUP_KEEP", "7"))
+BACKUP_INTERVAL_HOURS = float(os.environ.get("TEESHOOT_BACKUP_INTERVAL_HOURS", "24"))
+BACKUP_CHECK_INTERVAL = 60 * 60  # seconds between checks whether a backup is due
+FICLONE = 0x40049409  # Linux ioctl: share the source's extents (btrfs, XFS, ...)
+
+
+def _clone_file(src: str, dst: str, link: bool = False):
+    """Copy a file as a reflink where the filesystem supports it. Otherwise hardlink it
+    when link=True (only for files never written in place), or copy it."""
+    if fcntl is not None:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                pass
+        os.remove(dst)
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:  # no hardlinks here (or another device)
+            pass
+    shutil.copyfile(src, dst)
+
+
+def list_backups() -> List[str]:
+    """Backup generations, oldest first"""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    generations = []
+    for entry in os.scandir(BACKUP_DIR):
+        if not entry.name.startswith(".") and entry.is_dir():
+            # Names can tie within a second; a generation's mtime is when it was filled
+            generations.append((entry.stat().st_mtime_ns, entry.name))
+    return [name for _, name in sorted(generations)]
+
+
+def _backup_lock() -> int:
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    fd = os.open(os.path.join(BACKUP_DIR, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd
+
+
+def _backup_generation(target: str):
+    """Fill one generation directory from the live data"""
+    if STORAGE_BACKEND == "sqlite":
+        store = _sqlite_store()
+        dest = sqlite3.connect(os.path.join(target, os.path.basename(SQLITE_FILE)))
+        try:
+            with store.lock:
+                store.conn.backup(dest)
+            dest.execute("PRAGMA journal_mode=DELETE")  # one self-contained file
+        finally:
+            dest.close()
+        return
+    for shard in SHARDS.values():
+        # Appends and compactions wait, so the snapshot and its journals match
+        with shard.flock():
+            if os.path.exists(shard.data_file):
+                _clone_file(shard.data_file, os.path.join(target, os.path.basename(shard.data_file)), link=True)
+            for path in (shard.compacting_file, shard.journal_file):
+                if os.path.exists(path):
+                    _clone_file(path, os.path.join(target, os.path.basename(path)))
+
+
+def take_backup(label: str = "", prune: bool = True) -> str:
+    """Write a new generation and prune the oldest ones; returns its name. Blocking I/O."""
+    fd = _backup_lock()
+    try:
+        name = base = datetime.now(NIGERIA_TZ).strftime("%Y%m%d-%H%M%S") + (f"-{label}" if label else "")
+        existing = set(list_backups())
+        suffix = 1
+        while name in existing:
+            suffix += 1
+            name = f"{base}.{suffix}"
+        target = os.path.join(BACKUP_DIR, name)
+        # Built under a hidden name and renamed, so a crash never leaves half a generation
+        partial = os.path.join(BACKUP_DIR, "." + name)
+        shutil.rmtree(partial, ignore_errors=True)
+        os.makedirs(partial)
+        _backup_generation(partial)
+        os.replace(partial, target)
+        _fsync_dir(BACKUP_DIR)
+        for old in list_backups()[:-BACKUP_KEEP] if prune and BACKUP_KEEP > 0 else []:
+            shutil.rmtree(os.path.join(BACKUP_DIR, old), ignore_errors=True)
+            logger.info("Pruned backup %s", old)
+        logger.info("Backup %s written", name)
+        return name
+    finally:
+        os.close(fd)
+
+
+def backup_if_due() -> Optional[str]:
+    """Take a backup unless the newest generation is younger than BACKUP_INTERVAL_HOURS"""
+    generations = list_backups()
+    if generations:
+        age = time.time() - os.path.getmtime(os.path.join(BACKUP_DIR, generations[-1]))
+        if age < BACKUP_INTERVAL_HOURS * 3600:
+            return None
+    return take_backup()
+
+
+def resolve_backup(name: str) -> str:
+    """Generation name for a user-supplied name or "latest"; ValueError if there is none"""
+    generations = list_backups()
+    if name == "latest" and generations:
+        return generations[-1]
+    if name not in generations:
+        raise ValueError(f"No backup generation {name!r}")
+    return name
+
+
+def _check_generation(name: str):
+    """Raise ValueError unless the generation is there in full and readable"""
+    source = os.path.join(BACKUP_DIR, name)
+    if not os.path.isdir(source):
+        raise ValueError(f"No backup generation {name!r}")
+    if STORAGE_BACKEND == "sqlite":
+        path = os.path.join(source, os.path.basename(SQLITE_FILE))
+        if not os.path.exists(path):
+            raise ValueError(f"Backup {name} has no {os.path.basename(SQLITE_FILE)}")
+        src = sqlite3.connect(f"file:{path}?immutable=1", uri=True)
+        try:
+            result = src.execute("PRAGMA quick_check").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            result = str(e)
+        finally:
+            src.close()
+        if result != "ok":
+            raise ValueError(f"Backup {name} is damaged: {result}")
+        return
+    for shard in SHARDS.values():
+        saved = os.path.join(source, os.path.basename(shard.data_file))
+        if not os.path.exists(saved):
+            if os.path.exists(shard.data_file):
+                raise ValueError(f"Backup {name} is incomplete: no {os.path.basename(saved)}")
+            continue
+        try:
+            for _ in shard._snapshot_entries(saved):
+                pass
+        except Exception as e:  # codecs fail in their own ways
+            raise ValueError(f"Backup {name} is damaged: {os.path.basename(saved)}: {e}")
+
+
+def _restore_files(name: str):
+    """Replace the live files with a backup generation. The generation is checked first,
+    then a pre-restore generation of the current data is taken, so a restore can itself
+    be undone. Blocking I/O; the caller runs it on the save worker, behind pending
+    saves, and reloads after. ValueError when the generation cannot be restored."""
+    source = os.path.join(BACKUP_DIR, name)
+    _check_generation(name)
+    take_backup("pre-restore", prune=False)  # pruning could drop the generation we restore
+    if STORAGE_BACKEND == "sqlite":
+        global _sqlite_data_version
+        store = _sqlite_store()
+        # Read-only, so the generation (and its mtime, which orders generations) stays untouched
+        src = sqlite3.connect(f"file:{os.path.join(source, os.path.basename(SQLITE_FILE))}?immutable=1", uri=True)
+        try:
+            with store.lock:
+                src.backup(store.conn)
+        finally:
+            src.close()
+        store.new_epoch()  # the change numbers went back with the data
+        _sqlite_data_version = None  # our own connection wrote it, so force the reload
+    else:
+        fds = [shard.acquire_flock() for shard in SHARDS.values()]
+        try:
+            for shard in SHARDS.values():
+                with shard.lock:
+                    if shard._journal_fh is not None:
+                        shard._journal_fh.close()
+                        shard._journal_fh = None
+                    for path in (shard.data_file, shard.compacting_file, shard.journal_file):
+                        saved = os.path.join(source, os.path.basename(path))
+                        if os.path.exists(saved):
+                            _clone_file(saved, path + ".tmp", link=path == shard.data_file)
+                            os.replace(path + ".tmp", path)
+                        elif os.path.exists(path):
+                            os.remove(path)
+            _fsync_dir(DATA_DIR)
+        finally:
+            for fd in fds:
+                Shard.release_flock(fd)
+    logger.info("Restored backup %s", name)
+
+
+async def backup_loop():
+    while True:
+        try:
+            await asyncio.to_thread(backup_if_due)
+        except Exception as e:
+            logger.exception("Scheduled backup failed: %s", e)
+        await asyncio.sleep(BACKUP_CHECK_INTERVAL)
+
 
 # UI and helpers
 MAIN_BTNS = [
@@ -339,6 +2686,7 @@ MAIN_BTNS = [
     [KeyboardButton("🛠 Report an Issue"), KeyboardButton("🚚 Track Request")],
     [KeyboardButton("💰 Price List"), KeyboardButton("📘 Tips & Guides")],
     [KeyboardButton("🧑‍🔧 Find a Technician"), KeyboardButton("👤 My Profile")],
+    [KeyboardButton("📋 My Requests")],
 ]
 MAIN_KB = ReplyKeyboardMarkup(MAIN_BTNS, resize_keyboard=True)
 
@@ -364,7 +2712,6 @@ def get_prev_category(current: str) -> str:
 def fmt_money(n: int) -> str: return f"₦{n:,}"
 def is_valid_phone(s: str) -> bool: return bool(re.match(r"^(?:\+?234|0)\d{10}$", re.sub(r"[^\d+]", "", s)))
 def safe_username(u: Optional[str]) -> str: return f"@{u}" if u else "No username"
-def _rand4() -> int: import random; return random.randint(1000, 9999)
 def is_owner(update: Update) -> bool: 
     return update.effective_user and update.effective_user.id in ADMIN_IDS
 
@@ -373,7 +2720,49 @@ def bump_user_req(uid: int, last_id: str):
     profile = user_data_store.setdefault(uid, UserProfile())
     profile.requests += 1
     profile.last_order = last_id
-    save_all()
+    save_record("user_data", uid)
+
+# Customer cards: how admin notifications describe the user behind a request.
+# Rendered once per user and request name/username, and dropped by _reindex()
+# whenever that user's profile is saved or reloaded (profile edits, bump_user_req).
+_customer_cards: Dict[int, Dict[Tuple[str, Optional[str], str], str]] = {}
+
+
+def _customer_render(request: Any, kind: str) -> str:
+    cards = _customer_cards.setdefault(request.user_id, {})
+    key = (kind, request.username, request.name)
+    card = cards.get(key)
+    if card is None:
+        profile = user_data_store.get(request.user_id) or UserProfile()
+        if kind == "card":
+            card = (
+                "👤 CUSTOMER INFO:\n"
+                + (f"📱 Telegram: @{request.username}\n" if request.username else "📱 Telegram: No username\n")
+                + f"🆔 User ID: {request.user_id}\n"
+                f"📛 Name: {profile.name or request.name or 'N/A'}\n"
+                f"📞 Phone: {profile.phone or 'N/A'}\n"
+                f"📧 Email: {profile.email or 'N/A'}\n"
+                f"🏢 Department: {profile.department or 'N/A'}\n"
+                f"🚪 Hall: {profile.room or 'N/A'}\n"
+                f"🔢 Room Number: {profile.room_number or 'N/A'}"
+            )
+        elif request.username:
+            card = f"{request.name} | @{request.username}"
+        else:
+            card = f"{request.name} | {profile.phone or 'No contact info'}"
+        cards[key] = card
+    return card
+
+
+def customer_card(request: Any) -> str:
+    """The CUSTOMER INFO block for the user who made a request"""
+    return _customer_render(request, "card")
+
+
+def customer_line(request: Any) -> str:
+    """One-line name and contact of the user who made a request"""
+    return _customer_render(request, "line")
+
 
 async def notify_admin(context: ContextTypes.DEFAULT_TYPE, text: str):
     for admin_id in ADMIN_IDS:
@@ -412,7 +2801,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(welcome, parse_mode=ParseMode.MARKDOWN, reply_markup=MAIN_KB)
 
 async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    txt = "🆘 *Help*\n\n• /start — show main menu\n• /help — this screen\n• /cancel — cancel current flow\n• /id — show your Telegram ID\n• /admin — (admin only) stats\n• /broadcast <msg> — (admin)\n• /dump — (admin) dump JSON snapshot\n• /prices — (admin) manage prices\n• /manageorders — (admin) list and manage orders\n• /addadmin <id> — (admin) add new admin\n• /removeadmin <id> — (owner only) remove admin\n• /listadmins — (admin) list all admins"
+    txt = "🆘 *Help*\n\n• /start — show main menu\n• /help — this screen\n• /cancel — cancel current flow\n• /id — show your Telegram ID\n• /admin — (admin only) stats\n• /broadcast <msg> — (admin)\n• /dump — (admin) dump JSON snapshot\n• /archive — (owner) archive old closed requests\n• /restore [name] — (owner) list or restore backups\n• /search <text> — (admin) find requests by text or phone\n• /prices — (admin) manage prices\n• /manageorders — (admin) list and manage orders\n• /addadmin <id> — (admin) add new admin\n• /removeadmin <id> — (owner only) remove admin\n• /listadmins — (admin) list all admins"
     await update.message.reply_text(txt, parse_mode=ParseMode.MARKDOWN)
 
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -437,22 +2826,15 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             new_status = text[7:].strip()
             # Find request ID in original message
             orig_text = update.message.reply_to_message.text
-            import re
-            # Look for any request ID format (ORD, ISS, CB, INQ followed by numbers)
-            match = re.search(r'((?:ORD|ISS|CB|INQ)\d+)', orig_text)
+            # Look for any request ID format (ORD, ISS, CB, INQ followed by the ID)
+            match = REQUEST_ID_RE.search(orig_text)
             if match:
-                req_id = match.group(1)
-                # Determine store based on prefix
-                prefix = req_id[:3]
-                store = None
-                if prefix == 'ORD': store = orders
-                elif prefix == 'ISS': store = issues
-                elif prefix == 'CB': store = callbacks
-                elif prefix == 'INQ': store = inquiries
-                
-                if store and req_id in store:
-                    store[req_id].status = new_status
-                    save_all()
+                req_id = match.group(0)
+                found = request_registry.get(req_id)
+                if found:
+                    section, item = found
+                    item.status = sys.intern(new_status)
+                    save_record(section, req_id)
                     await update.message.reply_text(f"✅ Status updated for {req_id} to: {new_status}")
                     # Show updated admin view
                     await admin_manage(update, context)
@@ -460,8 +2842,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # For admin commands, always reload data first
     if text == "/manageorders":
-        # Shortcut for admins via text command
-        load_all()  # Force data reload
+        # Shortcut for admins via text command; it reloads the data itself
         if is_owner(update):
             await manage_orders_simple(update, context)
             return
@@ -484,6 +2865,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "📘 Tips & Guides": handle_tips_guides,
         "🧑‍🔧 Find a Technician": handle_find_technician,
         "👤 My Profile": handle_my_profile,
+        "📋 My Requests": handle_my_requests,
         "📞 Request Callback": handle_request_callback,
         "⚙️ Settings": handle_settings,
     }
@@ -492,7 +2874,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await menu_map[text](update, context)
         return
 
-    if re.match(r"^(ORD|ISS|CB|INQ)\d{4}$", text.upper()):
+    if parse_request_id(text):
         await handle_track_input(update, context, {})
         return
 
@@ -506,7 +2888,7 @@ async def handle_user_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Allow abrupt menu change -> cancel current
     menu_options = ["💳 Purchase", "❓ Inquiry", "🛠 Report an Issue", "🚚 Track Request", 
                    "💰 Price List", "📘 Tips & Guides", "🧑‍🔧 Find a Technician", 
-                   "👤 My Profile", "📞 Request Callback", "⚙️ Settings"]
+                   "👤 My Profile", "📋 My Requests", "📞 Request Callback", "⚙️ Settings"]
     
     if text in menu_options:
         user_states.pop(uid, None)
@@ -540,8 +2922,181 @@ async def handle_user_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("🤷🏽‍♂️ Not sure what we were doing. Starting fresh.", reply_markup=MAIN_KB)
         user_states.pop(uid, None)
 
+# Render cache: menus and lists built from admin-edited content are rendered once
+# per version of that content. Every save of one of RENDER_SECTIONS, and every
+# reload of one from disk, goes through _content_changed(), which bumps its version.
+RENDER_SECTIONS = ("item_prices", "tips_guides", "inquiry_responses", "technicians", "payment_info")
+_content_versions: Dict[str, int] = dict.fromkeys(RENDER_SECTIONS, 0)
+
+
+def _content_changed(section: str, key: Any = None):
+    _content_versions[section] += 1
+    if section == "item_prices":
+        # Recompiled from the new prices on next use
+        if key is None:
+            _model_matchers.clear()
+        else:
+            _model_matchers.pop(key, None)
+
+
+def render_cached(*sections: str):
+    """Decorator: build once per arguments, and again only after one of sections
+    changed. Markups are immutable, so handing out the same one is safe."""
+    def wrap(build):
+        built: Dict[Tuple[Any, ...], Any] = {}
+        seen: List[Any] = [None]  # versions the entries in built were made from
+
+        @functools.wraps(build)
+        def cached(*args):
+            versions = tuple(_content_versions[s] for s in sections)
+            if seen[0] != versions:
+                built.clear()
+                seen[0] = versions
+            result = built.get(args)
+            if result is None:
+                result = built[args] = build(*args)
+            return result
+        return cached
+    return wrap
+
+
+# Model matching for purchase pricing. Each item's price table compiles into a trie
+# over the words of its model names, plus MODEL_ALIASES (series names that imply a
+# brand) for models named after a brand. The user's text is walked through the trie
+# from every word, so matching costs O(len(text)). When no phrase matches, the
+# words are looked up in a table of the model words with letters deleted, which
+# catches typos. A compiled table is dropped whenever its item's prices are saved
+# or reloaded, and rebuilt on next use.
+MODEL_ALIASES = {
+    "hp": ("hewlett packard", "pavilion", "elitebook", "probook", "envy", "spectre", "omen", "victus"),
+    "dell": ("inspiron", "latitude", "vostro", "xps", "precision", "alienware"),
+    "lenovo": ("thinkpad", "ideapad", "thinkbook", "yoga", "legion"),
+    "acer": ("aspire", "nitro", "predator", "swift", "travelmate", "extensa"),
+    "asus": ("vivobook", "zenbook", "rog", "tuf", "expertbook"),
+    "apple": ("macbook", "mac"),
+    "toshiba": ("satellite", "tecra", "dynabook"),
+}
+MODEL_CHOICES = 6  # model buttons offered when the text is unclear
+MATCH_EXACT, MATCH_ALIAS, MATCH_TYPO = 3, 2, 1
+_MODEL_WORD_RE = re.compile(r"[a-z]+|\d+")
+
+
+def _model_words(text: str) -> List[str]:
+    """Lower-case words, split where letters meet digits: "HP15s" -> hp, 15, s"""
+    return _MODEL_WORD_RE.findall(text.lower())
+
+
+def _deletions(word: str, depth: int) -> set:
+    found, layer = {word}, {word}
+    for _ in range(depth):
+        layer = {w[:i] + w[i + 1:] for w in layer for i in range(len(w))}
+        found |= layer
+    return found
+
+
+def _typo_distance(a: str, b: str) -> int:
+    """Edit distance counting an adjacent swap as one edit"""
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _typos_allowed(word: str) -> int:
+    return 0 if len(word) < 4 else 1 if len(word) < 7 else 2
+
+
+class ModelMatcher:
+    """Ranks the models of one price table by how well free text names them"""
+
+    def __init__(self, models):
+        self.trie: Dict[Any, Any] = {}
+        self.depth = 0
+        self.typos: Dict[str, set] = {}  # model word with letters deleted -> model words
+        self.word_models: Dict[str, set] = {}  # model word -> (model, kind) it belongs to
+        for model in models:
+            self._add(_model_words(model), model, MATCH_EXACT)
+            for alias in MODEL_ALIASES.get(" ".join(_model_words(model)), ()):
+                self._add(_model_words(alias), model, MATCH_ALIAS)
+
+    def _add(self, words: List[str], model: str, kind: int):
+        if not words:
+            return
+        node = self.trie
+        for word in words:
+            node = node.setdefault(word, {})
+            if not word.isdigit():
+                self.word_models.setdefault(word, set()).add((model, kind))
+                for variant in _deletions(word, _typos_allowed(word)):
+                    self.typos.setdefault(variant, set()).add(word)
+        node.setdefault(None, []).append((model, kind))
+        self.depth = max(self.depth, len(words))
+
+    def match(self, text: str) -> List[Tuple[str, int]]:
+        """(model, kind) best first; kind is MATCH_EXACT, MATCH_ALIAS or MATCH_TYPO"""
+        words = _model_words(text)
+        hits = []
+        for i in range(len(words)):
+            node = self.trie
+            for j in range(i, min(len(words), i + self.depth)):
+                node = node.get(words[j])
+                if node is None:
+                    break
+                hits.extend((i, j, model, kind) for model, kind in node.get(None, ()))
+        # "HP" inside "HP EliteBook 840" names the longer model, not a second one.
+        # ends[i]: last word covered by a hit starting at i; covered[i]: by one before i
+        ends = [-1] * len(words)
+        for i, j, _, _ in hits:
+            ends[i] = max(ends[i], j)
+        covered = list(itertools.accumulate([-1] + ends[:-1], max))
+        best: Dict[str, Tuple[int, int, int]] = {}
+        for i, j, model, kind in hits:
+            if covered[i] >= j or ends[i] > j:
+                continue
+            # Stronger kind, then longer phrase, then earlier in the text
+            best[model] = max(best.get(model, (0, 0, 0)), (kind, j - i + 1, -i))
+        if not best:
+            for i, word in enumerate(words):
+                if word.isdigit() or len(word) < 4:
+                    continue
+                keys = set()
+                for variant in _deletions(word, _typos_allowed(word)):
+                    keys |= self.typos.get(variant, set())
+                for key in keys:
+                    distance = _typo_distance(word, key)
+                    if distance <= _typos_allowed(key):
+                        for model, _ in self.word_models[key]:
+                            best[model] = max(best.get(model, (0, 0, 0)), (MATCH_TYPO, -distance, -i))
+        ranked = sorted(best.items(), key=lambda entry: entry[1], reverse=True)
+        return [(model, score[0]) for model, score in ranked]
+
+
+_model_matchers: Dict[str, ModelMatcher] = {}
+
+
+def model_matcher(item: str) -> ModelMatcher:
+    matcher = _model_matchers.get(item)
+    if matcher is None:
+        matcher = _model_matchers[item] = ModelMatcher(ITEM_PRICES.get(item, {}))
+    return matcher
+
+
+def model_choices_kb(item: str, models: List[str]) -> InlineKeyboardMarkup:
+    prices = ITEM_PRICES.get(item, {})
+    kb = [[InlineKeyboardButton(f"{model} — {fmt_money(prices[model])}", callback_data=f"pmodel_{i}")]
+          for i, model in enumerate(models)]
+    kb.append([InlineKeyboardButton("❓ Not listed", callback_data="pmodel_none")])
+    return InlineKeyboardMarkup(kb)
+
+
 # Purchase flow with dynamic pricing
-async def handle_purchase(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@render_cached("item_prices")
+def _purchase_menu_kb() -> InlineKeyboardMarkup:
     kb = []
     
     # Create buttons dynamically from ITEM_PRICES
@@ -569,14 +3124,14 @@ async def handle_purchase(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     kb.append([InlineKeyboardButton("❓ Other Item", callback_data="purchase_other")])  # ADD THIS LINE
     kb.append([InlineKeyboardButton("🏠 Back to Main Menu", callback_data="main_menu")])
-    
-    await update.message.reply_text("🛒 *Purchase Components*\n\nPick a category:", parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
+    return InlineKeyboardMarkup(kb)
 
+async def handle_purchase(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text("🛒 *Purchase Components*\n\nPick a category:", parse_mode=ParseMode.MARKDOWN, reply_markup=_purchase_menu_kb())
 
-async def handle_purchase_item(query, item: str):
-    uid = query.from_user.id
-    user_states[uid] = {"action": "purchase", "item": item, "step": "model"}
-    
+
+@render_cached("item_prices")
+def _item_price_text(item: str) -> str:
     # Show prices for different models
     if item in ITEM_PRICES:
         price_text = f"💰 *{item.replace('_', ' ').title()} Prices*\n\n"
@@ -585,18 +3140,23 @@ async def handle_purchase_item(query, item: str):
         price_text += "\n📱 Which model do you want?"
     else:
         price_text = f"💰 *{item.replace('_', ' ').title()}*\n\n📱 Which model do you want?"
+    return price_text
 
-    await query.edit_message_text(price_text, parse_mode=ParseMode.MARKDOWN, reply_markup=back_menu())
+async def handle_purchase_item(query, item: str):
+    uid = query.from_user.id
+    user_states[uid] = {"action": "purchase", "item": item, "step": "model"}
+    await query.edit_message_text(_item_price_text(item), parse_mode=ParseMode.MARKDOWN, reply_markup=back_menu())
 
 async def handle_purchase_input(update: Update, context: ContextTypes.DEFAULT_TYPE, state: Dict[str, Any]):
     uid = update.effective_user.id
     text = (update.message.text or "").strip()
     
     if "order_id" not in state:
-        oid = f"ORD{_rand4()}"
+        oid = await asyncio.to_thread(new_request_id, "orders")
         orders[oid] = Order(uid, update.effective_user.username, update.effective_user.first_name, state["item"])
         state["order_id"] = oid
-        save_all()
+        save_record("orders", oid)
+        save_record("user_states", uid)
 
     o = orders[state["order_id"]]
     step = state.get("step", "model")
@@ -607,27 +3167,41 @@ async def handle_purchase_input(update: Update, context: ContextTypes.DEFAULT_TY
         o.details["unit_price"] = 0  # Price will be determined by admin
         state["step"] = "quantity"
         await update.message.reply_text("📦 How many units you need? (number)")
-        save_all()
+        save_record("orders", state["order_id"])
+        save_record("user_states", uid)
         return
 
-    if step == "model":
+    if step in ("model", "model_pick"):
         o.details["model"] = text
         # Try to find price for the model
         item_key = state["item"]
-        if item_key in ITEM_PRICES:
-            price = None
-            for model_key in ITEM_PRICES[item_key]:
-                if model_key.lower() in text.lower():
-                    price = ITEM_PRICES[item_key][model_key]
-                    o.details["unit_price"] = price
-                    break
-            if not price:
-                # Use first available price as default
-                o.details["unit_price"] = next(iter(ITEM_PRICES[item_key].values()))
-        
+        prices = ITEM_PRICES.get(item_key)
+        if prices:
+            ranked = model_matcher(item_key).match(text)
+            # Sure only if the best model named in the text beats every other one
+            if ranked and ranked[0][1] >= MATCH_ALIAS and (len(ranked) == 1 or ranked[1][1] < ranked[0][1]):
+                model = ranked[0][0]
+                o.details["unit_price"] = prices[model]
+                note = f"✅ {model}: {fmt_money(prices[model])}\n\n"
+            else:
+                choices = [model for model, _ in ranked][:MODEL_CHOICES] or list(prices)[:MODEL_CHOICES]
+                state["step"] = "model_pick"
+                state["model_choices"] = choices
+                ask = "🤔 Which one do you mean?" if ranked else "🤔 I couldn't match that model."
+                await update.message.reply_text(
+                    f"{ask}\n\nPick it below, type the model again, or choose Not listed and we'll quote you a price.",
+                    reply_markup=model_choices_kb(item_key, choices),
+                )
+                save_record("orders", state["order_id"])
+                save_record("user_states", uid)
+                return
+        else:
+            note = ""
+
         state["step"] = "quantity"
-        await update.message.reply_text("📦 How many units you need? (number)")
-        save_all()
+        await update.message.reply_text(f"{note}📦 How many units you need? (number)")
+        save_record("orders", state["order_id"])
+        save_record("user_states", uid)
         return
 
     if step == "quantity":
@@ -640,7 +3214,8 @@ async def handle_purchase_input(update: Update, context: ContextTypes.DEFAULT_TY
         o.details["quantity"] = q
         state["step"] = "address"
         await update.message.reply_text("🏠 Drop your delivery address:")
-        save_all()
+        save_record("orders", state["order_id"])
+        save_record("user_states", uid)
         return
 
     if step == "address":
@@ -650,20 +3225,9 @@ async def handle_purchase_input(update: Update, context: ContextTypes.DEFAULT_TY
         qty = int(o.details.get("quantity", 1))
         total = unit * qty
         o.details["total"] = total
-        save_all()
-        
-        user_profile = user_data_store.get(uid, UserProfile())
+        save_record("orders", state["order_id"])
         
-        # BUILD CUSTOMER INFO WITH USERNAME PROMINENT
-        customer_info = f"👤 CUSTOMER INFO:\n"
-        customer_info += f"📱 Telegram: @{o.username}\n" if o.username else "📱 Telegram: No username\n"
-        customer_info += f"🆔 User ID: {uid}\n"
-        customer_info += f"📛 Name: {user_profile.name or o.name or 'N/A'}\n"
-        customer_info += f"📞 Phone: {user_profile.phone or 'N/A'}\n"
-        customer_info += f"📧 Email: {user_profile.email or 'N/A'}\n"
-        customer_info += f"🏢 Department: {user_profile.department or 'N/A'}\n"
-        customer_info += f"🚪 Hall: {user_profile.room or 'N/A'}\n"
-        customer_info += f"🔢 Room Number: {user_profile.room_number or 'N/A'}"
+        customer_info = customer_card(o)
         
         await notify_admin(context, 
             f"🛒 NEW ORDER\n\n"
@@ -673,7 +3237,7 @@ async def handle_purchase_input(update: Update, context: ContextTypes.DEFAULT_TY
             f"Quantity: {qty}\n"
             f"Total: {fmt_money(total)}\n"
             f"Address: {o.details['address']}\n"
-            f"⏰ Time: {o.timestamp}\n\n"
+            f"⏰ Time: {fmt_ts(o.timestamp)}\n\n"
             f"{customer_info}"
         )
 
@@ -696,6 +3260,7 @@ async def handle_purchase_input(update: Update, context: ContextTypes.DEFAULT_TY
 
         bump_user_req(uid, state["order_id"])
         user_states.pop(uid, None)
+        save_record("user_states", uid)
 
 # Other handlers (simplified)
 async def handle_request_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -711,14 +3276,14 @@ async def handle_callback_input(update: Update, context: ContextTypes.DEFAULT_TY
         await update.message.reply_text("📵 Drop a valid phone number (e.g. 080XXXXXXXX).")
         return
 
-    cbid = f"CB{_rand4()}"
+    cbid = await asyncio.to_thread(new_request_id, "callbacks")
     callbacks[cbid] = CallbackReq(
         uid, 
         update.effective_user.username, 
         update.effective_user.first_name, 
         text
     )
-    save_all()
+    save_record("callbacks", cbid)
 
     await update.message.reply_text(
         f"📞 *Callback Request Submitted*\n\n"
@@ -729,17 +3294,7 @@ async def handle_callback_input(update: Update, context: ContextTypes.DEFAULT_TY
         reply_markup=MAIN_KB
     )
     
-    # BUILD CUSTOMER INFO WITH USERNAME PROMINENT
-    user_profile = user_data_store.get(uid, UserProfile())
-    customer_info = f"👤 CUSTOMER INFO:\n"
-    customer_info += f"📱 Telegram: @{callbacks[cbid].username}\n" if callbacks[cbid].username else "📱 Telegram: No username\n"
-    customer_info += f"🆔 User ID: {uid}\n"
-    customer_info += f"📛 Name: {user_profile.name or callbacks[cbid].name or 'N/A'}\n"
-    customer_info += f"📞 Phone: {user_profile.phone or 'N/A'}\n"
-    customer_info += f"📧 Email: {user_profile.email or 'N/A'}\n"
-    customer_info += f"🏢 Department: {user_profile.department or 'N/A'}\n"
-    customer_info += f"🚪 Hall: {user_profile.room or 'N/A'}\n"
-    customer_info += f"🔢 Room Number: {user_profile.room_number or 'N/A'}"
+    customer_info = customer_card(callbacks[cbid])
 
     await notify_admin(context, 
         f"🚨 CALLBACK REQUEST\n\n"
@@ -749,6 +3304,7 @@ async def handle_callback_input(update: Update, context: ContextTypes.DEFAULT_TY
     )
     
     user_states.pop(uid, None)
+    save_record("user_states", uid)
 
 # Simplified handlers for other features
 async def handle_report_issue(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -758,10 +3314,11 @@ async def handle_report_issue(update: Update, context: ContextTypes.DEFAULT_TYPE
 async def handle_issue_input(update: Update, context: ContextTypes.DEFAULT_TYPE, state: Dict[str, Any]):
     uid = update.effective_user.id
     if "issue_id" not in state:
-        iid = f"ISS{_rand4()}"
+        iid = await asyncio.to_thread(new_request_id, "issues")
         issues[iid] = Issue(uid, update.effective_user.username, update.effective_user.first_name, state.get("issue_type", "hardware"))
         state["issue_id"] = iid
-        save_all()
+        save_record("issues", iid)
+        save_record("user_states", uid)
 
     issue = issues[state["issue_id"]]
     step = state.get("step", "")
@@ -772,12 +3329,13 @@ async def handle_issue_input(update: Update, context: ContextTypes.DEFAULT_TYPE,
             issue.details["model"] = text
             state["step"] = "description"
             await update.message.reply_text("📝 Describe the issue in detail. You can also send up to 3 photos.")
-            save_all()
+            save_record("issues", state["issue_id"])
+            save_record("user_states", uid)
             return
         elif step == "description":
             issue.details["description"] = text
             issue.status = "under_review"
-            save_all()
+            save_record("issues", state["issue_id"])
             
             await update.message.reply_text(
                 f"🛠 *Issue Report Submitted*\n\n"
@@ -790,17 +3348,7 @@ async def handle_issue_input(update: Update, context: ContextTypes.DEFAULT_TYPE,
                 reply_markup=MAIN_KB
             )
             
-            # BUILD CUSTOMER INFO WITH USERNAME PROMINENT
-            user_profile = user_data_store.get(uid, UserProfile())
-            customer_info = f"👤 CUSTOMER INFO:\n"
-            customer_info += f"📱 Telegram: @{issue.username}\n" if issue.username else "📱 Telegram: No username\n"
-            customer_info += f"🆔 User ID: {uid}\n"
-            customer_info += f"📛 Name: {user_profile.name or issue.name or 'N/A'}\n"
-            customer_info += f"📞 Phone: {user_profile.phone or 'N/A'}\n"
-            customer_info += f"📧 Email: {user_profile.email or 'N/A'}\n"
-            customer_info += f"🏢 Department: {user_profile.department or 'N/A'}\n"
-            customer_info += f"🚪 Hall: {user_profile.room or 'N/A'}\n"
-            customer_info += f"🔢 Room Number: {user_profile.room_number or 'N/A'}"
+            customer_info = customer_card(issue)
             
             await notify_admin(context, 
                 f"🔧 NEW ISSUE REPORT\n\n"
@@ -822,6 +3370,7 @@ async def handle_issue_input(update: Update, context: ContextTypes.DEFAULT_TYPE,
                         logger.warning(f"Failed to send photos to admin {admin_id}: {e}")
             
             user_states.pop(uid, None)
+            save_record("user_states", uid)
             return
 
     if update.message and update.message.photo and step == "description":
@@ -830,39 +3379,41 @@ async def handle_issue_input(update: Update, context: ContextTypes.DEFAULT_TYPE,
         if len(phlist) < 3:
             phlist.append(photo.file_id)
             issue.details["photos"] = phlist
-            save_all()
+            save_record("issues", state["issue_id"])
             await update.message.reply_text(f"🖼 Photo saved ({len(phlist)}/3). Send more or type more details.")
 
 async def handle_track_request(update: Update, context: ContextTypes.DEFAULT_TYPE):
     uid = update.effective_user.id
     user_states[uid] = {"action": "track_request"}
-    await update.message.reply_text("🚚 *Track Your Request*\n\nEnter your Request ID.\n\n📝 Examples:\n• Orders: ORD1234\n• Issues: ISS5678\n• Callbacks: CB9012\n• Inquiries: INQ3456\n\n📧 For support issues, contact us at: oblaktech25@gmail.com", parse_mode=ParseMode.MARKDOWN)
+    await update.message.reply_text("🚚 *Track Your Request*\n\nEnter your Request ID.\n\n📝 Examples:\n• Orders: ORD0QC4M2X\n• Issues: ISS0QC4M7H\n• Callbacks: CB0QC4N1A\n• Inquiries: INQ0QC4N3K\n\n📧 For support issues, contact us at: oblaktech25@gmail.com", parse_mode=ParseMode.MARKDOWN)
 
 async def handle_track_input(update: Update, context: ContextTypes.DEFAULT_TYPE, state: Dict[str, Any]):
     uid = update.effective_user.id
-    req = (update.message.text or "").strip().upper()
-
-    stores = {"ORD": orders, "ISS": issues, "CB": callbacks, "INQ": inquiries}
-    for prefix, store in stores.items():
-        if req.startswith(prefix) and req in store:
-            item = store[req]
-            if prefix == "ORD":
-                msg = f"🚚 *Order Status*\n\n📋 ID: `{req}`\n🛒 Item: {item.item.replace('_',' ').title()}\n📱 Model: {item.details.get('model','N/A')}\n⏳ Status: {item.status.replace('_',' ').title()}"
-            elif prefix == "ISS":
-                msg = f"🛠 *Issue Status*\n\n📋 ID: `{req}`\n📧 Type: {item.type.title()}\n⏳ Status: {item.status.replace('_',' ').title()}"
-            elif prefix == "CB":
-                msg = f"📞 *Callback Status*\n\n📋 ID: `{req}`\n⏳ Status: {item.status.replace('_',' ').title()}"
-            elif prefix == "INQ":
-                msg = f"❓ *Inquiry Status*\n\n📋 ID: `{req}`\n📝 Type: {item.inquiry_type.title()}\n⏳ Status: {item.status.replace('_',' ').title()}"
-            await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN, reply_markup=MAIN_KB)
-            user_states.pop(uid, None)
-            return
+    text = update.message.text or ""
+    req = parse_request_id(text) or text.strip().upper()
+
+    found = await locate_request(req)
+    if found:
+        category, item = found
+        prefix = CATEGORY_PREFIXES[category]
+        if prefix == "ORD":
+            msg = f"🚚 *Order Status*\n\n📋 ID: `{req}`\n🛒 Item: {item.item.replace('_',' ').title()}\n📱 Model: {item.details.get('model','N/A')}\n⏳ Status: {item.status.replace('_',' ').title()}"
+        elif prefix == "ISS":
+            msg = f"🛠 *Issue Status*\n\n📋 ID: `{req}`\n📧 Type: {item.type.title()}\n⏳ Status: {item.status.replace('_',' ').title()}"
+        elif prefix == "CB":
+            msg = f"📞 *Callback Status*\n\n📋 ID: `{req}`\n⏳ Status: {item.status.replace('_',' ').title()}"
+        elif prefix == "INQ":
+            msg = f"❓ *Inquiry Status*\n\n📋 ID: `{req}`\n📝 Type: {item.inquiry_type.title()}\n⏳ Status: {item.status.replace('_',' ').title()}"
+        await update.message.reply_text(msg, parse_mode=ParseMode.MARKDOWN, reply_markup=MAIN_KB)
+        user_states.pop(uid, None)
+        return
 
     await update.message.reply_text(f"❌ *Request ID `{req}` not found.*\n\nCheck and try again.", parse_mode=ParseMode.MARKDOWN, reply_markup=MAIN_KB)
     user_states.pop(uid, None)
 
 # Simplified other handlers
-async def handle_inquiry(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@render_cached("inquiry_responses")
+def _inquiry_menu_kb() -> InlineKeyboardMarkup:
     kb = []
     
     # Add saved responses as buttons
@@ -879,14 +3430,16 @@ async def handle_inquiry(update: Update, context: ContextTypes.DEFAULT_TYPE):
         [InlineKeyboardButton("❓ Other", callback_data="inquiry_other")],
         [InlineKeyboardButton("🏠 Back to Main Menu", callback_data="main_menu")]
     ])
-    
-    await update.message.reply_text("❓ *Technical Inquiry*\n\nWhat's going on with your laptop?", parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
+    return InlineKeyboardMarkup(kb)
+
+async def handle_inquiry(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text("❓ *Technical Inquiry*\n\nWhat's going on with your laptop?", parse_mode=ParseMode.MARKDOWN, reply_markup=_inquiry_menu_kb())
 
 
 async def handle_inquiry_other_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     uid = update.effective_user.id
     text = (update.message.text or "").strip()
-    inquiry_id = f"INQ{_rand4()}"
+    inquiry_id = await asyncio.to_thread(new_request_id, "inquiries")
     inquiries[inquiry_id] = Inquiry(
         uid, 
         update.effective_user.username, 
@@ -894,7 +3447,7 @@ async def handle_inquiry_other_input(update: Update, context: ContextTypes.DEFAU
         "other", 
         text
     )
-    save_all()
+    save_record("inquiries", inquiry_id)
     
     await update.message.reply_text(
         f"✅ *Inquiry Submitted*\n\n"
@@ -905,17 +3458,7 @@ async def handle_inquiry_other_input(update: Update, context: ContextTypes.DEFAU
         reply_markup=MAIN_KB
     )
     
-    # BUILD CUSTOMER INFO WITH USERNAME PROMINENT
-    user_profile = user_data_store.get(uid, UserProfile())
-    customer_info = f"👤 CUSTOMER INFO:\n"
-    customer_info += f"📱 Telegram: @{inquiries[inquiry_id].username}\n" if inquiries[inquiry_id].username else "📱 Telegram: No username\n"
-    customer_info += f"🆔 User ID: {uid}\n"
-    customer_info += f"📛 Name: {user_profile.name or inquiries[inquiry_id].name or 'N/A'}\n"
-    customer_info += f"📞 Phone: {user_profile.phone or 'N/A'}\n"
-    customer_info += f"📧 Email: {user_profile.email or 'N/A'}\n"
-    customer_info += f"🏢 Department: {user_profile.department or 'N/A'}\n"
-    customer_info += f"🚪 Hall: {user_profile.room or 'N/A'}\n"
-    customer_info += f"🔢 Room Number: {user_profile.room_number or 'N/A'}"
+    customer_info = customer_card(inquiries[inquiry_id])
     
     await notify_admin(context, 
         f"📝 NEW INQUIRY\n\n"
@@ -926,6 +3469,7 @@ async def handle_inquiry_other_input(update: Update, context: ContextTypes.DEFAU
     
     bump_user_req(uid, inquiry_id)
     user_states.pop(uid, None)
+    save_record("user_states", uid)
 
 
 # Profile management (simplified)
@@ -940,6 +3484,35 @@ async def handle_my_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
         kb = [[InlineKeyboardButton("✏️ Update Profile", callback_data="setup_profile")], [InlineKeyboardButton("🏠 Back to Main Menu", callback_data="main_menu")]]
     await update.message.reply_text(txt, parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
 
+MY_REQUESTS_LIMIT = 15
+REQUEST_ICONS = {"orders": "💳", "issues": "🛠", "callbacks": "📞", "inquiries": "❓"}
+
+async def handle_my_requests(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    uid = update.effective_user.id
+    # Purchases still being filled in are not requests yet
+    listed = itertools.islice(
+        ((section, rid) for section, rid in user_requests.recent(uid)
+         if globals()[KEYED_SECTIONS[section]][rid].status != "collecting_info"),
+        MY_REQUESTS_LIMIT,
+    )
+    lines = []
+    for section, rid in listed:
+        item = globals()[KEYED_SECTIONS[section]][rid]
+        if section == "orders":
+            what = item.item.replace('_', ' ').title()
+        elif section == "issues":
+            what = item.type.title()
+        elif section == "inquiries":
+            what = item.inquiry_type.replace('_', ' ').title()
+        else:
+            what = "Callback"
+        lines.append(f"{REQUEST_ICONS[section]} `{rid}` · {what}\n      ⏳ {item.status.replace('_', ' ').title()} · {fmt_ts(item.timestamp)}")
+    if not lines:
+        txt = "📋 *My Requests*\n\nYou have no requests yet. Tap a button below to get started."
+    else:
+        txt = "📋 *My Requests*\n\n" + "\n".join(lines) + "\n\nSend an ID to see its details. Older closed requests can still be tracked by ID."
+    await update.message.reply_text(txt, parse_mode=ParseMode.MARKDOWN, reply_markup=MAIN_KB)
+
 async def handle_update_profile_input(update: Update, context: ContextTypes.DEFAULT_TYPE, state: Dict[str, Any]):
     uid = update.effective_user.id
     text = (update.message.text or "").strip()
@@ -949,7 +3522,8 @@ async def handle_update_profile_input(update: Update, context: ContextTypes.DEFA
     if step == "name":
         if text.lower() != "skip": profile.name = text
         state["step"] = "phone"
-        save_all()
+        save_record("user_data", uid)
+        save_record("user_states", uid)
         await update.message.reply_text("📱 Enter your phone number (or type `skip`):")
     elif step == "phone":
         if text.lower() != "skip":
@@ -958,7 +3532,8 @@ async def handle_update_profile_input(update: Update, context: ContextTypes.DEFA
                 return
             profile.phone = text
         state["step"] = "email"
-        save_all()
+        save_record("user_data", uid)
+        save_record("user_states", uid)
         await update.message.reply_text("📧 Enter your email (or type `skip`):")
     elif step == "email":
         if text.lower() != "skip":
@@ -967,22 +3542,26 @@ async def handle_update_profile_input(update: Update, context: ContextTypes.DEFA
                 return
             profile.email = text
         state["step"] = "department"
-        save_all()
+        save_record("user_data", uid)
+        save_record("user_states", uid)
         await update.message.reply_text("🏢 Enter your department (or type `skip`):")
     elif step == "department":
         if text.lower() != "skip": profile.department = text
         state["step"] = "room"
-        save_all()
+        save_record("user_data", uid)
+        save_record("user_states", uid)
         await update.message.reply_text("🚪 Enter your Hall (or type `skip`):")
     elif step == "room":
         if text.lower() != "skip": profile.room = text
         state["step"] = "room_number"
-        save_all()
+        save_record("user_data", uid)
+        save_record("user_states", uid)
         await update.message.reply_text("🔢 Enter your room number (or type `skip`):")
     elif step == "room_number":
         if text.lower() != "skip": profile.room_number = text
         user_states.pop(uid, None)
-        save_all()
+        save_record("user_data", uid)
+        save_record("user_states", uid)
         await update.message.reply_text(f"✅ *Profile Updated!*\n\n📛 Name: {profile.name or 'Not set'}\n📱 Phone: {profile.phone or 'Not set'}\n📧 Email: {profile.email or 'Not set'}\n🏢 Department: {profile.department or 'Not set'}\n🚪 Room: {profile.room or 'Not set'}\n🔢 Room Number: {profile.room_number or 'Not set'}", parse_mode=ParseMode.MARKDOWN, reply_markup=MAIN_KB)
 
 async def handle_settings(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -994,10 +3573,10 @@ async def handle_settings(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # Simplified remaining handlers
 
-async def handle_price_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@render_cached("item_prices")
+def _price_list_text() -> str:
     if not ITEM_PRICES:
-        await update.message.reply_text("💰 *No prices available*\n\nContact admin to set prices.", parse_mode=ParseMode.MARKDOWN)
-        return
+        return "💰 *No prices available*\n\nContact admin to set prices."
     
     txt = "💰 *Current Prices*\n\n"
     
@@ -1033,9 +3612,13 @@ async def handle_price_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
         txt += "\n"
     
     txt += "⚠️ *Note:* PRICES MAY VARY DUE TO COMPLEXITY, THIS IS JUST AN OVERVIEW.\n"
-    await update.message.reply_text(txt, parse_mode=ParseMode.MARKDOWN)
+    return txt
 
-async def handle_tips_guides(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def handle_price_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text(_price_list_text(), parse_mode=ParseMode.MARKDOWN)
+
+@render_cached("tips_guides")
+def _tips_menu_kb() -> InlineKeyboardMarkup:
     kb = []
     
     # Add custom tips first
@@ -1050,32 +3633,42 @@ async def handle_tips_guides(update: Update, context: ContextTypes.DEFAULT_TYPE)
         [InlineKeyboardButton("🧽 Clean your laptop", callback_data="tip_cleaning")],
         [InlineKeyboardButton("🏠 Back to Main Menu", callback_data="main_menu")]
     ])
-    
-    await update.message.reply_text("📘 *Tips & Maintenance Guides*\n\nPick a topic:", parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
+    return InlineKeyboardMarkup(kb)
 
+async def handle_tips_guides(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text("📘 *Tips & Maintenance Guides*\n\nPick a topic:", parse_mode=ParseMode.MARKDOWN, reply_markup=_tips_menu_kb())
 
-async def handle_find_technician(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+@render_cached("technicians")
+def _technicians_text() -> str:
     text = "🧑‍🔧 *Available Technicians*\n\n"
     for i, t in enumerate(TECHNICIANS, 1):
         text += f"*{i}. {t['name']}*\n📞 {t['contact']} | ⭐ {t['rating']} | 💰 {t['fee']}\n📍 {t['area']}\n\n"
     text += "💡 Book directly or use *Request Callback*."
-    kb = [[InlineKeyboardButton("📞 Request Callback", callback_data="callback")], [InlineKeyboardButton("🏠 Back to Main Menu", callback_data="main_menu")]]
-    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
+    return text
+
+TECHNICIANS_KB = InlineKeyboardMarkup([[InlineKeyboardButton("📞 Request Callback", callback_data="callback")], [InlineKeyboardButton("🏠 Back to Main Menu", callback_data="main_menu")]])
+
+async def handle_find_technician(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text(_technicians_text(), parse_mode=ParseMode.MARKDOWN, reply_markup=TECHNICIANS_KB)
 
 # Admin price management
-async def manage_prices(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    if not is_owner(update):
-        await update.message.reply_text("❌ Access denied.")
-        return
-    
+@render_cached("item_prices")
+def _manage_prices_kb() -> InlineKeyboardMarkup:
     kb = []
     for item in ITEM_PRICES.keys():
         kb.append([InlineKeyboardButton(f"💰 {item.replace('_', ' ').title()}", callback_data=f"price_item_{item}")])
     kb.append([InlineKeyboardButton("➕ Add New Item", callback_data="add_new_item")])
     kb.append([InlineKeyboardButton("🗑️ Remove Item", callback_data="remove_item")])  # ADD THIS LINE
     kb.append([InlineKeyboardButton("🏠 Back", callback_data="main_menu")])
+    return InlineKeyboardMarkup(kb)
+
+async def manage_prices(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not is_owner(update):
+        await update.message.reply_text("❌ Access denied.")
+        return
     
-    await update.message.reply_text("💰 *Price Management*\n\nSelect item to update prices:", parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
+    await update.message.reply_text("💰 *Price Management*\n\nSelect item to update prices:", parse_mode=ParseMode.MARKDOWN, reply_markup=_manage_prices_kb())
 
 async def handle_admin_price_input(update: Update, context: ContextTypes.DEFAULT_TYPE, state: Dict[str, Any]):
     uid = update.effective_user.id
@@ -1086,12 +3679,13 @@ async def handle_admin_price_input(update: Update, context: ContextTypes.DEFAULT
         state["new_item"] = text.lower().replace(" ", "_")
         state["step"] = "new_models"
         ITEM_PRICES[state["new_item"]] = {}
+        save_record("item_prices", state["new_item"])
         await update.message.reply_text("💡 Now enter model prices in format:\nModel:Price\n\nExample:\nHP:12000\nDell:13000\n\nType 'done' when finished.")
         return
 
     elif state.get("step") == "new_models":
         if text.lower() == "done":
-            save_all()
+            save_record("item_prices", state["new_item"])
             await update.message.reply_text(f"✅ New item '{state['new_item']}' added successfully!", reply_markup=MAIN_KB)
             user_states.pop(uid, None)
             return
@@ -1099,7 +3693,7 @@ async def handle_admin_price_input(update: Update, context: ContextTypes.DEFAULT
         try:
             model, price = text.split(":")
             ITEM_PRICES[state["new_item"]][model.strip()] = int(price.strip())
-            save_all()
+            save_record("item_prices", state["new_item"])
             await update.message.reply_text(f"✅ Added {model.strip()}: ₦{int(price.strip()):,}\n\nAdd more or type 'done':")
         except ValueError:
             await update.message.reply_text("❌ Invalid format. Use Model:Price (e.g. HP:12000)")
@@ -1109,7 +3703,7 @@ async def handle_admin_price_input(update: Update, context: ContextTypes.DEFAULT
         # Updating existing item prices
         item = state["item"]
         if text.lower() == "done":
-            save_all()
+            save_record("item_prices", item)
             await update.message.reply_text(f"✅ Prices updated for {item}!", reply_markup=MAIN_KB)
             user_states.pop(uid, None)
             return
@@ -1119,7 +3713,7 @@ async def handle_admin_price_input(update: Update, context: ContextTypes.DEFAULT
             model_to_delete = text.replace(":", "").strip()
             if model_to_delete in ITEM_PRICES[item]:
                 del ITEM_PRICES[item][model_to_delete]
-                save_all()
+                save_record("item_prices", item)
                 await update.message.reply_text(f"🗑️ Deleted {model_to_delete} from {item}\n\nUpdate more, delete more (Model:), or type 'done':")
             else:
                 await update.message.reply_text(f"❌ {model_to_delete} not found in {item}")
@@ -1129,7 +3723,7 @@ async def handle_admin_price_input(update: Update, context: ContextTypes.DEFAULT
             model, price = text.split(":")
             if price.strip():  # Only update if price is provided
                 ITEM_PRICES[item][model.strip()] = int(price.strip())
-                save_all()
+                save_record("item_prices", item)
                 await update.message.reply_text(f"✅ Updated {model.strip()}: ₦{int(price.strip()):,}\n\nUpdate more, delete (Model:), or type 'done':")
             else:
                 await update.message.reply_text("❌ Empty price. To delete, use format: Model:")
@@ -1146,15 +3740,15 @@ async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # Check if user has any pending orders
-    user_orders = [oid for oid, order in orders.items() if order.user_id == uid and order.status in ["pending_confirmation", "confirmed"]]
+    user_orders = find_requests("orders", user_id=uid, statuses=["pending_confirmation", "confirmed"])
     
     if user_orders:
         # This is likely a payment receipt
-        latest_order = max(user_orders)  # Get the most recent order
+        latest_order = user_orders[0]  # newest first
         
         # Update order status
         orders[latest_order].status = "payment_submitted"
-        save_all()
+        save_record("orders", latest_order)
         
         await update.message.reply_text(
             f"📸 *Payment Receipt Received!*\n\n"
@@ -1166,29 +3760,20 @@ async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE):
             reply_markup=MAIN_KB
         )
         
-        # Notify all admins with the receipt
+        # Notify all admins with the receipt; the caption is the same for each
+        order = orders[latest_order]
+        caption = (
+            f"💳 PAYMENT RECEIPT\n\n"
+            f"📋 Order: {latest_order}\n"
+            f"👤 Customer: {customer_line(order)}\n"
+            f"🛒 Item: {order.item.replace('_', ' ').title()}\n"
+            f"💰 Amount: {fmt_money(order.details.get('total', 0))}\n"
+            f"📱 Model: {order.details.get('model', 'N/A')}\n\n"
+            f"📄 Status: Payment Submitted\n"
+            f"⏰ Use /manage to update order status"
+        )
         for admin_id in ADMIN_IDS:
             try:
-                order = orders[latest_order]
-                user_profile = user_data_store.get(order.user_id, UserProfile())
-                user_info = f"{order.name}"
-                if order.username:
-                    user_info += f" | @{order.username}"
-                elif user_profile.phone:
-                    user_info += f" | {user_profile.phone}"
-                else:
-                    user_info += " | No contact info"
-
-                caption = (
-                    f"💳 PAYMENT RECEIPT\n\n"
-                    f"📋 Order: {latest_order}\n"
-                    f"👤 Customer: {user_info}\n"
-                    f"🛒 Item: {order.item.replace('_', ' ').title()}\n"
-                    f"💰 Amount: {fmt_money(order.details.get('total', 0))}\n"
-                    f"📱 Model: {order.details.get('model', 'N/A')}\n\n"
-                    f"📄 Status: Payment Submitted\n"
-                    f"⏰ Use /manage to update order status"
-                )
                 await context.bot.send_photo(
                     chat_id=admin_id,
                     photo=update.message.photo[-1].file_id,
@@ -1225,6 +3810,29 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.answer("Item not found!", show_alert=True)
         return
     
+    if data.startswith("pmodel_"):
+        state = user_states.get(uid, {})
+        if state.get("action") != "purchase" or state.get("step") != "model_pick" or state.get("order_id") not in orders:
+            await query.edit_message_text("⌛ This choice has expired. Start again from 💳 Purchase.")
+            return
+        o = orders[state["order_id"]]
+        choice = data.replace("pmodel_", "")
+        prices = ITEM_PRICES.get(state["item"], {})
+        model = state["model_choices"][int(choice)] if choice.isdigit() and int(choice) < len(state["model_choices"]) else None
+        if model in prices:
+            o.details["model"] = model
+            o.details["unit_price"] = prices[model]
+            picked = f"✅ {model}: {fmt_money(prices[model])}"
+        else:
+            o.details["unit_price"] = 0  # Price will be determined by admin
+            picked = "📝 Noted, we'll confirm the price for your model."
+        state["step"] = "quantity"
+        state.pop("model_choices", None)
+        save_record("orders", state["order_id"])
+        save_record("user_states", uid)
+        await query.edit_message_text(f"{picked}\n\n📦 How many units you need? (number)")
+        return
+
     if data == "purchase_other":
         user_states[uid] = {"action": "purchase", "item": "other", "step": "custom_item"}
         await query.edit_message_text("❓ *Custom Item Request*\n\n📝 What item are you looking for?\nExample: `Webcam`, `Mouse`, `Speaker`", parse_mode=ParseMode.MARKDOWN, reply_markup=back_menu())
@@ -1297,11 +3905,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text("📭 No custom tips saved yet.", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back", callback_data="main_menu")]]))
             return
         
-        text = "📋 *Saved Tips:*\n\n"
-        for title, content in tips_guides.items():
-            text += f"**{title}:**\n{content[:100]}{'...' if len(content) > 100 else ''}\n\n"
-        
-        await query.edit_message_text(text, parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back", callback_data="main_menu")]]))
+        await show_page(update, "tips")
         return
 
     if data == "edit_tip_guide":
@@ -1353,7 +3957,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         title = data.replace("delete_tip_", "")
         if title in tips_guides:
             del tips_guides[title]
-            save_all()
+            save_record("tips_guides", title)
             await query.edit_message_text(f"✅ Deleted tip: {title}", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back", callback_data="main_menu")]]))
         return
 
@@ -1371,12 +3975,20 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if data == "toggle_notifications":
         p = user_data_store.setdefault(uid, UserProfile())
         p.notifications_enabled = not p.notifications_enabled
-        save_all()
+        save_record("user_data", uid)
         status = "enabled" if p.notifications_enabled else "disabled"
         await query.edit_message_text(f"📢 Notifications {status}!", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]]))
         return
 
 
+    if data.startswith("pg_"):
+        if not is_owner(update):
+            await query.answer("Access denied", show_alert=True)
+            return
+        _, view, direction, i, j = data.split("_")
+        await show_page(update, view, int(i), int(j), direction == "f")
+        return
+
     if data == "admin_manage":
         if not is_owner(update):  # Keep this check but use is_owner (which now checks ADMIN_IDS)
             await query.answer("Access denied", show_alert=True)
@@ -1391,6 +4003,28 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         request_type = data.replace("admin_", "")
         await show_admin_requests(query, request_type)
         return
+
+    if data.startswith("admp_"):
+        if not is_owner(update):
+            await query.answer("Access denied", show_alert=True)
+            return
+        # admp_<type>_<mode>[_<o|n>_<timestamp>_<id>]
+        parts = data.split("_", 5)
+        cursor, older = None, True
+        if len(parts) == 6:
+            cursor, older = (int(parts[4]), parts[5]), parts[3] == "o"
+        await show_admin_requests(query, parts[1], parts[2], cursor, older)
+        return
+
+    if data.startswith("mo_"):
+        if not is_owner(update):
+            await query.answer("Access denied", show_alert=True)
+            return
+        # mo_<o|n>_<timestamp>_<id>
+        _, direction, ts, rid = data.split("_", 3)
+        text, markup = _orders_list_page((int(ts), rid), older=direction == "o")
+        await query.edit_message_text(text, parse_mode=ParseMode.MARKDOWN, reply_markup=markup)
+        return
     
     if data == "add_technician":
         if not is_owner(update):
@@ -1495,7 +4129,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             tech = TECHNICIANS[tech_index]
             p = user_data_store.setdefault(uid, UserProfile())
             p.preferred_tech = tech['name']
-            save_all()
+            save_record("user_data", uid)
             await query.edit_message_text(f"✅ Preferred Technician: {tech['name']}", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]]))
         return
 
@@ -1546,11 +4180,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text("📭 No responses saved yet.", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back", callback_data="main_menu")]]))
             return
         
-        text = "📋 *Saved Responses:*\n\n"
-        for title, content in inquiry_responses.items():
-            text += f"**{title}:**\n{content[:100]}{'...' if len(content) > 100 else ''}\n\n"
-        
-        await query.edit_message_text(text, parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back", callback_data="main_menu")]]))
+        await show_page(update, "resp")
         return
 
 
@@ -1593,7 +4223,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         item = data.replace("delete_item_", "")
         if item in ITEM_PRICES:
             del ITEM_PRICES[item]
-            save_all()
+            save_record("item_prices", item)
             await query.edit_message_text(f"✅ Deleted item: {item.replace('_', ' ').title()}", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back", callback_data="main_menu")]]))
         return
 
@@ -1631,7 +4261,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         title = data.replace("delete_response_", "")
         if title in inquiry_responses:
             del inquiry_responses[title]
-            save_all()
+            save_record("inquiry_responses", title)
             await query.edit_message_text(f"✅ Deleted response: {title}", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("🏠 Back", callback_data="main_menu")]]))
         return
 
@@ -1641,13 +4271,294 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
 # Admin commands
+STATS_DAYS = 7
+BOOKED_STATUSES = ("confirmed", "delivered")
+AWAITING_STATUSES = ("pending_confirmation", "payment_submitted")
+
+
+def stats_summary() -> str:
+    """Totals, status breakdown, order value and the last few days, all from request_stats"""
+    txt = "📊 Teeshoot Bot Data Summary\n"
+    for section, title, _ in DASHBOARD_SUMMARIES:
+        by_status = request_stats.by_status[section]
+        pending = request_stats.count(section, PENDING_STATUSES[section])
+        txt += f"\n{title.replace('*', '').rstrip(':')}: {request_stats.count(section)} ({pending} pending)\n"
+        if by_status:
+            txt += "  " + ", ".join(f"{status} {n}" for status, n in sorted(by_status.items())) + "\n"
+    txt += (
+        f"\n💰 Order value: {fmt_money(request_stats.amount('orders', BOOKED_STATUSES))} confirmed/delivered"
+        f" | {fmt_money(request_stats.amount('orders', AWAITING_STATUSES))} awaiting confirmation\n"
+    )
+    txt += f"\n📈 Last {STATS_DAYS} days (orders/issues/callbacks/inquiries, order value):\n"
+    columns = [request_stats.days(section, STATS_DAYS) for section in REQUEST_SECTIONS]
+    for row in zip(*columns):
+        counts = "/".join(str(n) for _, n, _ in row)
+        txt += f"{row[0][0]}: {counts} | {fmt_money(row[0][2])}\n"
+    return txt
+
+
 async def admin_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_owner(update):
         await update.message.reply_text("❌ Access denied.")
         return
-    txt = f"📊 Teeshoot Bot Data Summary\n\n📦 Orders: {len(orders)}\n🛠 Issues: {len(issues)}\n📞 Callbacks: {len(callbacks)}\n❓ Inquiries: {len(inquiries)}\n👤 Users: {len(user_data_store)}\n\n📄 Active Sessions: {len(user_states)}"
+    txt = stats_summary() + f"\n👤 Users: {len(user_data_store)}\n📄 Active Sessions: {len(user_states)}"
+    txt += f"\n💾 Saves requested: {save_scheduler.saves_requested} | Writes performed: {save_scheduler.writes_performed} | Conflicts merged: {save_scheduler.conflicts_merged}"
     await update.message.reply_text(txt)
 
+# Broadcasts: the recipients are fixed when a broadcast starts, and each outcome is
+# appended to BROADCAST_DIR/<id>.jsonl as it happens, so after a restart the
+# broadcast carries on with whoever was not reached yet. All sends share one token
+# bucket under Telegram's ~30 messages/s; a RetryAfter pauses the whole bucket.
+BROADCAST_DIR = "teeshoot_broadcasts"
+BROADCAST_RATE = 30  # messages per second, across all running broadcasts
+BROADCAST_WORKERS = 16
+BROADCAST_MAX_ATTEMPTS = 5
+BROADCAST_PROGRESS_INTERVAL = 3  # seconds between edits of the status message
+BROADCAST_OUTCOMES = ("sent", "blocked", "failed")
+
+
+class TokenBucket:
+    """Async rate limiter: acquire() waits for a token; pause() stops everyone"""
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self.burst = burst  # 1: evenly spaced sends, no catch-up burst after a lull
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:  # waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+broadcast_bucket = TokenBucket(BROADCAST_RATE)
+_broadcast_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _retry_after_seconds(e: RetryAfter) -> float:
+    delay = e.retry_after
+    return delay.total_seconds() if isinstance(delay, timedelta) else float(delay)
+
+
+def fmt_duration(seconds: int) -> str:
+    minutes, seconds = divmod(max(seconds, 0), 60)
+    return f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
+
+
+class Broadcast:
+    """One broadcast and its delivery log. The file's first line holds the message,
+    the recipients and where the status message is; each further line one outcome."""
+
+    def __init__(self, path: str, header: Dict[str, Any], outcomes: Dict[int, str]):
+        self.path = path
+        self.id = header["id"]
+        self.text = header["text"]
+        self.recipients: List[int] = header["recipients"]
+        self.status_chat = header.get("chat")
+        self.status_message = header.get("message")
+        self.started = header["started"]
+        self.done = header.get("done", False)
+        self.outcomes = outcomes
+        self._fh = None
+
+    @classmethod
+    def create(cls, text: str, recipients: List[int], chat: int, message: int) -> "Broadcast":
+        os.makedirs(BROADCAST_DIR, exist_ok=True)
+        bid = f"{time.time_ns()}-{os.getpid()}"
+        header = {"id": bid, "text": text, "recipients": recipients, "chat": chat, "message": message, "started": now_ts()}
+        path = os.path.join(BROADCAST_DIR, f"{bid}.jsonl")
+        with open(path, "x", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            f.flush()
+            if DURABILITY != "relaxed":
+                os.fsync(f.fileno())
+        return cls(path, header, {})
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Broadcast"]:
+        header, outcomes = None, {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn line from a crash mid-append
+                if header is None:
+                    header = entry
+                elif "u" in entry:
+                    outcomes[entry["u"]] = entry["r"]
+                elif entry.get("done"):
+                    header["done"] = True
+        return cls(path, header, outcomes) if header else None
+
+    def record(self, user_id: int, outcome: str):
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(f'{{"u": {user_id}, "r": "{outcome}"}}\n')
+        self._fh.flush()  # a crashed process loses nothing; fsync() covers power loss
+        self.outcomes[user_id] = outcome
+
+    def sync(self):
+        if self._fh is not None and DURABILITY != "relaxed":
+            os.fsync(self._fh.fileno())
+
+    def finish(self):
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write('{"done": true}\n')
+        self._fh.flush()
+        self.sync()
+        self._fh.close()
+        self._fh = None
+        self.done = True
+
+    def pending(self) -> List[int]:
+        return [uid for uid in self.recipients if uid not in self.outcomes]
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(BROADCAST_OUTCOMES, 0)
+        for outcome in self.outcomes.values():
+            counts[outcome] += 1
+        return counts
+
+    def report(self) -> str:
+        counts = self.counts()
+        total = len(self.recipients)
+        line = f"✅ {counts['sent']} delivered | 🚫 {counts['blocked']} blocked | ⚠️ {counts['failed']} failed"
+        if self.done:
+            return f"📣 Broadcast finished in {fmt_duration(now_ts() - self.started)}\n\n👥 {total} recipients\n{line}"
+        return f"📣 Broadcasting… {len(self.outcomes)}/{total}\n\n{line}"
+
+
+async def _deliver(bot, user_id: int, text: str) -> str:
+    """Send one broadcast message, waiting out flood limits; returns the outcome"""
+    parse_mode = ParseMode.MARKDOWN
+    for attempt in range(BROADCAST_MAX_ATTEMPTS):
+        await broadcast_bucket.acquire()
+        try:
+            await bot.send_message(chat_id=user_id, text=text, parse_mode=parse_mode)
+            return "sent"
+        except RetryAfter as e:
+            broadcast_bucket.pause(_retry_after_seconds(e) + 1)
+        except Forbidden:
+            return "blocked"  # blocked the bot or deleted their account
+        except BadRequest as e:
+            if parse_mode and "parse" in str(e).lower():
+                parse_mode = None  # unbalanced Markdown in the message: send it as typed
+                continue
+            logger.warning("Broadcast to %s failed: %s", user_id, e)
+            return "failed"
+        except NetworkError as e:
+            await asyncio.sleep(min(2 ** attempt, 30))
+            logger.info("Broadcast to %s retrying after network error: %s", user_id, e)
+        except Exception as e:
+            logger.warning("Broadcast to %s failed: %s", user_id, e)
+            return "failed"
+    return "failed"
+
+
+async def _edit_status(bot, bc: Broadcast):
+    if bc.status_chat is None:
+        return
+    try:
+        await bot.edit_message_text(chat_id=bc.status_chat, message_id=bc.status_message, text=bc.report())
+    except Exception as e:  # "message is not modified", or the status message is gone
+        logger.debug("Broadcast status edit skipped: %s", e)
+
+
+async def run_broadcast(bot, bc: Broadcast):
+    """Deliver to everyone not reached yet, then post the final report"""
+    try:
+        lock_fd = os.open(bc.path, os.O_RDONLY)
+    except FileNotFoundError:  # another process finished it meanwhile
+        _broadcast_tasks.pop(bc.id, None)
+        return
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return  # another process is running this broadcast
+            bc = Broadcast.load(bc.path) or bc  # it may have progressed before we got the lock
+        if bc.done:
+            return
+        pending = bc.pending()
+        recipients = iter(pending)  # shared by the workers
+        text = f"📣 *Broadcast*\n\n{bc.text}"
+
+        async def worker():
+            for uid in recipients:
+                bc.record(uid, await _deliver(bot, uid, text))
+
+        async def progress():
+            while True:
+                await asyncio.sleep(BROADCAST_PROGRESS_INTERVAL)
+                bc.sync()
+                await _edit_status(bot, bc)
+
+        ticker = asyncio.create_task(progress())
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(BROADCAST_WORKERS, len(pending)))))
+        finally:
+            ticker.cancel()
+        bc.finish()
+        done_path = bc.path[:-len(".jsonl")] + ".done"
+        os.replace(bc.path, done_path)
+        bc.path = done_path
+        logger.info("Broadcast %s finished: %s", bc.id, bc.counts())
+        await _edit_status(bot, bc)
+    except Exception as e:
+        logger.exception("Broadcast %s stopped, it resumes on the next start: %s", bc.id, e)
+    finally:
+        os.close(lock_fd)
+        _broadcast_tasks.pop(bc.id, None)
+
+
+def start_broadcast(bot, bc: Broadcast):
+    _broadcast_tasks[bc.id] = asyncio.create_task(run_broadcast(bot, bc))
+
+
+def resume_broadcasts(bot) -> int:
+    """Pick up the broadcasts an earlier run left unfinished"""
+    if not os.path.isdir(BROADCAST_DIR):
+        return 0
+    resumed = 0
+    for name in sorted(os.listdir(BROADCAST_DIR)):
+        if not name.endswith(".jsonl"):
+            continue
+        path = os.path.join(BROADCAST_DIR, name)
+        try:
+            bc = Broadcast.load(path)
+        except OSError:
+            continue  # finished by another process meanwhile
+        if bc and bc.done:
+            try:
+                os.replace(path, path[:-len(".jsonl")] + ".done")  # crashed just before the rename
+            except OSError:
+                pass
+        elif bc and bc.id not in _broadcast_tasks:
+            logger.info("Resuming broadcast %s: %d of %d recipients left", bc.id, len(bc.pending()), len(bc.recipients))
+            start_broadcast(bot, bc)
+            resumed += 1
+    return resumed
+
+
 # 5. UPDATED broadcast() function - Replace entire function:
 async def broadcast(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_owner(update):
@@ -1683,38 +4594,88 @@ async def broadcast(update: Update, context: ContextTypes.DEFAULT_TYPE):
             except Exception as e:
                 logger.warning(f"Failed to notify admin {admin_id}: {e}")
     
-    # Now send the actual broadcast to users
-    sent = 0
-    for uid, profile in user_data_store.items():
-        if profile.notifications_enabled:
-            try:
-                await context.bot.send_message(
-                    chat_id=uid, 
-                    text=f"📣 *Broadcast*\n\n{msg}", 
-                    parse_mode=ParseMode.MARKDOWN
-                )
-                sent += 1
-            except: 
-                pass
-    
-    await update.message.reply_text(
-        f"✅ Broadcast sent to {sent} users.\n"
-        f"📢 All other admins have been notified."
-    )
+    # Now queue the actual broadcast; it runs in the background and reports below
+    recipients = [uid for uid, profile in user_data_store.items() if profile.notifications_enabled]
+    if not recipients:
+        await update.message.reply_text("📭 No users have notifications enabled.")
+        return
+    status = await update.message.reply_text(f"📣 Broadcast to {len(recipients)} users starting…")
+    bc = Broadcast.create(msg, recipients, status.chat_id, status.message_id)
+    start_broadcast(context.bot, bc)
+    await update.message.reply_text("📢 All other admins have been notified. Progress is shown above.")
 
 async def dump_json(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_owner(update):
         await update.message.reply_text("❌ Access denied.")
         return
-    save_all()
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            snippet = f.read(4000)
+        snippet = json.dumps(_snapshot_data(), ensure_ascii=False, indent=2)[:4000]
         await update.message.reply_text(f"🗂 Data snapshot:\n\n<pre>{snippet}</pre>", parse_mode=ParseMode.HTML)
     except Exception as e:
         await update.message.reply_text(f"Error: {e}")
 
 
+async def archive_now(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not is_owner(update):
+        await update.message.reply_text("❌ Access denied.")
+        return
+    moved = await archive_cold_requests()
+    await update.message.reply_text(f"📦 Archived {moved} requests older than {ARCHIVE_AFTER_DAYS} days.")
+
+
+async def search_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not is_owner(update):
+        await update.message.reply_text("❌ Access denied.")
+        return
+    query = " ".join(context.args or [])
+    if not search_tokens(query):
+        await update.message.reply_text("🔎 Usage: /search <words or phone number>\n\nMatches names, profiles, descriptions, models and phone numbers; words can be cut short (e.g. /search hp batt).")
+        return
+    results, total = search_requests(query)
+    if not results:
+        await update.message.reply_text(f"🔎 Nothing matches “{query}”.")
+        return
+    kb = []
+    for section, req_id in results:
+        item = globals()[section][req_id]
+        status_emoji = "⏳" if item.status in PENDING_STATUSES[section] else "✅"
+        button_text = f"{status_emoji} {req_id} | {item.name[:15]} ({fmt_ts(item.timestamp)[:10]})"
+        kb.append([InlineKeyboardButton(button_text, callback_data=f"admin_view_{req_id}")])
+    shown = f", newest {len(results)} shown" if total > len(results) else ""
+    await update.message.reply_text(f"🔎 {total} requests match “{query}”{shown}:", reply_markup=InlineKeyboardMarkup(kb))
+
+
+async def restore_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not is_owner(update):
+        await update.message.reply_text("❌ Access denied.")
+        return
+    if not context.args:
+        generations = list_backups()
+        if not generations:
+            await update.message.reply_text("🗄 No backups yet.")
+            return
+        lines = "\n".join(f"• <code>{g}</code>" for g in reversed(generations))
+        await update.message.reply_text(
+            f"🗄 Backup generations, newest first:\n\n{lines}\n\nUse /restore &lt;name&gt; or /restore latest.",
+            parse_mode=ParseMode.HTML,
+        )
+        return
+    try:
+        name = resolve_backup(context.args[0])
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {e}")
+        return
+    save_scheduler.flush()
+    try:
+        # On the save worker, so every save made before the restore lands before it
+        await save_scheduler.run(_restore_files, name)
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {e}")
+        return
+    await refresh_data()
+    await update.message.reply_text(f"♻️ Restored backup {name}. The data it replaced was kept as a pre-restore backup.")
+
+
 async def add_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_owner(update):
         await update.message.reply_text("❌ Access denied.")
@@ -1726,7 +4687,7 @@ async def add_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         new_admin_id = int(context.args[0])
         ADMIN_IDS.add(new_admin_id)
-        save_all()
+        save_record("admin_ids")
         await update.message.reply_text(f"✅ Added admin: {new_admin_id}")
     except ValueError:
         await update.message.reply_text("❌ Invalid user ID format.")
@@ -1746,7 +4707,7 @@ async def remove_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
         if admin_id in ADMIN_IDS:
             ADMIN_IDS.remove(admin_id)
-            save_all()
+            save_record("admin_ids")
             await update.message.reply_text(f"✅ Removed admin: {admin_id}")
         else:
             await update.message.reply_text("❌ User is not an admin.")
@@ -1801,7 +4762,7 @@ async def handle_technician_input(update: Update, context: ContextTypes.DEFAULT_
         elif step == "area":
             state["new_tech"]["area"] = text
             TECHNICIANS.append(state["new_tech"])
-            save_all()
+            save_record("technicians")
             await update.message.reply_text(f"✅ Technician '{state['new_tech']['name']}' added successfully!", reply_markup=MAIN_KB)
             user_states.pop(uid, None)
     
@@ -1810,7 +4771,7 @@ async def handle_technician_input(update: Update, context: ContextTypes.DEFAULT_
             index = int(text) - 1
             if 0 <= index < len(TECHNICIANS):
                 removed = TECHNICIANS.pop(index)
-                save_all()
+                save_record("technicians")
                 await update.message.reply_text(f"✅ Removed technician: {removed['name']}", reply_markup=MAIN_KB)
             else:
                 await update.message.reply_text("❌ Invalid number. Try again:")
@@ -1846,31 +4807,34 @@ async def handle_technician_input(update: Update, context: ContextTypes.DEFAULT_
                 return
         elif step == "value":
             TECHNICIANS[state["edit_index"]][state["edit_field"]] = text
-            save_all()
+            save_record("technicians")
             tech_name = TECHNICIANS[state["edit_index"]]["name"]
             await update.message.reply_text(f"✅ Updated {state['edit_field']} for {tech_name}!", reply_markup=MAIN_KB)
             user_states.pop(uid, None)
 
 
-async def manage_payment_info(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    if not is_owner(update):
-        await update.message.reply_text("❌ Access denied.")
-        return
-    
-    text = (
+@render_cached("payment_info")
+def _payment_info_text() -> str:
+    return (
         f"💳 *Current Payment Info:*\n\n"
         f"🏦 Bank: {PAYMENT_INFO['bank_name']}\n"
         f"🔢 Account Number: {PAYMENT_INFO['account_number']}\n"
         f"👤 Account Name: {PAYMENT_INFO['account_name']}"
     )
+
+PAYMENT_INFO_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🏦 Change Bank", callback_data="change_bank")],
+    [InlineKeyboardButton("🔢 Change Account Number", callback_data="change_account_number")],
+    [InlineKeyboardButton("👤 Change Account Name", callback_data="change_account_name")],
+    [InlineKeyboardButton("🏠 Back", callback_data="main_menu")],
+])
+
+async def manage_payment_info(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not is_owner(update):
+        await update.message.reply_text("❌ Access denied.")
+        return
     
-    kb = [
-        [InlineKeyboardButton("🏦 Change Bank", callback_data="change_bank")],
-        [InlineKeyboardButton("🔢 Change Account Number", callback_data="change_account_number")],
-        [InlineKeyboardButton("👤 Change Account Name", callback_data="change_account_name")],
-        [InlineKeyboardButton("🏠 Back", callback_data="main_menu")],
-    ]
-    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
+    await update.message.reply_text(_payment_info_text(), parse_mode=ParseMode.MARKDOWN, reply_markup=PAYMENT_INFO_KB)
 
 
 async def handle_manage_inquiry_input(update: Update, context: ContextTypes.DEFAULT_TYPE, state: Dict[str, Any]):
@@ -1884,12 +4848,12 @@ async def handle_manage_inquiry_input(update: Update, context: ContextTypes.DEFA
         await update.message.reply_text("📝 Now enter the response content:")
     elif step == "add_content":
         inquiry_responses[state["new_title"]] = text
-        save_all()
+        save_record("inquiry_responses", state["new_title"])
         await update.message.reply_text(f"✅ Added response: {state['new_title']}", reply_markup=MAIN_KB)
         user_states.pop(uid, None)
     elif step == "edit_content":
         inquiry_responses[state["edit_title"]] = text
-        save_all()
+        save_record("inquiry_responses", state["edit_title"])
         await update.message.reply_text(f"✅ Updated response: {state['edit_title']}", reply_markup=MAIN_KB)
         user_states.pop(uid, None)
 
@@ -1905,7 +4869,7 @@ async def handle_payment_info_input(update: Update, context: ContextTypes.DEFAUL
     elif field == "account_name":
         PAYMENT_INFO["account_name"] = text.upper()
     
-    save_all()
+    save_record("payment_info")
     await update.message.reply_text(f"✅ Updated {field.replace('_', ' ')} successfully!", reply_markup=MAIN_KB)
     user_states.pop(uid, None)
 
@@ -1925,60 +4889,200 @@ async def manage_inquiries(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("❓ *Inquiry Management*\n\nManage quick responses for common inquiries:", parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
 
 
+# Message pager for long admin views. A view is a numbered sequence of text blocks,
+# and only the blocks on the page being shown are rendered. Pages stop short of
+# Telegram's 4096-character limit; a block too long for one page is cut into
+# pieces by split_markdown(). A page is addressed by its first (or, paging back,
+# its last) (block, piece) in the button's callback data, so nothing is kept per chat.
+PAGE_CHARS = 3500
+
+
+def _open_entity(text: str) -> str:
+    """Marker of the legacy-Markdown entity still open at the end of text, or "" """
+    current, i = "", 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and current not in ("`", "```"):
+            i += 2
+            continue
+        marker = "```" if text.startswith("```", i) else ch if ch in "`*_" else ""
+        if marker:
+            # Legacy Markdown entities do not nest: other markers inside are literal
+            if not current:
+                current = marker
+            elif marker == current:
+                current = ""
+        i += len(marker) or 1
+    return current
+
+
+def split_markdown(text: str, limit: int) -> List[str]:
+    """Cut text into pieces of at most limit characters, at a line break (or a space)
+    where possible. An entity open at a cut is closed there and reopened after it."""
+    pieces, carry = [], ""
+    while len(carry) + len(text) > limit:
+        room = limit - len(carry) - 3  # leaves space to close an entity
+        cut = text.rfind("\n", 0, room)
+        if cut < room // 2:
+            cut = text.rfind(" ", 0, room)
+        if cut <= 0:
+            cut = room
+        chunk = carry + text[:cut]
+        marker = _open_entity(chunk)
+        pieces.append(chunk + marker)
+        carry = marker
+        text = text[cut + 1:] if text[cut] in "\n " else text[cut:]
+    pieces.append(carry + text)
+    return pieces
+
+
+class PagedView:
+    def __init__(self, name: str, title: str, count, block, back: str = "main_menu", unit: str = "", extra=()):
+        self.name, self.title, self.count, self.block = name, title, count, block
+        self.back, self.unit, self.extra = back, unit, list(extra)
+        self.budget = PAGE_CHARS - len(title) - 64  # 64: the range line
+
+    def _pieces(self, i: int) -> List[str]:
+        return split_markdown(self.block(i), self.budget)
+
+    def _forward(self, i: int, j: int):
+        """(block, piece, text) from (i, j) on"""
+        count = self.count()
+        while i < count:
+            pieces = self._pieces(i)
+            for k in range(j, len(pieces)):
+                yield i, k, pieces[k]
+            i, j = i + 1, 0
+
+    def _backward(self, i: int, j: int):
+        """(block, piece, text) before (i, j), nearest first"""
+        i = min(i, self.count())
+        if j > 0 and i < self.count():
+            pieces = self._pieces(i)
+            for k in range(min(j, len(pieces)) - 1, -1, -1):
+                yield i, k, pieces[k]
+        for b in range(i - 1, -1, -1):
+            pieces = self._pieces(b)
+            for k in range(len(pieces) - 1, -1, -1):
+                yield b, k, pieces[k]
+
+    def page(self, i: int = 0, j: int = 0, forward: bool = True) -> Tuple[str, InlineKeyboardMarkup]:
+        taken, used = [], 0
+        for entry in (self._forward(i, j) if forward else self._backward(i, j)):
+            if taken and used + len(entry[2]) > self.budget:
+                break
+            taken.append(entry)
+            used += len(entry[2])
+        if not taken and (i, j) != (0, 0):
+            return self.page()  # the content shrank since the button was made
+        if not forward:
+            taken.reverse()
+        text = self.title + "".join(piece for _, _, piece in taken)
+        nav = []
+        if taken:
+            (fi, fj, _), (li, lj, _) = taken[0], taken[-1]
+            if self.unit:
+                text += f"\n_{fi + 1}–{li + 1} of {self.count()} {self.unit}_"
+            if next(self._backward(fi, fj), None):
+                nav.append(InlineKeyboardButton("⬅️ Prev", callback_data=f"pg_{self.name}_b_{fi}_{fj}"))
+            if next(self._forward(li, lj + 1), None):
+                nav.append(InlineKeyboardButton("Next ➡️", callback_data=f"pg_{self.name}_f_{li}_{lj + 1}"))
+        kb = ([nav] if nav else []) + self.extra + [[InlineKeyboardButton("🏠 Back", callback_data=self.back)]]
+        return text, InlineKeyboardMarkup(kb)
+
+
+async def show_page(update: Update, view: str, i: int = 0, j: int = 0, forward: bool = True):
+    """Send a page of a paged view, or show it in place of the tapped message"""
+    text, markup = PAGED_VIEWS[view].page(i, j, forward)
+    if update.callback_query:
+        await update.callback_query.edit_message_text(text, parse_mode=ParseMode.MARKDOWN, reply_markup=markup)
+    else:
+        await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN, reply_markup=markup)
+
+
+DASHBOARD_SUMMARIES = [
+    ("orders", "📦 *ORDERS:*", "No orders yet"),
+    ("issues", "🛠 *ISSUES:*", "No issues reported"),
+    ("callbacks", "📞 *CALLBACKS:*", "No callbacks requested"),
+    ("inquiries", "❓ *INQUIRIES:*", "No inquiries yet"),
+]
+
+
+def _dashboard_block(i: int) -> str:
+    """Per category: counts, then the newest pending requests; last the commands"""
+    if i == len(DASHBOARD_SUMMARIES):
+        return (
+            "📝 *COMMANDS:*\n"
+            "• Reply to any ID with 'status X' to change status\n"
+            "• Example: `status confirmed` or `status resolved`\n"
+            "• Use /refresh to update this view\n"
+        )
+    section, title, empty = DASHBOARD_SUMMARIES[i]
+    store = globals()[KEYED_SECTIONS[section]]
+    if not store:
+        return f"{title}\n{empty}\n\n"
+    pending = request_stats.count(section, PENDING_STATUSES[section])
+    today = request_stats.days(section, 1)[0][1]
+    text = f"{title} {request_stats.count(section)} total | ⏳ {pending} pending | 🆕 {today} today\n"
+    if section == "orders":
+        text += f"💰 {fmt_money(request_stats.amount(section, BOOKED_STATUSES))} confirmed/delivered\n"
+    for rid in itertools.islice(requests_by_status.newest(section, PENDING_STATUSES[section]), DASHBOARD_PENDING_LIMIT):
+        item = store[rid]
+        if section == "orders":
+            text += f"• {rid} | {item.item.replace('_',' ').title()} | {item.status}\n"
+        elif section == "issues":
+            text += f"• {rid} | {item.type} | {item.status}\n"
+        else:
+            text += f"• {rid} | {item.status}\n"
+    if pending > DASHBOARD_PENDING_LIMIT:
+        text += f"…and {pending - DASHBOARD_PENDING_LIMIT} more pending\n"
+    return text + "\n"
+
+
+@render_cached("tips_guides")
+def _tip_titles() -> List[str]:
+    return list(tips_guides)
+
+
+@render_cached("inquiry_responses")
+def _response_titles() -> List[str]:
+    return list(inquiry_responses)
+
+
+def _saved_text_block(title: str, content: str) -> str:
+    return f"**{title}:**\n{content[:100]}{'...' if len(content) > 100 else ''}\n\n"
+
+
+PAGED_VIEWS: Dict[str, PagedView] = {
+    "dash": PagedView(
+        "dash", "📊 *Admin Dashboard*\n\n", lambda: len(DASHBOARD_SUMMARIES) + 1, _dashboard_block,
+        back="main_menu", extra=[[InlineKeyboardButton("🔄 Refresh", callback_data="admin_manage")]],
+    ),
+    "tips": PagedView(
+        "tips", "📋 *Saved Tips:*\n\n", lambda: len(_tip_titles()),
+        lambda i: _saved_text_block(_tip_titles()[i], tips_guides.get(_tip_titles()[i], "")), unit="tips",
+    ),
+    "resp": PagedView(
+        "resp", "📋 *Saved Responses:*\n\n", lambda: len(_response_titles()),
+        lambda i: _saved_text_block(_response_titles()[i], inquiry_responses.get(_response_titles()[i], "")), unit="responses",
+    ),
+}
+
+
 async def admin_manage(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Main admin management menu - Simplified Version"""
     if not is_owner(update):
-        await update.message.reply_text("❌ Access denied.")
+        await update.effective_message.reply_text("❌ Access denied.")
         return
 
     try:
         # Reload data
-        load_all()
-        
-        # Build a simple text summary of all requests
-        text = "📊 *Admin Dashboard*\n\n"
-        
-        # Orders Summary
-        text += "📦 *ORDERS:*\n"
-        if not orders:
-            text += "No orders yet\n"
-        else:
-            for oid, order in orders.items():
-                text += f"• {oid} | {order.item.replace('_',' ').title()} | {order.status}\n"
-        
-        text += "\n🛠 *ISSUES:*\n"
-        if not issues:
-            text += "No issues reported\n"
-        else:
-            for iid, issue in issues.items():
-                text += f"• {iid} | {issue.type} | {issue.status}\n"
-        
-        text += "\n📞 *CALLBACKS:*\n"
-        if not callbacks:
-            text += "No callbacks requested\n"
-        else:
-            for cid, cb in callbacks.items():
-                text += f"• {cid} | {cb.status}\n"
-                
-        text += "\n❓ *INQUIRIES:*\n"
-        if not inquiries:
-            text += "No inquiries yet\n"
-        else:
-            for qid, inq in inquiries.items():
-                text += f"• {qid} | {inq.status}\n"
-                
-        # Add instructions
-        text += "\n📝 *COMMANDS:*\n"
-        text += "• Reply to any ID with 'status X' to change status\n"
-        text += "• Example: `status confirmed` or `status resolved`\n"
-        text += "• Use /refresh to update this view\n"
-        
-        # Send the message
-        await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
+        await refresh_data()
+        await show_page(update, "dash")
         
     except Exception as e:
         logger.error(f"Error in admin_manage: {e}")
-        await update.message.reply_text("⚠️ Error loading admin view. Please try again.", reply_markup=MAIN_KB)
+        await update.effective_message.reply_text("⚠️ Error loading admin view. Please try again.", reply_markup=MAIN_KB)
 
 
 async def manage_orders_simple(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1988,23 +5092,46 @@ async def manage_orders_simple(update: Update, context: ContextTypes.DEFAULT_TYP
         return
 
     # Ensure freshest data
-    load_all()
+    await refresh_data()
 
     if not orders:
         await update.message.reply_text("📭 No orders available.")
         return
 
+    text, markup = _orders_list_page()
+    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN, reply_markup=markup)
+
+
+ORDERS_LIST_PAGE_SIZE = 25
+
+def _orders_list_page(cursor: Optional[Tuple[int, str]] = None, older: bool = True) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    """One page of the /manageorders list, newest first, with Newer/Older buttons"""
+    lists = [requests_by_time.by_time["orders"]]
+    page, more = keyset_page(lists, cursor, older, ORDERS_LIST_PAGE_SIZE)
+    if not page and cursor is not None:
+        page, more = keyset_page(lists, None, True, ORDERS_LIST_PAGE_SIZE)
+        older = True
+
     # Build a concise list message
     lines = ["📦 *Orders List*\n\n" ]
-    for oid, order in sorted(orders.items(), key=lambda x: x[1].timestamp, reverse=True):
+    for _, oid in page:
+        order = orders[oid]
         user = order.name or safe_username(order.username)
         item_name = order.item.replace('_', ' ').title() if hasattr(order, 'item') else 'N/A'
         status = order.status.replace('_', ' ').title()
         lines.append(f"• {oid} — {item_name} — {user} — {status}")
 
     lines.append("\nTo change status: reply to the line above with `status <new_status>` (admins only). Example: `status delivered`")
-    text = "\n".join(lines)
-    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
+
+    paging = []
+    if page:
+        if (more if not older else keyset_has(lists, page[0], older=False)):
+            ts, rid = page[0]
+            paging.append(InlineKeyboardButton("⬆️ Newer", callback_data=f"mo_n_{ts}_{rid}"))
+        if (more if older else keyset_has(lists, page[-1], older=True)):
+            ts, rid = page[-1]
+            paging.append(InlineKeyboardButton("⬇️ Older", callback_data=f"mo_o_{ts}_{rid}"))
+    return "\n".join(lines), InlineKeyboardMarkup([paging]) if paging else None
 
 
 async def handle_manage_tips_input(update: Update, context: ContextTypes.DEFAULT_TYPE, state: Dict[str, Any]):
@@ -2018,12 +5145,12 @@ async def handle_manage_tips_input(update: Update, context: ContextTypes.DEFAULT
         await update.message.reply_text("📝 Now enter the tip/guide content:")
     elif step == "add_content":
         tips_guides[state["new_title"]] = text
-        save_all()
+        save_record("tips_guides", state["new_title"])
         await update.message.reply_text(f"✅ Added tip: {state['new_title']}", reply_markup=MAIN_KB)
         user_states.pop(uid, None)
     elif step == "edit_content":
         tips_guides[state["edit_title"]] = text
-        save_all()
+        save_record("tips_guides", state["edit_title"])
         await update.message.reply_text(f"✅ Updated tip: {state['edit_title']}", reply_markup=MAIN_KB)
         user_states.pop(uid, None)
 
@@ -2042,10 +5169,22 @@ async def manage_tips(update: Update, context: ContextTypes.DEFAULT_TYPE):
     ]
     await update.message.reply_text("📘 *Tips & Guides Management*\n\nManage tips and maintenance guides:", parse_mode=ParseMode.MARKDOWN, reply_markup=InlineKeyboardMarkup(kb))
 
-async def show_admin_requests(query, request_type: str):
-    """Show list of requests by type"""
+ADMIN_PAGE_SIZE = 10  # request buttons per admin list page
+DASHBOARD_PENDING_LIMIT = 10  # pending requests listed per category on the dashboard
+
+
+def _admin_page_data(request_type: str, mode: str, cursor: Tuple[int, str], older: bool) -> str:
+    """Callback data for the admin list page that continues from cursor"""
+    ts, rid = cursor
+    return f"admp_{request_type}_{mode}_{'o' if older else 'n'}_{ts}_{rid}"
+
+
+async def show_admin_requests(query, request_type: str, mode: Optional[str] = None,
+                              cursor: Optional[Tuple[int, str]] = None, older: bool = True):
+    """Show one page of requests by type, newest first. mode is "pending" or "all";
+    cursor is the (timestamp, id) row the page continues from, towards older rows or newer."""
     # Always reload data before showing requests
-    load_all()
+    await refresh_data()
     
     try:
         # Map request types to stores
@@ -2092,7 +5231,7 @@ async def show_admin_requests(query, request_type: str):
         # Add current category counts to message
         counts = []
         for category in navigation_order:
-            count = len(stores[category])
+            count = request_stats.count(category)
             if count > 0:
                 counts.append(f"{category.title()}: {count}")
         
@@ -2105,41 +5244,25 @@ async def show_admin_requests(query, request_type: str):
             await query.reply_text(message, reply_markup=InlineKeyboardMarkup(kb))
         return
     
-    # Sort by timestamp (newest first) and filter by status
-    if request_type == "orders":
-        pending_statuses = ["pending_confirmation", "payment_submitted", "confirmed"]
-    elif request_type == "issues":
-        pending_statuses = ["reported", "under_review"]
-    elif request_type == "callbacks":
-        pending_statuses = ["pending"]
-    else:  # inquiries
-        pending_statuses = ["pending_response"]
-    
-    # First show pending items, then others
-    pending_items = []
-    other_items = []
-    for req_id, item in store.items():
-        if item.status in pending_statuses:
-            pending_items.append((req_id, item))
-        else:
-            other_items.append((req_id, item))
-            
-    # Sort both lists by timestamp
-    pending_items.sort(key=lambda x: x[1].timestamp, reverse=True)
-    other_items.sort(key=lambda x: x[1].timestamp, reverse=True)
-    
-    # Combine lists with pending first
-    sorted_items = pending_items + other_items
-    
-    # Calculate stats
-    total_count = len(sorted_items)
-    pending_count = len(pending_items)
-    
-    # Build keyboard with ALL requests
+    pending_statuses = PENDING_STATUSES[request_type]
+    pending_count = request_stats.count(request_type, pending_statuses)
+    if mode is None:
+        mode = "pending" if pending_count else "all"
+    if mode == "pending":
+        by_status = requests_by_status.by_status[request_type]
+        lists = [by_status[s] for s in pending_statuses if s in by_status]
+    else:
+        lists = [requests_by_time.by_time[request_type]]
+
+    page, more = keyset_page(lists, cursor, older, ADMIN_PAGE_SIZE)
+    if not page and cursor is not None:
+        # Everything past the cursor was handled or archived meanwhile: start over
+        page, more = keyset_page(lists, None, True, ADMIN_PAGE_SIZE)
+        older = True
+
     kb = []
-    
-    # Add pending items first
-    for req_id, item in sorted_items:
+    for ts, req_id in page:
+        item = store[req_id]
         # Status emoji
         if item.status in pending_statuses:
             status_emoji = "⏳"
@@ -2153,10 +5276,26 @@ async def show_admin_requests(query, request_type: str):
             display_name = item.name[:15]
         
         # Create button with status and timestamp
-        timestamp = item.timestamp.split()[1]  # Get just the time part
+        timestamp = fmt_ts(ts).split()[1]  # Get just the time part
         button_text = f"{status_emoji} {req_id} | {display_name} ({timestamp})"
         kb.append([InlineKeyboardButton(button_text, callback_data=f"admin_view_{req_id}")])
-    
+
+    # Paging buttons carry the row to continue from, so each page costs the same
+    paging = []
+    if page:
+        has_newer = more if not older else keyset_has(lists, page[0], older=False)
+        has_older = more if older else keyset_has(lists, page[-1], older=True)
+        if has_newer:
+            paging.append(InlineKeyboardButton("⬆️ Newer", callback_data=_admin_page_data(request_type, mode, page[0], older=False)))
+        if has_older:
+            paging.append(InlineKeyboardButton("⬇️ Older", callback_data=_admin_page_data(request_type, mode, page[-1], older=True)))
+    if paging:
+        kb.append(paging)
+    if mode == "pending":
+        kb.append([InlineKeyboardButton("📋 Show All", callback_data=f"admp_{request_type}_all")])
+    else:
+        kb.append([InlineKeyboardButton("⏳ Pending Only", callback_data=f"admp_{request_type}_pending")])
+
     # Add navigation and utility buttons
     nav_buttons = [
         InlineKeyboardButton("⬅️ Previous", callback_data=f"admin_{prev_type}"),
@@ -2167,22 +5306,25 @@ async def show_admin_requests(query, request_type: str):
     kb.append(nav_buttons)
     kb.append([InlineKeyboardButton("🔙 Menu", callback_data="admin_manage")])
     
+    # Header message
+    header = (
+        f"📋 *{request_type.title()} Management*\n\n"
+        f"📊 Total: {request_stats.count(request_type)} | ⏳ Pending: {pending_count}\n"
+        f"Showing {'pending' if mode == 'pending' else 'all'} {request_type}, newest first.\n"
+    )
+    if not page:
+        header += f"\nNo pending {request_type} right now.\n"
+
     # Add category counts to header
     other_counts = []
     for category in navigation_order:
         if category != request_type:
-            count = len(stores[category])
+            count = request_stats.count(category)
             if count > 0:
                 other_counts.append(f"{category.title()}: {count}")
     
     if other_counts:
-        header += "\n\n📊 Other categories:\n" + "\n".join(other_counts)
-    
-    # Header message
-    header = (
-        f"📋 *{request_type.title()} Management*\n\n"
-        f"📊 Total: {total_count} | ⏳ Pending: {pending_count}\n"
-    )
+        header += "\n📊 Other categories:\n" + "\n".join(other_counts)
     
     if hasattr(query, 'edit_message_text'):
         await query.edit_message_text(
@@ -2201,22 +5343,11 @@ async def show_admin_requests(query, request_type: str):
 async def show_request_details(query, req_id: str):
     """Show detailed view of a single request"""
     # Find the request
-    all_stores = {"ORD": orders, "ISS": issues, "CB": callbacks, "INQ": inquiries}
-    
-    item = None
-    prefix = req_id[:3]
-    store_type = None
-    
-    if prefix in all_stores and req_id in all_stores[prefix]:
-        item = all_stores[prefix][req_id]
-        if prefix == "ORD":
-            store_type = "orders"
-        elif prefix == "ISS":
-            store_type = "issues"
-        elif prefix == "CB":
-            store_type = "callbacks"
-        elif prefix == "INQ":
-            store_type = "inquiries"
+    found = await locate_request(req_id)
+    if found:
+        store_type, item = found
+        prefix = CATEGORY_PREFIXES[store_type]
+        archived = request_registry.get(req_id) is None
     else:
         error_message = "❌ Request not found or has been deleted."
         if hasattr(query, 'edit_message_text'):
@@ -2257,7 +5388,7 @@ async def show_request_details(query, req_id: str):
             f"💰 Total: {total_formatted}\n"
             f"📍 Address: {address}\n"
             f"📊 Status: *{item.status.replace('_', ' ').title()}*\n"
-            f"⏰ Time: {item.timestamp}"
+            f"⏰ Time: {fmt_ts(item.timestamp)}"
         )
         statuses = ["pending_confirmation", "confirmed", "payment_submitted", "payment_verified", "processing", "shipped", "delivered", "cancelled"]
         
@@ -2271,7 +5402,7 @@ async def show_request_details(query, req_id: str):
             f"📱 Model: {item.details.get('model', 'N/A')}\n"
             f"📝 Description:\n{item.details.get('description', 'N/A')}\n"
             f"📊 Status: *{item.status.replace('_', ' ').title()}*\n"
-            f"⏰ Time: {item.timestamp}"
+            f"⏰ Time: {fmt_ts(item.timestamp)}"
         )
         statuses = ["reported", "under_review", "in_progress", "resolved", "closed"]
         
@@ -2283,7 +5414,7 @@ async def show_request_details(query, req_id: str):
             f"👤 User: {item.name}\n"
             f"📝 Details:\n{item.phone_and_issue}\n"
             f"📊 Status: *{item.status.replace('_', ' ').title()}*\n"
-            f"⏰ Time: {item.timestamp}"
+            f"⏰ Time: {fmt_ts(item.timestamp)}"
         )
         statuses = ["pending", "called", "completed", "no_answer"]
         
@@ -2296,12 +5427,15 @@ async def show_request_details(query, req_id: str):
             f"📝 Type: {item.inquiry_type.title()}\n"
             f"❓ Question:\n{item.inquiry_text}\n"
             f"📊 Status: *{item.status.replace('_', ' ').title()}*\n"
-            f"⏰ Time: {item.timestamp}"
+            f"⏰ Time: {fmt_ts(item.timestamp)}"
         )
         statuses = ["pending_response", "responded", "resolved"]
     
-    # Build status change keyboard
+    # Build status change keyboard; archived requests are read-only
     kb = []
+    if archived:
+        details += "\n📦 Archived"
+        statuses = []
     for status in statuses:
         if status == item.status:
             emoji = "✅"
@@ -2312,7 +5446,7 @@ async def show_request_details(query, req_id: str):
         kb.append([InlineKeyboardButton(button_text, callback_data=f"status_{req_id}_{status}")])
     
     # Add back button
-    kb.append([InlineKeyboardButton("🔙 Back to List", callback_data=f"admin_{prefix.lower().replace('ord', 'orders').replace('iss', 'issues').replace('cb', 'callbacks').replace('inq', 'inquiries')}")])
+    kb.append([InlineKeyboardButton("🔙 Back to List", callback_data=f"admin_{store_type}")])
     
     await query.edit_message_text(
         details, 
@@ -2324,21 +5458,16 @@ async def show_request_details(query, req_id: str):
 async def update_request_status(query, req_id: str, new_status: str):
     """Update status of a request"""
     # Find and update
-    all_stores = {"ORD": orders, "ISS": issues, "CB": callbacks, "INQ": inquiries}
+    found = request_registry.get(req_id)
     
-    prefix = req_id[:3]
-    
-    if prefix in all_stores and req_id in all_stores[prefix]:
-        store = all_stores[prefix]
-        old_status = store[req_id].status
-        store[req_id].status = new_status
-        save_all()
-        
-        # Save first to ensure data is persisted
-        save_all()
+    if found:
+        section, item = found
+        old_status = item.status
+        item.status = sys.intern(new_status)
+        save_record(section, req_id)
         
         # Notify user
-        user_id = store[req_id].user_id
+        user_id = item.user_id
         if user_id in user_data_store and user_data_store[user_id].notifications_enabled:
             try:
                 await query.bot.send_message(
@@ -2386,12 +5515,208 @@ async def refresh(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         await update.message.reply_text("❌ Admin only command.")
 
+# Maintenance commands: python bot.py <command> [args]
+def _sample_records(n: int, sections=RECORD_TYPES) -> Dict[str, List[str]]:
+    """n encoded records per record section, one JSON line each, like a snapshot holds"""
+    statuses = {"orders": ["pending_confirmation", "delivered"], "issues": ["reported", "resolved"],
+                "callbacks": ["pending", "completed"], "inquiries": ["pending_response", "resolved"]}
+    samples = {}
+    for section in sections:
+        cls = RECORD_TYPES[section]
+        lines = []
+        for i in range(n):
+            if section == "user_data":
+                record = cls(f"User {i}", f"0803{i:07d}", "", "Computer Science", "B", str(i % 300))
+            else:
+                args = {"orders": ("battery", {"model": "HP", "quantity": 1, "total": 12000}),
+                        "issues": ("hardware", {"model": "Dell", "description": "Screen flickers"}),
+                        "callbacks": (f"0803{i:07d} - laptop overheating",),
+                        "inquiries": ("display", "Screen goes dark after a few minutes")}[section]
+                record = cls(1000000 + i, f"user{i}", f"User {i}", *args, status=statuses[section][i % 2])
+            lines.append(json.dumps(_encode_value(section, record)))
+        samples[section] = lines
+    return samples
+
+
+def bench_records(args: List[str]):
+    """Bytes held per record: plain dataclass with text timestamps vs the slotted form"""
+    import gc
+    import tracemalloc
+    n = int(args[0]) if args else 100_000
+    print(f"Bytes per record over {n:,} records (tracemalloc)")
+    print(f"{'section':<12}{'before':>10}{'after':>10}{'saved':>8}")
+    for section, lines in _sample_records(n).items():
+        cls = RECORD_TYPES[section]
+        legacy = make_dataclass("Legacy" + cls.__name__, [(f.name, Any) for f in fields(cls)])
+        results = []
+        for build in (lambda line: legacy(**json.loads(line)), lambda line: _decode_record(section, json.loads(line))):
+            gc.collect()
+            tracemalloc.start()
+            held = [build(line) for line in lines]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            results.append(size / n)
+            del held
+        before, after = results
+        print(f"{section:<12}{before:>10.0f}{after:>10.0f}{1 - after / before:>8.0%}")
+
+
+def convert_data(args: List[str]):
+    """Rewrite every shard with another snapshot codec"""
+    global SNAPSHOT_CODEC
+    codecs = ["json", *BINARY_CODECS]
+    if len(args) != 1 or args[0] not in codecs:
+        print(f"Usage: python bot.py convert <{'|'.join(codecs)}>")
+        sys.exit(2)
+    load_all()
+    before = sum(os.path.getsize(shard.data_file) for shard in SHARDS.values() if os.path.exists(shard.data_file))
+    SNAPSHOT_CODEC = args[0]
+    for shard in SHARDS.values():
+        shard.dirty = True
+    save_all()
+    after = sum(os.path.getsize(shard.data_file) for shard in SHARDS.values())
+    print(f"Converted {len(SHARDS)} shards to {SNAPSHOT_CODEC}: {before:,} -> {after:,} bytes")
+    print(f"Set TEESHOOT_CODEC={SNAPSHOT_CODEC} so the bot keeps writing this format")
+
+
+def bench_codecs(args: List[str]):
+    """Encode time, decode time and file size of the orders shard per codec"""
+    global SNAPSHOT_CODEC, _json_dumps
+    import tempfile
+    sizes = [int(a) for a in args] or [10_000, 100_000, 1_000_000]
+    variants = [("json", _stdlib_json_dumps)] + ([("json+orjson", _orjson_dumps)] if orjson else [])
+    variants += [(name, None) for name in BINARY_CODECS]
+    saved = SNAPSHOT_CODEC, _json_dumps
+    shard = SHARDS["orders"]
+    print(f"{'records':>10} {'codec':<12}{'encode s':>10}{'decode s':>10}{'size':>14}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "orders.snapshot")
+            for n in sizes:
+                orders.clear()
+                for i, line in enumerate(_sample_records(n, ["orders"])["orders"]):
+                    orders[f"ORD{i}"] = _decode_record("orders", json.loads(line))
+                for name, dumps in variants:
+                    SNAPSHOT_CODEC = "json" if dumps else name
+                    _json_dumps = dumps or saved[1]
+                    _fragments["orders"].clear()  # time a cold encode
+                    started = time.perf_counter()
+                    payload = _shard_payload("orders")
+                    encode = time.perf_counter() - started
+                    with open(path, "wb") as f:
+                        f.write(payload)
+                    del payload
+                    started = time.perf_counter()
+                    shard._install_file(path, diff=False)
+                    decode = time.perf_counter() - started
+                    print(f"{n:>10,} {name:<12}{encode:>10.3f}{decode:>10.3f}{os.path.getsize(path):>14,}")
+    finally:
+        SNAPSHOT_CODEC, _json_dumps = saved
+        orders.clear()
+
+
+def bench_durability(args: List[str]):
+    """Journal commits per second at each durability level, one writer and many"""
+    global DURABILITY
+    import tempfile
+    seconds = float(args[0]) if args else 2.0
+    frag = _sample_records(1, ["orders"])["orders"][0]
+    saved, cwd = DURABILITY, os.getcwd()
+    print(f"{seconds:g}s per run, group window {GROUP_COMMIT_MS:g} ms")
+    print(f"{'level':<10}{'writers':>8}{'commits/s':>12}{'fsyncs':>10}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)  # Shard paths are relative to DATA_DIR
+            for level in DURABILITY_LEVELS:
+                DURABILITY = level
+                for writers in (1, 16):
+                    shard = Shard("orders")
+                    syncs = group_commit.syncs
+                    deadline = time.perf_counter() + seconds
+
+                    def commit_many(writer: int) -> int:
+                        done = 0
+                        while time.perf_counter() < deadline:
+                            key = f"ORD{writer}-{done}"
+                            shard.append({key: f'{{"op": "put", "s": "orders", "k": "{key}", "v": {frag}}}\n'})
+                            if level == "group":
+                                group_commit.barrier().result()
+                            done += 1
+                        return done
+
+                    started = time.perf_counter()
+                    with ThreadPoolExecutor(max_workers=writers) as pool:
+                        commits = sum(pool.map(commit_many, range(writers)))
+                    elapsed = time.perf_counter() - started
+                    fsyncs = {"strict": commits, "group": group_commit.syncs - syncs, "relaxed": 0}[level]
+                    print(f"{level:<10}{writers:>8}{commits / elapsed:>12,.0f}{fsyncs:>10,}")
+                    shard._journal_fh.close()
+                    os.remove(shard.journal_file)
+    finally:
+        DURABILITY = saved
+        os.chdir(cwd)
+
+
+def backup_cli(args: List[str]):
+    """Take a backup generation now"""
+    print(f"Backup {take_backup()} written to {BACKUP_DIR}/")
+
+
+def restore_cli(args: List[str]):
+    """List backup generations, or restore one"""
+    if not args:
+        for name in list_backups():
+            print(name)
+        print("Usage: python bot.py restore <generation|latest>")
+        return
+    try:
+        name = resolve_backup(args[0])
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
+    try:
+        _restore_files(name)
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
+    print(f"Restored {name}; running bots pick it up on their next reload")
+
+
+CLI_COMMANDS = {
+    "backup": backup_cli,
+    "restore": restore_cli,
+    "bench-records": bench_records,
+    "bench-codecs": bench_codecs,
+    "bench-durability": bench_durability,
+    "convert": convert_data,
+}
+
+
+def run_cli(argv: List[str]):
+    command = CLI_COMMANDS.get(argv[0])
+    if command is None:
+        print(f"Unknown command {argv[0]!r}. Commands: {', '.join(CLI_COMMANDS)}")
+        sys.exit(2)
+    command(argv[1:])
+
+
+async def start_background_tasks(app: Application):
+    app.bot_data["archive_task"] = asyncio.create_task(archive_loop())
+    app.bot_data["backup_task"] = asyncio.create_task(backup_loop())
+    resumed = resume_broadcasts(app.bot)
+    if resumed:
+        logger.info("Resumed %d unfinished broadcasts", resumed)
+
+
 def main():
+    if len(sys.argv) > 1:
+        run_cli(sys.argv[1:])
+        return
     load_all()
     if not BOT_TOKEN or BOT_TOKEN == "YOUR_BOT_TOKEN_HERE":
         raise RuntimeError("BOT_TOKEN missing.")
     
-    app = Application.builder().token(BOT_TOKEN).build()
+    app = Application.builder().token(BOT_TOKEN).post_init(start_background_tasks).build()
     
     # Commands
     app.add_handler(CommandHandler("start", start))
@@ -2402,6 +5727,9 @@ def main():
     app.add_handler(CommandHandler("admin", admin_data))
     app.add_handler(CommandHandler("broadcast", broadcast))
     app.add_handler(CommandHandler("dump", dump_json))
+    app.add_handler(CommandHandler("archive", archive_now))
+    app.add_handler(CommandHandler("restore", restore_cmd))
+    app.add_handler(CommandHandler("search", search_cmd))
     app.add_handler(CommandHandler("prices", manage_prices))  # New admin price command
     # Replace complex /manage with a simple orders list per request
     app.add_handler(CommandHandler("manage", manage_orders_simple))
@@ -2419,7 +5747,10 @@ def main():
     app.add_error_handler(error_handler)
     app.add_handler(CommandHandler("tips", manage_tips))
     logger.info("🚀 Teeshoot bot is running...")
-    app.run_polling()
+    try:
+        app.run_polling()
+    finally:
+        save_scheduler.close()
 
 if __name__ == "__main__":
     main()
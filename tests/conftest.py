@@ -0,0 +1,83 @@
+"""Every test gets a fresh copy of bot.py, run from its own empty directory"""
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+BOT_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bot.py")
+
+
+@pytest.fixture
+def new_bot(tmp_path, monkeypatch):
+    """Factory for more copies of bot.py sharing the test's directory, like a restarted process"""
+    pytest.importorskip("telegram")
+    monkeypatch.chdir(tmp_path)
+    loaded = []
+
+    def load():
+        spec = importlib.util.spec_from_file_location("bot", BOT_PY)
+        module = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, "bot", module)
+        spec.loader.exec_module(module)
+        loaded.append(module)
+        return module
+
+    yield load
+    for module in loaded:
+        module.save_scheduler.close()
+
+
+@pytest.fixture
+def bot(new_bot):
+    return new_bot()
+
+
+LEGACY_DATA = {
+    "user_data": {
+        "7": {"name": "Ada", "phone": "08012345678", "email": "", "department": "CSC", "room": "", "room_number": "",
+              "requests": 2, "last_order": "ORD1234", "preferred_tech": "", "notifications_enabled": True},
+    },
+    "orders": {
+        "ORD1234": {"user_id": 7, "username": "ada", "name": "Ada", "item": "battery",
+                    "details": {"model": "HP", "total": 12000}, "status": "delivered", "timestamp": "2025-03-04 10:11:12"},
+        "ORD5678": {"user_id": 7, "username": "ada", "name": "Ada", "item": "charger",
+                    "details": {"model": "Dell"}, "status": "pending_confirmation", "timestamp": "2025-03-05 09:00:00"},
+    },
+    "issues": {
+        "ISS1111": {"user_id": 7, "username": "ada", "name": "Ada", "type": "screen",
+                    "details": {"description": "Cracked — ₦ quote please"}, "status": "reported", "timestamp": "2025-03-06 12:00:00"},
+    },
+    "callbacks": {
+        "CB2222": {"user_id": 7, "username": None, "name": "Ada", "phone_and_issue": "08012345678 fan noise",
+                   "status": "pending", "timestamp": "2025-03-07 08:30:00"},
+    },
+    "inquiries": {
+        "INQ3333": {"user_id": 7, "username": "ada", "name": "Ada", "inquiry_type": "other",
+                    "inquiry_text": "Do you fix hinges?", "status": "pending_response", "timestamp": "2025-03-08 16:45:00"},
+    },
+    "user_states": {"7": {"action": "purchase", "step": "model", "item": "battery"}},
+    "item_prices": {"battery": {"HP": 15000, "Dell": 13000}},
+    "admin_ids": [7160317469, 42],
+    "technicians": [{"name": "Tunde", "phone": "08098765432", "specialty": "Screens"}],
+    "payment_info": {"bank": "Test Bank", "account_name": "Teeshoot", "account_number": "0123456789"},
+    "inquiry_responses": {"hours": "We open 9–5"},
+    "tips_guides": {"Battery care": "Don't leave it at 100%"},
+}
+
+
+@pytest.fixture
+def legacy_data():
+    """What the single-file bot wrote to teeshoot_data.json"""
+    return json.loads(json.dumps(LEGACY_DATA))
+
+
+@pytest.fixture
+def write_legacy(tmp_path):
+    """Write data the way the single-file bot did: one file, json.dump(indent=2)"""
+    def write(data, name="teeshoot_data.json"):
+        with open(tmp_path / name, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return tmp_path / name
+    return write
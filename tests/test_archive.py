@@ -0,0 +1,73 @@
+import asyncio
+
+
+def _cold_orders(bot, n):
+    old = bot.now_ts() - (bot.ARCHIVE_AFTER_DAYS + 5) * 86400
+    for i in range(n):
+        rid = f"ORD{i:04d}"
+        bot.orders[rid] = bot.Order(1, "ada", "Ada", "battery", {"total": 1000}, status="delivered", timestamp=old + i)
+        bot.save_record("orders", rid)
+
+
+def test_archive_moves_cold_terminal_requests(bot):
+    bot.load_all()
+    _cold_orders(bot, 3)
+    assert asyncio.run(bot.archive_cold_requests()) == 3
+    assert not bot.orders
+    category, record = bot.find_archived("ORD0001")
+    assert (category, record.status) == ("orders", "delivered")
+
+
+def test_request_changed_during_archive_write_stays_hot(bot, monkeypatch):
+    bot.load_all()
+    _cold_orders(bot, 3)
+    write_archive = bot._write_archive
+
+    def reopened_meanwhile(batches):
+        write_archive(batches)
+        bot.orders["ORD0001"].status = "confirmed"  # an admin reopens it during the await
+
+    monkeypatch.setattr(bot, "_write_archive", reopened_meanwhile)
+    assert asyncio.run(bot.archive_cold_requests()) == 2
+    assert list(bot.orders) == ["ORD0001"]
+    assert bot.orders["ORD0001"].status == "confirmed"
+    assert bot.request_registry.get("ORD0001")[0] == "orders"
+
+
+def test_unknown_ids_never_open_a_segment(bot, monkeypatch):
+    import gzip
+
+    bot.load_all()
+    _cold_orders(bot, 2)
+    archived = bot.new_request_id("orders")  # files under this month's segment
+    bot.orders[archived] = bot.Order(1, "ada", "Ada", "battery", {}, status="delivered", timestamp=bot.orders["ORD0000"].timestamp)
+    bot.save_record("orders", archived)
+    unknown = bot.new_request_id("orders")  # names the same segment, but was never archived
+    asyncio.run(bot.archive_cold_requests())
+    opened = []
+    gzip_open = gzip.open
+
+    def recording(path, *args, **kwargs):
+        opened.append(path)
+        return gzip_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(gzip, "open", recording)
+    for rid in [unknown, "ORD9999", "ISS0001"] * 3:
+        assert bot.find_archived(rid) is None
+    assert opened == []
+    assert bot.find_archived(archived)[0] == "orders"
+    assert bot.find_archived(archived)[0] == "orders"  # cached
+    assert len(opened) == 1
+
+
+def test_index_picks_up_another_process_archiving(bot, new_bot):
+    bot.load_all()
+    assert bot.find_archived("ORD0001") is None
+    other = new_bot()
+    other.load_all()
+    _cold_orders(other, 3)
+    asyncio.run(other.archive_cold_requests())
+
+    bot.load_all()
+    category, record = bot.find_archived("ORD0001")
+    assert (category, record.status) == ("orders", "delivered")
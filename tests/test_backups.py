@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+
+def _setup(bot):
+    bot.load_all()
+    bot.orders["ORD0001"] = bot.Order(1, "ada", "Ada", "battery", {"total": 1000})
+    bot.save_record("orders", "ORD0001")
+    bot.save_all()
+    return bot.take_backup()
+
+
+def test_restore_brings_back_the_generation(bot, new_bot):
+    name = _setup(bot)
+    bot.orders["ORD0001"].name = "Changed"
+    bot.save_record("orders", "ORD0001")
+    bot._restore_files(name)
+    assert any(g.endswith("-pre-restore") for g in bot.list_backups())
+    fresh = new_bot()
+    fresh.load_all()
+    assert fresh.orders["ORD0001"].name == "Ada"
+
+
+def test_missing_generation_takes_no_pre_restore_backup(bot):
+    _setup(bot)
+    before = bot.list_backups()
+    with pytest.raises(ValueError):
+        bot._restore_files("20990101-000000")
+    assert bot.list_backups() == before
+
+
+def test_damaged_generation_is_refused_before_touching_anything(bot):
+    name = _setup(bot)
+    with open(os.path.join(bot.BACKUP_DIR, name, "orders.json"), "w") as f:
+        f.write('{"ORD0001": {"user_id": 1,')
+    before = bot.list_backups()
+    with pytest.raises(ValueError, match="damaged"):
+        bot._restore_files(name)
+    assert bot.list_backups() == before
+
+
+def test_incomplete_generation_is_refused(bot):
+    name = _setup(bot)
+    os.remove(os.path.join(bot.BACKUP_DIR, name, "orders.json"))
+    with pytest.raises(ValueError, match="incomplete"):
+        bot._restore_files(name)
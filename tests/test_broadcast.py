@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeBot:
+    """send_message() records each send; script[user] lists errors to raise first"""
+
+    def __init__(self, script=None):
+        self.script = script or {}
+        self.sent = []  # (user, parse_mode, monotonic time)
+        self.failed = []  # (user, error, monotonic time)
+        self.edits = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        errors = self.script.get(chat_id)
+        if errors:
+            error = errors.pop(0)
+            self.failed.append((chat_id, error, time.monotonic()))
+            raise error
+        self.sent.append((chat_id, parse_mode, time.monotonic()))
+
+    async def edit_message_text(self, chat_id, message_id, text):
+        self.edits.append(text)
+
+
+@pytest.fixture
+def bcast(bot, monkeypatch):
+    monkeypatch.setattr(bot, "broadcast_bucket", bot.TokenBucket(1000))
+    return bot
+
+
+def _run(bot, fake, recipients, text="Hello *all*"):
+    async def scenario():
+        bc = bot.Broadcast.create(text, recipients, chat=1, message=2)
+        await bot.run_broadcast(fake, bc)
+        return bot.Broadcast.load(bc.path[:-len(".jsonl")] + ".done")  # the log as left on disk
+
+    return asyncio.run(scenario())
+
+
+def test_everyone_is_reached_and_the_log_is_renamed_done(bcast):
+    fake = FakeBot()
+    bc = _run(bcast, fake, list(range(100, 140)))
+    assert sorted(uid for uid, _, _ in fake.sent) == list(range(100, 140))
+    assert bc.done and not os.path.exists(bc.path[:-len(".done")] + ".jsonl")
+    assert bc.counts() == {"sent": 40, "blocked": 0, "failed": 0}
+    assert fake.edits[-1].startswith("📣 Broadcast finished") and "✅ 40 delivered" in fake.edits[-1]
+
+
+def test_sends_keep_to_the_rate(bcast, monkeypatch):
+    monkeypatch.setattr(bcast, "broadcast_bucket", bcast.TokenBucket(50))
+    fake = FakeBot()
+    _run(bcast, fake, list(range(60)))
+    times = sorted(t for _, _, t in fake.sent)
+    assert times[-1] - times[0] >= 59 / 50 * 0.9
+    window = 0.5
+    busiest = max(sum(1 for t in times if start <= t < start + window) for start in times)
+    assert busiest <= 50 * window + 1
+
+
+def test_retry_after_pauses_every_sender(bcast, monkeypatch):
+    monkeypatch.setattr(bcast, "broadcast_bucket", bcast.TokenBucket(100))
+    fake = FakeBot({5: [bcast.RetryAfter(0.2)]})
+    bc = _run(bcast, fake, list(range(40)))
+    (_, _, hit), = fake.failed
+    after = [t for uid, _, t in fake.sent if t > hit]
+    assert after and min(after) - hit >= 1.2 - 0.05  # retry_after plus a second's margin
+    assert 5 in [uid for uid, _, _ in fake.sent]
+    assert bc.counts()["sent"] == 40
+
+
+def test_blocked_users_are_recorded_as_blocked(bcast):
+    fake = FakeBot({3: [bcast.Forbidden("Forbidden: bot was blocked by the user")]})
+    bc = _run(bcast, fake, [1, 2, 3])
+    assert bc.outcomes == {1: "sent", 2: "sent", 3: "blocked"}
+    with open(bc.path, encoding="utf-8") as f:
+        assert {"u": 3, "r": "blocked"} in [json.loads(line) for line in f]
+
+
+def test_markdown_parse_error_is_resent_as_plain_text(bcast):
+    fake = FakeBot({2: [bcast.BadRequest("Can't parse entities: can't find end of the entity")],
+                    3: [bcast.BadRequest("Chat not found")]})
+    bc = _run(bcast, fake, [1, 2, 3], text="50% off *today")
+    assert [(uid, mode) for uid, mode, _ in fake.sent] == [(1, bcast.ParseMode.MARKDOWN), (2, None)]
+    assert bc.outcomes == {1: "sent", 2: "sent", 3: "failed"}
+
+
+def test_restart_resumes_with_whoever_was_not_reached(bcast):
+    bc = bcast.Broadcast.create("Hello", [1, 2, 3, 4, 5], chat=1, message=2)
+    bc.record(1, "sent")
+    bc.record(2, "blocked")
+    bc.sync()  # and then the process died
+    fake = FakeBot()
+
+    async def restart():
+        app = SimpleNamespace(bot=fake, bot_data={})
+        await bcast.start_background_tasks(app)
+        assert set(bcast._broadcast_tasks) == {bc.id}
+        await asyncio.gather(*bcast._broadcast_tasks.values())
+        for name in ("archive_task", "backup_task"):
+            app.bot_data[name].cancel()
+
+    asyncio.run(restart())
+    assert sorted(uid for uid, _, _ in fake.sent) == [3, 4, 5]
+    done = bcast.Broadcast.load(bc.path[:-len(".jsonl")] + ".done")
+    assert done.done and done.counts() == {"sent": 4, "blocked": 1, "failed": 0}
+    assert bcast.resume_broadcasts(fake) == 0
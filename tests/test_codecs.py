@@ -0,0 +1,95 @@
+import importlib.util
+import json
+
+import pytest
+
+CODECS = ["pickle", pytest.param("msgpack", marks=pytest.mark.skipif(
+    importlib.util.find_spec("msgpack") is None, reason="msgpack is not installed"))]
+
+
+def _fill(bot):
+    for i in range(5):
+        rid = f"ORD{i:07d}"
+        bot.orders[rid] = bot.Order(1, "ada", f"Student {i}", "battery", {"model": "HP", "total": 12000 + i})
+        bot.save_record("orders", rid)
+    bot.user_data_store[7] = bot.UserProfile(name="Ada", phone="08012345678")
+    bot.save_record("user_data", 7)
+    bot.TECHNICIANS = [{"name": "Tunde"}]
+    bot.save_record("technicians")
+
+
+def _state(bot):
+    return ({k: bot._encode_value("orders", v) for k, v in bot.orders.items()},
+            {k: bot._encode_value("user_data", v) for k, v in bot.user_data_store.items()},
+            bot.TECHNICIANS)
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_binary_snapshot_has_a_header_and_loads_anywhere(bot, new_bot, monkeypatch, codec):
+    bot.load_all()
+    _fill(bot)
+    monkeypatch.setattr(bot, "SNAPSHOT_CODEC", codec)
+    bot.save_all()
+    with open(bot.SHARDS["orders"].data_file, "rb") as f:
+        assert f.readline() == bot.SNAPSHOT_MAGIC + codec.encode() + b"\n"
+
+    fresh = new_bot()  # writes JSON itself, and reads the header to pick the codec
+    assert fresh.SNAPSHOT_CODEC == "json"
+    fresh.load_all()
+    assert _state(fresh) == _state(bot)
+
+
+def test_shards_written_by_different_codecs_load_together(bot, new_bot, monkeypatch):
+    bot.load_all()
+    _fill(bot)
+    bot.save_all()  # JSON everywhere
+    monkeypatch.setattr(bot, "SNAPSHOT_CODEC", "pickle")
+    bot.orders["ORD0000001"].status = "confirmed"
+    bot.save_record("orders", "ORD0000001")
+    bot.save_all()  # only the orders shard changed
+
+    with open(bot.SHARDS["orders"].data_file, "rb") as f:
+        assert f.read(len(bot.SNAPSHOT_MAGIC)) == bot.SNAPSHOT_MAGIC
+    with open(bot.SHARDS["user_data"].data_file, encoding="utf-8") as f:
+        assert json.load(f)["7"]["name"] == "Ada"
+    fresh = new_bot()
+    fresh.load_all()
+    assert _state(fresh) == _state(bot)
+
+
+def test_unavailable_codec_is_an_error(bot):
+    bot.load_all()
+    shard = bot.SHARDS["orders"]
+    with open(shard.data_file, "wb") as f:
+        f.write(bot.SNAPSHOT_MAGIC + b"zstd-json\n" + b"\x00")
+    with pytest.raises(ValueError, match="zstd-json"):
+        list(shard._snapshot_entries(shard.data_file))
+
+
+def test_convert_round_trip(bot, new_bot, capsys):
+    bot.load_all()
+    _fill(bot)
+    bot.save_all()
+    with open(bot.SHARDS["orders"].data_file, "rb") as f:
+        original = f.read()
+
+    new_bot().convert_data(["pickle"])
+    assert all(open(shard.data_file, "rb").read(len(bot.SNAPSHOT_MAGIC)) == bot.SNAPSHOT_MAGIC
+               for shard in bot.SHARDS.values())
+    pickled = new_bot()
+    pickled.load_all()
+    assert _state(pickled) == _state(bot)
+
+    new_bot().convert_data(["json"])
+    with open(bot.SHARDS["orders"].data_file, "rb") as f:
+        assert f.read() == original
+    assert "Converted" in capsys.readouterr().out
+
+
+def test_migrated_records_are_snapshotted_compactly(bot, legacy_data, write_legacy):
+    write_legacy(legacy_data)  # indent=2
+    bot.load_all()
+    with open(bot.SHARDS["orders"].data_file, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == len(legacy_data["orders"]) + 2  # braces, then one record per line
+    assert json.loads("\n".join(lines)).keys() == legacy_data["orders"].keys()
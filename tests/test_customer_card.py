@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+
+
+def _setup(bot):
+    bot.load_all()
+    bot.user_data_store[7] = bot.UserProfile(name="Ada Obi", phone="08031234567", department="Physics")
+    bot.save_record("user_data", 7)
+    return bot.Order(7, "ada", "Ada", "battery", {}), bot.Order(7, None, "Ada", "charger", {})
+
+
+def _profile_step(bot, step, text):
+    class Message:
+        async def reply_text(self, *args, **kwargs):
+            pass
+
+    message = Message()
+    message.text = text
+    update = SimpleNamespace(message=message, effective_user=SimpleNamespace(id=7))
+    asyncio.run(bot.handle_update_profile_input(update, SimpleNamespace(), {"action": "update_profile", "step": step}))
+
+
+def test_card_is_rendered_once(bot):
+    order, _ = _setup(bot)
+    card = bot.customer_card(order)
+    assert "📛 Name: Ada Obi" in card and "🏢 Department: Physics" in card
+    assert bot.customer_card(bot.Order(7, "ada", "Ada", "screen", {})) is card
+
+
+def test_profile_edit_renders_a_fresh_card(bot):
+    order, no_username = _setup(bot)
+    card, line = bot.customer_card(order), bot.customer_line(no_username)
+    assert line == "Ada | 08031234567"
+    _profile_step(bot, "phone", "08099998888")
+    _profile_step(bot, "department", "Chemistry")
+    fresh = bot.customer_card(order)
+    assert fresh is not card
+    assert "📞 Phone: 08099998888" in fresh and "🏢 Department: Chemistry" in fresh
+    assert bot.customer_line(no_username) == "Ada | 08099998888"
+
+
+def test_bump_user_req_renders_a_fresh_card(bot):
+    order, _ = _setup(bot)
+    card = bot.customer_card(order)
+    bot.bump_user_req(7, "ORD0001")
+    assert 7 not in bot._customer_cards
+    assert bot.customer_card(order) == card  # same text: the card does not show the count
+
+
+def test_card_for_a_new_username_is_its_own(bot):
+    order, _ = _setup(bot)
+    card = bot.customer_card(order)
+    renamed = bot.Order(7, "ada_obi", "Ada", "battery", {})
+    assert "@ada_obi" in bot.customer_card(renamed)
+    assert bot.customer_card(order) is card
+
+
+def test_reloaded_profile_renders_a_fresh_card(bot, new_bot):
+    order, _ = _setup(bot)
+    card = bot.customer_card(order)
+    other = new_bot()
+    other.load_all()
+    other.user_data_store[7].name = "Ada Lovelace"
+    other.save_record("user_data", 7)
+    bot.load_all()
+    assert "📛 Name: Ada Lovelace" in bot.customer_card(order)
+    assert bot.customer_card(order) is not card
@@ -0,0 +1,37 @@
+import time
+
+import pytest
+
+
+@pytest.mark.parametrize("level, expected", [("strict", 2), ("group", 1), ("relaxed", 0)])
+def test_sqlite_synchronous_follows_durability(bot, monkeypatch, level, expected):
+    monkeypatch.setattr(bot, "DURABILITY", level)
+    store = bot.SqliteStore("test.db")
+    assert store.conn.execute("PRAGMA synchronous").fetchone()[0] == expected
+
+
+def test_group_commit_lone_writer_does_not_wait_for_window(bot, tmp_path):
+    committer = bot.GroupCommitter(interval=5.0)
+    with open(tmp_path / "journal", "a") as f:
+        for _ in range(3):
+            f.write("x\n")
+            f.flush()
+            committer.add(f.fileno())
+            started = time.perf_counter()
+            assert committer.barrier().result(timeout=2) == 1
+            assert time.perf_counter() - started < 1
+    assert committer.syncs == 3
+
+
+def test_group_commit_covers_every_file_added(bot, tmp_path):
+    committer = bot.GroupCommitter(interval=0.01)
+    handles = [open(tmp_path / f"j{i}", "a") for i in range(4)]
+    try:
+        for f in handles:
+            f.write("x\n")
+            f.flush()
+            committer.add(f.fileno())
+        assert committer.barrier().result(timeout=2) == 4
+    finally:
+        for f in handles:
+            f.close()
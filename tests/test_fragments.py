@@ -0,0 +1,70 @@
+import json
+
+
+def _orders(bot, n):
+    for i in range(n):
+        rid = f"ORD{i:07d}"
+        bot.orders[rid] = bot.Order(1, "ada", f"Student {i}", "battery", {"model": "HP", "total": 12000})
+        bot.save_record("orders", rid)
+
+
+def _count_encodes(bot, monkeypatch):
+    encoded = []
+    encode_value = bot._encode_value
+
+    def counting(section, value):
+        encoded.append(section)
+        return encode_value(section, value)
+
+    monkeypatch.setattr(bot, "_encode_value", counting)
+    return encoded
+
+
+def test_snapshot_reencodes_only_edited_records(bot, monkeypatch):
+    bot.load_all()
+    _orders(bot, 20)
+    bot._shard_json("orders")
+    encoded = _count_encodes(bot, monkeypatch)
+
+    bot._shard_json("orders")
+    assert encoded == []
+    bot.orders["ORD0000003"].status = "confirmed"
+    bot.save_record("orders", "ORD0000003")
+    encoded.clear()
+    text = bot._shard_json("orders")
+    assert encoded == []  # the write-behind flush already cached the new fragment
+    assert json.loads(text)["ORD0000003"]["status"] == "confirmed"
+
+
+def test_edit_without_a_write_is_reencoded(bot, monkeypatch):
+    bot.load_all()
+    _orders(bot, 5)
+    bot._shard_json("orders")
+    encoded = _count_encodes(bot, monkeypatch)
+    bot.orders["ORD0000001"].name = "Bola"
+    bot._invalidate_fragment("orders", "ORD0000001")
+
+    text = bot._shard_json("orders")
+    assert encoded == ["orders"]
+    assert json.loads(text)["ORD0000001"]["name"] == "Bola"
+
+
+def test_snapshot_matches_a_full_encode(bot):
+    bot.load_all()
+    _orders(bot, 10)
+    bot.orders.pop("ORD0000004")
+    bot.save_record("orders", "ORD0000004")
+    full = {k: bot._encode_value("orders", v) for k, v in bot.orders.items()}
+    assert json.loads(bot._shard_json("orders")) == full
+    assert "ORD0000004" not in bot._fragments["orders"]
+
+
+def test_loaded_records_reuse_their_text_from_disk(bot, new_bot, monkeypatch):
+    bot.load_all()
+    _orders(bot, 5)
+    bot.save_all()
+    fresh = new_bot()
+    fresh.load_all()
+    encoded = _count_encodes(fresh, monkeypatch)
+    fresh._shard_json("orders")
+    assert encoded == []
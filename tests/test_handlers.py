@@ -0,0 +1,36 @@
+import asyncio
+from types import SimpleNamespace
+
+
+class Message:
+    def __init__(self, text):
+        self.text = text
+        self.reply_to_message = None
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+
+def _send(bot, user_id, text):
+    message = Message(text)
+    user = SimpleNamespace(id=user_id, username="student", first_name="Student")
+    update = SimpleNamespace(message=message, effective_user=user, effective_message=message, callback_query=None)
+    asyncio.run(bot.handle_message(update, SimpleNamespace(bot=None, args=[])))
+    return message.replies
+
+
+def test_my_requests_button_cancels_purchase_instead_of_being_the_model(bot):
+    bot.user_states[555] = {"action": "purchase", "step": "model", "item": "battery"}
+    replies = _send(bot, 555, "📋 My Requests")
+    assert 555 not in bot.user_states
+    assert "canceled" in replies[0]
+
+
+def test_every_main_menu_button_cancels_a_flow(bot):
+    buttons = [button.text for row in bot.MAIN_BTNS for button in row]
+    for user_id, text in enumerate(buttons, 1):  # one user each, so the flood guard stays out of it
+        bot.user_states[user_id] = {"action": "inquiry_other"}
+        replies = _send(bot, user_id, text)
+        assert user_id not in bot.user_states, text
+        assert "canceled" in replies[0], text
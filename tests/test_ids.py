@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+
+def test_ids_are_unique_and_sort_by_creation(bot):
+    ids = [bot.new_request_id("orders") for _ in range(500)]
+    assert len(set(ids)) == 500
+    assert ids == sorted(ids)
+    assert all(rid.startswith("ORD") and len(rid) == 3 + bot.ID_WIDTH for rid in ids)
+
+
+def test_ids_stay_unique_across_threads_and_a_restart(bot, new_bot):
+    ids = []
+
+    def allocate():
+        ids.extend(bot.new_request_id("issues") for _ in range(200))
+
+    threads = [threading.Thread(target=allocate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    restarted = new_bot()  # same high-water mark file, fresh process state
+    later = restarted.new_request_id("issues")
+    assert len(set(ids)) == 800
+    assert later > max(ids)
+
+
+def test_id_encodes_its_creation_time(bot):
+    before = bot.now_ts()
+    rid = bot.new_request_id("callbacks")
+    assert before - 1 <= bot.request_id_ts(rid) <= bot.now_ts() + 1
+    assert bot.request_id_ts("CB1234") is None
+
+
+@pytest.mark.parametrize("typed, expected", [
+    ("ORD1P0J7E2", "ORD1P0J7E2"),
+    ("  ord1p0j7e2 ", "ORD1P0J7E2"),
+    ("ORD1POJ7E2", "ORD1P0J7E2"),  # O typed for 0
+    ("ISS1LIJ7E2", "ISS111J7E2"),  # L and I typed for 1
+    ("CB1234", "CB1234"),  # older four-digit IDs
+    ("inq0042", "INQ0042"),
+    ("ORD1P0J7E", None),  # too short
+    ("ORD1P0J7EU", None),  # U is not in the alphabet
+    ("XYZ1P0J7E2", None),
+    ("hello", None),
+])
+def test_parse_request_id(bot, typed, expected):
+    assert bot.parse_request_id(typed) == expected
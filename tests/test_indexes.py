@@ -0,0 +1,56 @@
+import threading
+from types import SimpleNamespace
+
+
+def test_clear_section_while_another_section_loads(bot):
+    index = bot.TimeIndex()
+    errors = []
+
+    def load_issues():
+        try:
+            for i in range(100_000):
+                index.update("issues", f"ISS{i}", SimpleNamespace(timestamp=i))
+        except Exception as e:
+            errors.append(e)
+
+    loader = threading.Thread(target=load_issues)
+    loader.start()
+    while loader.is_alive():
+        for i in range(2000):
+            index.update("orders", f"ORD{i}", SimpleNamespace(timestamp=i))
+        index.clear_section("orders")
+    loader.join()
+    assert not errors
+    assert index.by_time["orders"] == []
+    assert len(index.by_time["issues"]) == 100_000
+
+
+def _make_requests(bot, n):
+    for section in bot.REQUEST_SECTIONS:
+        for i in range(n):
+            rid = bot.new_request_id(section)
+            if section == "orders":
+                record = bot.Order(i, "user", f"Student {i}", "battery", {"total": 1000})
+            elif section == "issues":
+                record = bot.Issue(i, "user", f"Student {i}", "hardware", {"description": "screen"})
+            elif section == "callbacks":
+                record = bot.CallbackReq(i, "user", f"Student {i}", "08030000000")
+            else:
+                record = bot.Inquiry(i, "user", f"Student {i}", "other", "question")
+            getattr(bot, section)[rid] = record
+            bot.save_record(section, rid)
+    bot.flush_saves()
+
+
+def test_parallel_load_rebuilds_every_index(bot, new_bot):
+    _make_requests(bot, 2000)
+    fresh = new_bot()
+    fresh.load_all()
+    for section in fresh.REQUEST_SECTIONS:
+        store = getattr(fresh, section)
+        assert len(store) == 2000
+        assert len(fresh.requests_by_time.by_time[section]) == 2000
+        assert fresh.request_stats.count(section) == 2000
+        assert set(fresh.request_registry.sections) >= set(store)
+        assert sum(len(ids) for ids in fresh.user_requests.by_user[section].values()) == 2000
+    assert fresh.request_stats.amount("orders") == 2000 * 1000
@@ -0,0 +1,85 @@
+import json
+import os
+
+
+def _order(bot, rid, name="Ada", status="pending_confirmation"):
+    bot.orders[rid] = bot.Order(1, "ada", name, "battery", {"model": "HP", "total": 12000}, status=status)
+    bot.save_record("orders", rid)
+
+
+def _journal(bot, section):
+    with open(bot.SHARDS[section].journal_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_mutations_append_to_the_journal_only(bot):
+    bot.load_all()
+    snapshot = bot._file_sig(bot.SHARDS["orders"].data_file)
+    _order(bot, "ORD0000001")
+    bot.orders["ORD0000001"].status = "confirmed"
+    bot.save_record("orders", "ORD0000001")
+    bot.orders.pop("ORD0000001")
+    bot.save_record("orders", "ORD0000001")
+
+    assert [entry["op"] for entry in _journal(bot, "orders")] == ["put", "put", "del"]
+    assert bot._file_sig(bot.SHARDS["orders"].data_file) == snapshot
+    assert not os.path.exists(bot.SHARDS["user_data"].journal_file)
+
+
+def test_restart_replays_the_journal_over_the_snapshot(bot, new_bot):
+    bot.load_all()
+    _order(bot, "ORD0000001")
+    _order(bot, "ORD0000002", name="Bola")
+    bot.orders["ORD0000001"].status = "confirmed"
+    bot.save_record("orders", "ORD0000001")
+    bot.orders.pop("ORD0000002")
+    bot.save_record("orders", "ORD0000002")
+    bot.TECHNICIANS = [{"name": "Tunde", "phone": "08012345678"}]
+    bot.save_record("technicians")
+
+    fresh = new_bot()
+    fresh.load_all()
+    assert list(fresh.orders) == ["ORD0000001"]
+    assert fresh.orders["ORD0000001"].status == "confirmed"
+    assert fresh.TECHNICIANS == [{"name": "Tunde", "phone": "08012345678"}]
+
+
+def test_replay_skips_a_torn_last_line(bot, new_bot):
+    bot.load_all()
+    _order(bot, "ORD0000001")
+    with open(bot.SHARDS["orders"].journal_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "s": "orders", "k": "ORD0000002", "v": {"user_id"')
+
+    fresh = new_bot()
+    fresh.load_all()
+    assert list(fresh.orders) == ["ORD0000001"]
+
+
+def test_interrupted_compaction_replays_both_journals_in_order(bot, new_bot):
+    bot.load_all()
+    _order(bot, "ORD0000001")
+    shard = bot.SHARDS["orders"]
+    shard._journal_fh.close()
+    shard._journal_fh = None
+    os.replace(shard.journal_file, shard.compacting_file)  # crashed before the snapshot landed
+    bot.orders["ORD0000001"].status = "confirmed"
+    bot.save_record("orders", "ORD0000001")
+
+    fresh = new_bot()
+    fresh.load_all()
+    assert fresh.orders["ORD0000001"].status == "confirmed"
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(bot, new_bot):
+    bot.load_all()
+    for i in range(5):
+        _order(bot, f"ORD{i:07d}")
+    bot.save_all()
+
+    shard = bot.SHARDS["orders"]
+    assert not shard.journal_exists()
+    with open(shard.data_file, encoding="utf-8") as f:
+        assert len(json.load(f)) == 5
+    fresh = new_bot()
+    fresh.load_all()
+    assert len(fresh.orders) == 5
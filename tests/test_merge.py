@@ -0,0 +1,22 @@
+def test_fields_changed_on_one_side_each_win(bot):
+    base = {"name": "Ada", "status": "pending", "phone": "0803"}
+    mine = {"name": "Ada L", "status": "pending", "phone": "0803"}
+    theirs = {"name": "Ada", "status": "confirmed", "phone": "0803"}
+    assert bot._merge_fields(base, mine, theirs) == {"name": "Ada L", "status": "confirmed", "phone": "0803"}
+
+
+def test_both_sides_changed_the_same_field_keeps_ours(bot):
+    base = {"status": "pending"}
+    assert bot._merge_fields(base, {"status": "cancelled"}, {"status": "confirmed"}) == {"status": "cancelled"}
+
+
+def test_nested_details_merge_per_key(bot):
+    base = {"details": {"model": "HP", "quantity": 1}}
+    mine = {"details": {"model": "HP EliteBook", "quantity": 1}}
+    theirs = {"details": {"model": "HP", "quantity": 2, "total": 24000}}
+    assert bot._merge_fields(base, mine, theirs) == {"details": {"model": "HP EliteBook", "quantity": 2, "total": 24000}}
+
+
+def test_fields_only_one_side_has_are_kept(bot):
+    merged = bot._merge_fields({"a": 1}, {"a": 1, "mine": True}, {"a": 1, "theirs": True})
+    assert merged == {"a": 1, "mine": True, "theirs": True}
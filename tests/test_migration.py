@@ -0,0 +1,46 @@
+import json
+import os
+
+
+def test_legacy_file_is_split_into_shards(bot, new_bot, legacy_data, write_legacy, tmp_path):
+    write_legacy(legacy_data)
+    with open(tmp_path / "teeshoot_data.json.journal", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "put", "s": "orders", "k": "ORD5678",
+                            "v": dict(legacy_data["orders"]["ORD5678"], status="confirmed")}) + "\n")
+    bot.load_all()
+
+    assert sorted(bot.orders) == ["ORD1234", "ORD5678"]
+    assert bot.orders["ORD5678"].status == "confirmed"  # the old journal was replayed
+    assert bot.user_data_store[7].name == "Ada"
+    assert bot.ADMIN_IDS == {7160317469, 42}
+    for section in bot.SHARDS:
+        assert os.path.exists(bot.SHARDS[section].data_file), section
+    with open(bot.SHARDS["orders"].data_file, encoding="utf-8") as f:
+        assert set(json.load(f)) == {"ORD1234", "ORD5678"}
+    assert not os.path.exists(tmp_path / "teeshoot_data.json")
+    assert os.path.exists(tmp_path / "teeshoot_data.json.migrated")
+    assert os.path.exists(tmp_path / "teeshoot_data.json.journal.migrated")
+
+    fresh = new_bot()
+    fresh.load_all()
+    assert fresh.orders["ORD5678"].status == "confirmed"
+    assert fresh.tips_guides == legacy_data["tips_guides"]
+
+
+def test_profile_edit_after_migration_touches_only_its_shard(bot, legacy_data, write_legacy):
+    write_legacy(legacy_data)
+    bot.load_all()
+    orders_sig = bot._file_sig(bot.SHARDS["orders"].data_file)
+    bot.user_data_store[7].phone = "08011112222"
+    bot.save_record("user_data", 7)
+    bot.save_all()
+    assert bot._file_sig(bot.SHARDS["orders"].data_file) == orders_sig
+    with open(bot.SHARDS["user_data"].data_file, encoding="utf-8") as f:
+        assert json.load(f)["7"]["phone"] == "08011112222"
+
+
+def test_corrupt_legacy_file_migrates_from_its_backup(bot, legacy_data, write_legacy, tmp_path):
+    write_legacy(legacy_data, name="teeshoot_data.json.bak")
+    (tmp_path / "teeshoot_data.json").write_text('{"orders": {"ORD1', encoding="utf-8")
+    bot.load_all()
+    assert sorted(bot.orders) == ["ORD1234", "ORD5678"]
@@ -0,0 +1,50 @@
+import pytest
+
+
+@pytest.fixture
+def matcher(bot):
+    return bot.ModelMatcher(["HP", "HP EliteBook 840", "Dell", "Lenovo", "Apple"])
+
+
+def test_exact_and_case_insensitive(bot, matcher):
+    assert matcher.match("my dell")[0] == ("Dell", bot.MATCH_EXACT)
+    assert matcher.match("LENOVO laptop")[0] == ("Lenovo", bot.MATCH_EXACT)
+
+
+def test_longest_model_wins_over_its_prefix(bot, matcher):
+    assert matcher.match("hp elitebook 840 g3") == [("HP EliteBook 840", bot.MATCH_EXACT)]
+
+
+def test_series_name_maps_to_brand(bot, matcher):
+    assert matcher.match("thinkpad t480")[0] == ("Lenovo", bot.MATCH_ALIAS)
+    assert matcher.match("Macbook air")[0] == ("Apple", bot.MATCH_ALIAS)
+
+
+def test_typos_fall_back_to_nearest_model(bot, matcher):
+    assert matcher.match("lenvo")[0] == ("Lenovo", bot.MATCH_TYPO)
+    assert matcher.match("thinkapd")[0] == ("Lenovo", bot.MATCH_TYPO)
+
+
+def test_short_words_never_typo_match(bot, matcher):
+    assert matcher.match("hq") == []
+    assert matcher.match("samsung") == []
+
+
+def test_exact_beats_alias_when_both_appear(bot, matcher):
+    ranked = matcher.match("dell or an inspiron-like thinkpad")
+    assert ranked[0] == ("Dell", bot.MATCH_EXACT)
+    assert ("Lenovo", bot.MATCH_ALIAS) in ranked
+
+
+def test_matcher_follows_price_edits(bot):
+    assert bot.model_matcher("battery").match("toshiba") == []
+    bot.ITEM_PRICES["battery"]["Toshiba"] = 9000
+    bot.save_record("item_prices", "battery")
+    assert bot.model_matcher("battery").match("toshiba satellite")[0][0] == "Toshiba"
+
+
+def test_choices_keyboard_indexes_models(bot):
+    markup = bot.model_choices_kb("battery", ["Dell", "HP"])
+    data = [row[0].callback_data for row in markup.inline_keyboard]
+    assert data == ["pmodel_0", "pmodel_1", "pmodel_none"]
+    assert markup.inline_keyboard[0][0].text.startswith("Dell")
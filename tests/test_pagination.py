@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+
+def _lists(seed):
+    rng = random.Random(seed)
+    rows = [(rng.randrange(1000), f"ORD{i:04d}") for i in range(rng.randrange(0, 120))]
+    lists = [[], [], []]
+    for row in rows:
+        lists[rng.randrange(3)].append(row)
+    return [sorted(l) for l in lists], sorted(rows, reverse=True)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_paging_older_visits_every_row_once_newest_first(bot, seed):
+    lists, newest_first = _lists(seed)
+    seen, cursor, more = [], None, True
+    while more:
+        page, more = bot.keyset_page(lists, cursor, older=True, size=7)
+        assert len(page) <= 7
+        seen.extend(page)
+        if page:
+            cursor = page[-1]
+            assert bot.keyset_has(lists, cursor, older=True) == more
+    assert seen == newest_first
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_paging_newer_from_the_oldest_row_walks_back(bot, seed):
+    lists, newest_first = _lists(seed)
+    if not newest_first:
+        return
+    oldest = newest_first[-1]
+    seen, cursor, more = [oldest], oldest, True
+    while more:
+        page, more = bot.keyset_page(lists, cursor, older=False, size=5)
+        if not page:
+            break
+        assert page == sorted(page, reverse=True)
+        seen = page + seen
+        cursor = page[0]
+    assert seen == newest_first
+
+
+def test_page_is_the_rows_just_past_the_cursor(bot):
+    lists = [[(1, "a"), (3, "c"), (5, "e")], [(2, "b"), (4, "d")]]
+    assert bot.keyset_page(lists, (4, "d"), older=True, size=2) == ([(3, "c"), (2, "b")], True)
+    assert bot.keyset_page(lists, (2, "b"), older=False, size=2) == ([(4, "d"), (3, "c")], True)
+    assert bot.keyset_page(lists, None, older=True, size=10) == ([(5, "e"), (4, "d"), (3, "c"), (2, "b"), (1, "a")], False)
@@ -0,0 +1,77 @@
+import random
+import re
+
+import pytest
+
+
+def _strip(text):
+    return re.sub(r"```|[`*_\s]", "", text)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_split_markdown_respects_limit_and_closes_entities(bot, seed):
+    rnd = random.Random(seed)
+    words = ["plain", "*bold words*", "_italic_", "`code`", "```\nblock of code\n```", "\n", "x" * 90]
+    text = " ".join(rnd.choice(words) for _ in range(rnd.randint(50, 400)))
+    limit = rnd.randint(40, 300)
+    pieces = bot.split_markdown(text, limit)
+    assert all(len(piece) <= limit for piece in pieces)
+    assert all(bot._open_entity(piece) == "" for piece in pieces[:-1])
+    assert _strip("".join(pieces)) == _strip(text)
+
+
+def test_split_markdown_keeps_short_text_whole(bot):
+    assert bot.split_markdown("*short*", 100) == ["*short*"]
+
+
+def test_open_entity(bot):
+    assert bot._open_entity("*bold* and _it") == "_"
+    assert bot._open_entity("`a * b` done") == ""
+    assert bot._open_entity(r"2 \* 3") == ""
+    assert bot._open_entity("```\ncode *") == "```"
+
+
+def _view(bot, blocks):
+    return bot.PagedView("t", "*Title*\n\n", lambda: len(blocks), lambda i: blocks[i], unit="items")
+
+
+def _nav(markup):
+    return {b.callback_data.split("_")[2]: b.callback_data for b in markup.inline_keyboard[0]
+            if b.callback_data.startswith("pg_")}
+
+
+def _follow(view, data):
+    _, _, direction, i, j = data.split("_")
+    return view.page(int(i), int(j), direction == "f")
+
+
+def test_paging_forward_and_back_covers_every_block(bot):
+    rnd = random.Random(1)
+    blocks = [f"*{n}* " + " ".join("word" for _ in range(rnd.randint(5, 1500))) + "\n" for n in range(40)]
+    view = _view(bot, blocks)
+    pages, (text, markup) = [], view.page()
+    while True:
+        assert len(text) <= 4096
+        pages.append(text)
+        nav = _nav(markup)
+        if "f" not in nav:
+            break
+        text, markup = _follow(view, nav["f"])
+    assert len(pages) > 3
+    body = "".join(pages)
+    assert all(f"*{n}*" in body for n in range(40))
+    assert "f" not in _nav(markup) and "b" in _nav(markup)
+
+    back = []
+    while "b" in _nav(markup):
+        text, markup = _follow(view, _nav(markup)["b"])
+        assert len(text) <= 4096
+        back.append(text)
+    assert "*0*" in back[-1]
+    assert "b" not in _nav(markup)
+
+
+def test_page_past_the_end_falls_back_to_first(bot):
+    view = _view(bot, ["one\n", "two\n"])
+    text, _ = view.page(50, 0)
+    assert text == view.page()[0]
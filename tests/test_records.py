@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+
+TS = 1741079472  # 2025-03-04 10:11:12 Nigeria time
+
+
+def test_timestamp_text_round_trip(bot):
+    assert bot.fmt_ts(TS) == "2025-03-04 10:11:12"
+    assert bot.parse_ts("2025-03-04 10:11:12") == TS
+    assert bot.parse_ts(TS) == TS
+    for ts in (0, 86399, 86400, TS, 4102444799):
+        assert bot.parse_ts(bot.fmt_ts(ts)) == ts
+
+
+def _records(bot):
+    return {
+        "orders": ("ORD1234", bot.Order(7, "ada", "Ada", "battery", {"model": "HP"}, status="delivered", timestamp=TS)),
+        "issues": ("ISS1234", bot.Issue(7, "ada", "Ada", "screen", {"description": "cracked"}, timestamp=TS + 1)),
+        "callbacks": ("CB1234", bot.CallbackReq(7, None, "Ada", "0801 fan", timestamp=TS + 2)),
+        "inquiries": ("INQ1234", bot.Inquiry(7, "ada", "Ada", "other", "hinges?", timestamp=TS + 3)),
+    }
+
+
+def _save(bot):
+    for section, (key, record) in _records(bot).items():
+        globals_store = getattr(bot, bot.KEYED_SECTIONS[section])
+        globals_store[key] = record
+        bot.save_record(section, key)
+
+
+def _check(loaded):
+    for section, (key, record) in _records(loaded).items():
+        got = getattr(loaded, loaded.KEYED_SECTIONS[section])[key]
+        assert type(got.timestamp) is int and got.timestamp == record.timestamp, section
+
+
+@pytest.mark.parametrize("compact", [False, True], ids=["journal", "snapshot"])
+def test_timestamps_survive_the_journal_and_snapshots(bot, new_bot, compact):
+    bot.load_all()
+    _save(bot)
+    if compact:
+        bot.save_all()
+        with open(bot.SHARDS["orders"].data_file, encoding="utf-8") as f:
+            assert json.load(f)["ORD1234"]["timestamp"] == "2025-03-04 10:11:12"
+    else:
+        with open(bot.SHARDS["orders"].journal_file, encoding="utf-8") as f:
+            assert json.loads(f.readline())["v"]["timestamp"] == "2025-03-04 10:11:12"
+    fresh = new_bot()
+    fresh.load_all()
+    _check(fresh)
+
+
+def test_timestamps_survive_sqlite(new_bot, monkeypatch):
+    monkeypatch.setenv("TEESHOOT_STORAGE", "sqlite")
+    bot = new_bot()
+    bot.load_all()
+    _save(bot)
+    row = bot._sqlite_store().conn.execute("SELECT timestamp FROM orders WHERE id = 'ORD1234'").fetchone()
+    assert row[0] == "2025-03-04 10:11:12"
+    fresh = new_bot()
+    fresh.load_all()
+    _check(fresh)
+
+
+def test_timestamps_survive_the_archive(bot, monkeypatch):
+    bot.load_all()
+    _save(bot)
+    monkeypatch.setattr(bot, "ARCHIVE_AFTER_DAYS", 0)
+    assert asyncio.run(bot.archive_cold_requests()) == 1
+    category, record = bot.find_archived("ORD1234")
+    assert category == "orders" and record.timestamp == TS
+
+
+def test_slotted_records_load_old_data(bot, legacy_data, write_legacy):
+    legacy_data["orders"]["ORD1234"].pop("details")  # fields added later take their defaults
+    write_legacy(legacy_data)
+    bot.load_all()
+    order = bot.orders["ORD1234"]
+    assert (order.timestamp, order.version, order.details) == (TS, 0, {})
+    assert not hasattr(order, "__dict__")
+    assert bot.user_data_store[7].version == 0
+
+
+def test_vocabulary_fields_are_interned(bot):
+    row = {"user_id": 7, "username": "ada", "name": "Ada", "item": "battery", "details": {},
+           "status": "".join(["deliv", "ered"]), "timestamp": TS}
+    first, second = bot._decode_record("orders", row), bot._decode_record("orders", dict(row))
+    assert first.status is second.status is bot._decode_record("orders", dict(row, status="delivered")).status
+
+
+def test_rows_saved_before_versions_load(bot):
+    row = {"user_id": 7, "username": "ada", "name": "Ada", "item": "battery", "details": {},
+           "status": "delivered", "timestamp": "2025-03-04 10:11:12", "version": None}
+    assert bot._decode_record("orders", row).version == 0
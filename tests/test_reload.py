@@ -0,0 +1,64 @@
+def _order(bot, rid, name="Ada"):
+    bot.orders[rid] = bot.Order(1, "ada", name, "battery", {"model": "HP", "total": 12000})
+    bot.save_record("orders", rid)
+
+
+def _loaded_pair(bot, new_bot, n=5):
+    bot.load_all()
+    for i in range(n):
+        _order(bot, f"ORD{i:07d}")
+    other = new_bot()
+    other.load_all()
+    return other
+
+
+def test_reload_without_changes_reads_nothing(bot, new_bot, monkeypatch):
+    other = _loaded_pair(bot, new_bot)
+    reads = []
+    monkeypatch.setattr(other.Shard, "read_changes", lambda shard: reads.append(shard.section))
+    other.load_all()
+    assert reads == []
+
+
+def test_reload_replays_only_the_journal_tail(bot, new_bot):
+    other = _loaded_pair(bot, new_bot)
+    _order(bot, "ORD0000009", name="Bola")
+    bot.orders["ORD0000001"].status = "confirmed"
+    bot.save_record("orders", "ORD0000001")
+
+    kind, snapshot, entries, _ = other.SHARDS["orders"].read_changes()
+    assert (kind, snapshot) == ("tail", None)
+    assert [entry["k"] for entry in entries] == ["ORD0000009", "ORD0000001"]
+    untouched = other.orders["ORD0000002"]
+    other.load_all()
+    assert other.orders["ORD0000009"].name == "Bola"
+    assert other.orders["ORD0000001"].status == "confirmed"
+    assert other.orders["ORD0000002"] is untouched
+    assert other.SHARDS["orders"].read_changes() is None
+
+
+def test_reload_after_compaction_applies_only_the_differences(bot, new_bot, monkeypatch):
+    other = _loaded_pair(bot, new_bot)
+    bot.orders["ORD0000001"].status = "confirmed"
+    bot.save_record("orders", "ORD0000001")
+    bot.orders.pop("ORD0000003")
+    bot.save_record("orders", "ORD0000003")
+    bot.save_all()  # new snapshot, journal retired
+
+    kind = other.SHARDS["orders"].read_changes()[0]
+    assert kind == "full"
+    put = []
+    put_entity = other._put_entity
+
+    def recording(section, key, *args):
+        put.append(key)
+        put_entity(section, key, *args)
+
+    monkeypatch.setattr(other, "_put_entity", recording)
+    untouched = other.orders["ORD0000002"]
+    other.load_all()
+    assert put == ["ORD0000001"]
+    assert other.orders["ORD0000001"].status == "confirmed"
+    assert "ORD0000003" not in other.orders
+    assert other.orders["ORD0000002"] is untouched
+    assert other.request_registry.get("ORD0000003") is None
@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+
+def _shown(rendered):
+    """Text of a rendered string, or the button labels of a rendered markup"""
+    if isinstance(rendered, str):
+        return rendered
+    return " ".join(button.text for row in rendered.inline_keyboard for button in row)
+
+
+def _edit_prices(bot):
+    bot.ITEM_PRICES["battery"]["Toshiba"] = 9000
+    bot.save_record("item_prices", "battery")
+
+
+def _add_item(bot):
+    bot.ITEM_PRICES["toshiba_fan"] = {"Any": 5000}
+    bot.save_record("item_prices", "toshiba_fan")
+
+
+def _edit_tips(bot):
+    bot.tips_guides["Toshiba care"] = "Keep the vents clear"
+    bot.save_record("tips_guides", "Toshiba care")
+
+
+def _edit_responses(bot):
+    bot.inquiry_responses["Toshiba parts"] = "In stock"
+    bot.save_record("inquiry_responses", "Toshiba parts")
+
+
+def _edit_technicians(bot):
+    bot.TECHNICIANS.append({"name": "Toshiba Tunde", "contact": "0801", "rating": "5/5", "fee": "₦1", "area": "Annex"})
+    bot.save_record("technicians")
+
+
+def _edit_payment(bot):
+    bot.PAYMENT_INFO["bank_name"] = "Toshiba Bank"
+    bot.save_record("payment_info")
+
+
+RENDERS = [
+    (_edit_prices, "_price_list_text", ()),
+    (_edit_prices, "_item_price_text", ("battery",)),
+    (_add_item, "_manage_prices_kb", ()),
+    (_add_item, "_purchase_menu_kb", ()),
+    (_edit_tips, "_tips_menu_kb", ()),
+    (_edit_responses, "_inquiry_menu_kb", ()),
+    (_edit_technicians, "_technicians_text", ()),
+    (_edit_payment, "_payment_info_text", ()),
+]
+
+
+@pytest.mark.parametrize("edit, render, args", RENDERS, ids=[r[1] for r in RENDERS])
+def test_edit_invalidates_the_cached_render(bot, edit, render, args):
+    bot.load_all()
+    build = getattr(bot, render)
+    before = build(*args)
+    assert build(*args) is before  # built once per version
+    assert "Toshiba" not in _shown(before)
+    edit(bot)
+    after = build(*args)
+    assert after is not before
+    assert "Toshiba" in _shown(after)
+
+
+def test_unrelated_edit_keeps_the_cached_render(bot):
+    bot.load_all()
+    prices = bot._price_list_text()
+    _edit_tips(bot)
+    assert bot._price_list_text() is prices
+
+
+def test_reload_of_another_process_edit_invalidates(bot, new_bot):
+    bot.load_all()
+    other = new_bot()
+    other.load_all()
+    before = bot._technicians_text()
+    _edit_technicians(other)
+    _edit_prices(other)
+    bot.load_all()
+    assert "Toshiba Tunde" in bot._technicians_text()
+    assert "Toshiba" in bot._price_list_text() and bot._technicians_text() is not before
+
+
+def test_new_item_shows_up_before_its_first_model(bot):
+    bot.load_all()
+    replies = []
+
+    class Message:
+        def __init__(self, text):
+            self.text = text
+
+        async def reply_text(self, text, **kwargs):
+            replies.append(text)
+
+    menu = bot._manage_prices_kb()
+    state = {"action": "admin_price", "step": "new_item"}
+    update = SimpleNamespace(message=Message("Cooling Pad"), effective_user=SimpleNamespace(id=bot.CLIENT_ID))
+    asyncio.run(bot.handle_admin_price_input(update, SimpleNamespace(), state))
+    assert state["step"] == "new_models"
+    assert bot._manage_prices_kb() is not menu
+    assert "Cooling Pad" in _shown(bot._manage_prices_kb())
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import threading
+
+
+def _order(bot, rid, name="Ada"):
+    bot.orders[rid] = bot.Order(1, "ada", name, "battery", {"model": "HP", "total": 12000})
+    bot.save_record("orders", rid)
+
+
+def _journal_keys(bot, section="orders"):
+    with open(bot.SHARDS[section].journal_file, encoding="utf-8") as f:
+        return [json.loads(line)["k"] for line in f]
+
+
+def test_burst_of_saves_is_one_write(bot):
+    bot.load_all()
+    scheduler = bot.save_scheduler
+
+    async def burst():
+        for i in range(10):
+            _order(bot, "ORD0000001", name=f"Ada {i}")
+        _order(bot, "ORD0000002")
+        assert scheduler.writes_performed == 0  # nothing written until the delay passes
+        await asyncio.sleep(scheduler.delay + 0.3)
+
+    asyncio.run(burst())
+    assert (scheduler.saves_requested, scheduler.writes_performed, scheduler.records_written) == (11, 1, 2)
+    assert _journal_keys(bot) == ["ORD0000001", "ORD0000002"]
+    assert bot.orders["ORD0000001"].name == "Ada 9"
+
+
+def test_max_dirty_flushes_without_waiting(bot, monkeypatch):
+    bot.load_all()
+    monkeypatch.setattr(bot.save_scheduler, "max_dirty", 5)
+    monkeypatch.setattr(bot.save_scheduler, "delay", 60)
+
+    async def burst():
+        for i in range(5):
+            _order(bot, f"ORD{i:07d}")
+        await bot.save_scheduler.run(lambda: None)  # behind the write just handed over
+
+    asyncio.run(burst())
+    assert bot.save_scheduler.writes_performed == 1
+    assert len(_journal_keys(bot)) == 5
+
+
+def test_without_a_loop_saves_are_written_at_once(bot):
+    bot.load_all()
+    _order(bot, "ORD0000001")
+    _order(bot, "ORD0000002")
+    assert bot.save_scheduler.writes_performed == 2
+    assert _journal_keys(bot) == ["ORD0000001", "ORD0000002"]
+
+
+def test_writes_run_on_the_worker_thread(bot, monkeypatch):
+    bot.load_all()
+    threads = []
+    write_batch = bot._write_batch
+
+    def recording(batch):
+        threads.append(threading.current_thread())
+        return write_batch(batch)
+
+    monkeypatch.setattr(bot, "_write_batch", recording)
+
+    async def save():
+        _order(bot, "ORD0000001")
+        bot.save_scheduler.flush()
+        await bot.save_scheduler.run(lambda: None)
+
+    asyncio.run(save())
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_work_run_on_the_worker_sees_every_write_handed_over(bot, monkeypatch):
+    bot.load_all()
+    monkeypatch.setattr(bot.save_scheduler, "delay", 60)
+
+    async def scenario():
+        _order(bot, "ORD0000001")
+        _order(bot, "ORD0000002")
+        bot.save_scheduler.flush()  # hand over, do not wait
+        return await bot.save_scheduler.run(_journal_keys, bot)
+
+    assert asyncio.run(scenario()) == ["ORD0000001", "ORD0000002"]
+
+
+def test_edit_made_while_a_catch_up_reads_is_kept(bot, new_bot):
+    bot.load_all()
+    _order(bot, "ORD0000001")
+    other = new_bot()
+    other.load_all()
+    other.orders["ORD0000001"].status = "confirmed"
+    other.save_record("orders", "ORD0000001")
+
+    async def scenario():
+        changes = await bot.save_scheduler.run(bot._read_changes, ["orders"])
+        # The read is done but not applied: an edit lands in between
+        bot.orders["ORD0000001"].name = "Ada Lovelace"
+        bot.save_record("orders", "ORD0000001")
+        bot._apply_changes(changes)
+        bot.flush_saves()
+
+    asyncio.run(scenario())
+    assert (bot.orders["ORD0000001"].name, bot.orders["ORD0000001"].status) == ("Ada Lovelace", "confirmed")
+
+
+def test_settle_catches_up_in_a_task_on_the_loop(bot, new_bot, monkeypatch):
+    bot.load_all()
+    _order(bot, "ORD0000001")
+    other = new_bot()
+    other.load_all()
+    other.orders["ORD0000001"].status = "confirmed"
+    other.save_record("orders", "ORD0000001")
+
+    def blocking_catch_up(sections):
+        raise AssertionError("caught up on the loop thread")
+
+    monkeypatch.setattr(bot, "_catch_up", blocking_catch_up)
+
+    async def scenario():
+        bot.orders["ORD0000001"].name = "Ada Lovelace"
+        bot.save_record("orders", "ORD0000001")
+        bot.save_scheduler.flush()  # conflicts with the other process's write
+        while bot.save_scheduler._inflight or bot.save_scheduler._tasks or bot.save_scheduler.pending:
+            await asyncio.sleep(0.01)
+            if bot.save_scheduler.pending:
+                bot.save_scheduler.flush()
+
+    asyncio.run(scenario())
+    assert (bot.orders["ORD0000001"].name, bot.orders["ORD0000001"].status) == ("Ada Lovelace", "confirmed")
+    assert bot.save_scheduler.conflicts_merged == 1
+    fresh = new_bot()
+    fresh.load_all()
+    assert (fresh.orders["ORD0000001"].name, fresh.orders["ORD0000001"].status) == ("Ada Lovelace", "confirmed")
@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def shop(bot):
+    bot.user_data_store[7] = bot.UserProfile(name="Ada Obi", phone="+234 803 123 4567", department="Physics")
+    bot.user_data_store[8] = bot.UserProfile(name="Bola", phone="08099998888")
+    requests = [
+        ("orders", "ORD0001", bot.Order(7, "ada", "Ada Obi", "battery", {"model": "HP EliteBook"}, timestamp=100)),
+        ("orders", "ORD0002", bot.Order(8, "bola", "Bola", "charger", {"model": "Dell Latitude"}, timestamp=200)),
+        ("issues", "ISS0001", bot.Issue(8, "bola", "Bola", "screen", {"description": "Cracked screen after a fall"}, timestamp=300)),
+        ("callbacks", "CB0001", bot.CallbackReq(8, None, "Bola", "0701 234 5678 keyboard sticky", timestamp=400)),
+        ("inquiries", "INQ0001", bot.Inquiry(7, "ada", "Ada Obi", "other", "Do you fix hinges?", timestamp=500)),
+    ]
+    for section, rid, record in requests:
+        getattr(bot, bot.KEYED_SECTIONS[section])[rid] = record
+        bot.save_record(section, rid)
+    for uid in (7, 8):
+        bot.save_record("user_data", uid)
+    return bot
+
+
+def _ids(bot, query):
+    return [rid for _, rid in bot.search_requests(query)[0]]
+
+
+@pytest.mark.parametrize("written", ["08031234567", "+2348031234567", "234 803 123 4567", "0803-123-4567", "8031234567"])
+def test_phone_numbers_match_however_written(shop, written):
+    assert _ids(shop, written) == ["INQ0001", "ORD0001"]
+
+
+def test_phone_inside_a_callback_text(shop):
+    assert _ids(shop, "+234 701 234 5678") == ["CB0001"]
+    assert "07012345678" in shop.search_tokens("call 0701 234 5678 please")
+
+
+def test_terms_match_the_start_of_words(shop):
+    assert _ids(shop, "crack") == ["ISS0001"]
+    assert _ids(shop, "elite") == ["ORD0001"]
+    assert _ids(shop, "racked") == []
+
+
+def test_every_term_has_to_match(shop):
+    assert _ids(shop, "bola screen") == ["ISS0001"]
+    assert _ids(shop, "bola hinges") == []
+    assert shop.search_requests("bola")[1] == 3
+
+
+def test_profile_match_stands_for_all_the_users_requests(shop):
+    assert _ids(shop, "physics") == ["INQ0001", "ORD0001"]
+    assert _ids(shop, "physics hinges") == ["INQ0001"]
+
+
+def test_edits_deletes_and_archiving_update_the_index(shop, monkeypatch):
+    shop.issues["ISS0001"].details["description"] = "Broken hinge"
+    shop.save_record("issues", "ISS0001")
+    assert _ids(shop, "cracked") == []
+    assert _ids(shop, "hinge") == ["INQ0001", "ISS0001"]
+
+    shop.issues["ISS0001"].status = "resolved"  # not part of the text: still found
+    shop.save_record("issues", "ISS0001")
+    assert _ids(shop, "broken") == ["ISS0001"]
+
+    shop.orders.pop("ORD0002")
+    shop.save_record("orders", "ORD0002")
+    assert _ids(shop, "latitude") == []
+
+    monkeypatch.setattr(shop, "ARCHIVE_AFTER_DAYS", 0)
+    asyncio.run(shop.archive_cold_requests())  # the resolved issue leaves the hot set
+    assert _ids(shop, "broken") == []
+    assert "broken" not in shop.search_index.tokens("issues", "bro")
+
+
+def test_profile_edit_moves_the_users_requests(shop):
+    shop.user_data_store[7].department = "Chemistry"
+    shop.save_record("user_data", 7)
+    assert _ids(shop, "physics") == []
+    assert _ids(shop, "chem") == ["INQ0001", "ORD0001"]
+
+
+def test_search_command_lists_the_newest_matches(shop):
+    class Message:
+        replies = []
+
+        async def reply_text(self, text, **kwargs):
+            self.replies.append((text, kwargs.get("reply_markup")))
+
+    message = Message()
+    update = SimpleNamespace(message=message, effective_user=SimpleNamespace(id=shop.CLIENT_ID))
+    asyncio.run(shop.search_cmd(update, SimpleNamespace(args=["bola"])))
+    text, markup = message.replies[0]
+    assert text.startswith("🔎 3 requests match")
+    assert [row[0].callback_data for row in markup.inline_keyboard] == [
+        "admin_view_CB0001", "admin_view_ISS0001", "admin_view_ORD0002"]
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def sqlite_bot(new_bot, monkeypatch):
+    monkeypatch.setenv("TEESHOOT_STORAGE", "sqlite")
+
+    def load():
+        module = new_bot()
+        module.load_all()
+        return module
+
+    return load
+
+
+def _order(bot, rid, name="Ada", status="pending_confirmation"):
+    bot.orders[rid] = bot.Order(1, "ada", name, "battery", {"model": "HP", "total": 12000}, status=status)
+    bot.save_record("orders", rid)
+
+
+def test_records_survive_a_restart(sqlite_bot):
+    bot = sqlite_bot()
+    bot.user_data_store[7] = bot.UserProfile(name="Ada", phone="08012345678")
+    bot.save_record("user_data", 7)
+    _order(bot, "ORD0000001")
+    _order(bot, "ORD0000002", name="Bola")
+    bot.orders.pop("ORD0000002")
+    bot.save_record("orders", "ORD0000002")
+    bot.ITEM_PRICES["battery"]["Toshiba"] = 9000
+    bot.save_record("item_prices", "battery")
+    bot.TECHNICIANS = [{"name": "Tunde", "phone": "08012345678"}]
+    bot.save_record("technicians")
+
+    fresh = sqlite_bot()
+    assert list(fresh.orders) == ["ORD0000001"]
+    assert fresh.orders["ORD0000001"].details == {"model": "HP", "total": 12000}
+    assert fresh.orders["ORD0000001"].timestamp == bot.orders["ORD0000001"].timestamp
+    assert fresh.user_data_store[7].phone == "08012345678"
+    assert fresh.ITEM_PRICES["battery"]["Toshiba"] == 9000
+    assert fresh.TECHNICIANS == [{"name": "Tunde", "phone": "08012345678"}]
+
+
+def test_reload_reads_only_the_rows_changed(sqlite_bot, monkeypatch):
+    bot = sqlite_bot()
+    for i in range(50):
+        _order(bot, f"ORD{i:07d}")
+    other = sqlite_bot()
+    assert len(other.orders) == 50
+
+    bot.orders["ORD0000007"].status = "confirmed"
+    bot.save_record("orders", "ORD0000007")
+    bot.orders.pop("ORD0000008")
+    bot.save_record("orders", "ORD0000008")
+
+    store = other._sqlite_store()
+    changes_since = store.changes_since
+    read = []
+
+    def recording(epoch, seq):
+        result = changes_since(epoch, seq)
+        read.append(result)
+        return result
+
+    monkeypatch.setattr(store, "changes_since", recording)
+    asyncio.run(other.refresh_data())
+    (_, _, full, rows), = read
+    assert not full
+    assert sorted(key for _, key, _ in rows) == ["ORD0000007", "ORD0000008"]
+    assert other.orders["ORD0000007"].status == "confirmed"
+    assert "ORD0000008" not in other.orders
+    assert list(other.requests_by_status.newest("orders", ["confirmed"])) == ["ORD0000007"]
+
+    asyncio.run(other.refresh_data())  # nothing new: no read at all
+    assert len(read) == 1
+
+
+def test_new_epoch_makes_other_processes_reload_in_full(sqlite_bot):
+    bot = sqlite_bot()
+    _order(bot, "ORD0000001")
+    other = sqlite_bot()
+    store = bot._sqlite_store()
+    with store.lock:
+        # Behind the change log's back, as a restore from a backup copy would be
+        store.conn.execute("DELETE FROM orders")
+    store.new_epoch()
+
+    other.load_all()
+    assert not other.orders
@@ -0,0 +1,81 @@
+import asyncio
+
+TS = 1741079472  # 2025-03-04 10:11:12 Nigeria time
+DAY = (TS + 3600) // 86400
+
+
+def _buckets(bot, section="orders"):
+    stats = bot.request_stats
+    return (dict(stats.by_status[section]), dict(stats.by_day[section]),
+            dict(stats.revenue[section]), dict(stats.revenue_by_day[section]))
+
+
+def _recount(bot, section="orders"):
+    """The same buckets computed from scratch"""
+    expected = ({}, {}, {}, {})
+    for record in getattr(bot, section).values():
+        status, day, amount = bot.request_stats.key_of(record)
+        expected[0][status] = expected[0].get(status, 0) + 1
+        expected[1][day] = expected[1].get(day, 0) + 1
+        if amount:
+            expected[2][status] = expected[2].get(status, 0) + amount
+            expected[3][day] = expected[3].get(day, 0) + amount
+    return expected
+
+
+def _check(bot, new_bot, expected):
+    assert _buckets(bot) == expected == _recount(bot)
+    fresh = new_bot()
+    fresh.load_all()
+    assert _buckets(fresh) == expected
+
+
+def test_counters_follow_a_request_through_its_life(bot, new_bot, monkeypatch):
+    bot.load_all()
+    bot.orders["ORD0001"] = bot.Order(7, "ada", "Ada", "battery", {"total": 12000}, status="pending_confirmation", timestamp=TS)
+    bot.save_record("orders", "ORD0001")
+    bot.orders["ORD0002"] = bot.Order(8, "bola", "Bola", "charger", {"total": 5000}, status="confirmed", timestamp=TS + 86400)
+    bot.save_record("orders", "ORD0002")
+    _check(bot, new_bot, ({"pending_confirmation": 1, "confirmed": 1}, {DAY: 1, DAY + 1: 1},
+                          {"pending_confirmation": 12000, "confirmed": 5000}, {DAY: 12000, DAY + 1: 5000}))
+    assert bot.request_stats.count("orders", bot.AWAITING_STATUSES) == 1
+    assert bot.request_stats.amount("orders", bot.BOOKED_STATUSES) == 5000
+
+    bot.orders["ORD0001"].status = "delivered"
+    bot.orders["ORD0001"].details["total"] = 24000  # quantity changed on confirmation
+    bot.save_record("orders", "ORD0001")
+    _check(bot, new_bot, ({"delivered": 1, "confirmed": 1}, {DAY: 1, DAY + 1: 1},
+                          {"delivered": 24000, "confirmed": 5000}, {DAY: 24000, DAY + 1: 5000}))
+    assert bot.request_stats.amount("orders", bot.BOOKED_STATUSES) == 29000
+
+    monkeypatch.setattr(bot, "ARCHIVE_AFTER_DAYS", 0)
+    assert asyncio.run(bot.archive_cold_requests()) == 1
+    bot.flush_saves()
+    _check(bot, new_bot, ({"confirmed": 1}, {DAY + 1: 1}, {"confirmed": 5000}, {DAY + 1: 5000}))
+
+    bot.orders.pop("ORD0002")
+    bot.save_record("orders", "ORD0002")
+    _check(bot, new_bot, ({}, {}, {}, {}))
+    assert bot.request_stats.count("orders") == 0
+
+
+def test_days_lists_the_last_week_newest_first(bot):
+    bot.load_all()
+    for i, total in enumerate((1000, 2000, 4000)):
+        rid = f"ORD000{i}"
+        bot.orders[rid] = bot.Order(7, "ada", "Ada", "battery", {"total": total}, status="confirmed", timestamp=TS - i * 86400)
+        bot.save_record("orders", rid)
+    bot.issues["ISS0001"] = bot.Issue(7, "ada", "Ada", "screen", {}, timestamp=TS)
+    bot.save_record("issues", "ISS0001")
+    days = bot.request_stats.days("orders", 4, now=TS)
+    assert days == [("2025-03-04", 1, 1000), ("2025-03-03", 1, 2000), ("2025-03-02", 1, 4000), ("2025-03-01", 0, 0)]
+    assert bot.request_stats.days("issues", 1, now=TS) == [("2025-03-04", 1, 0)]
+
+
+def test_summary_reads_the_counters(bot):
+    bot.load_all()
+    bot.orders["ORD0001"] = bot.Order(7, "ada", "Ada", "battery", {"total": 12000}, status="confirmed")
+    bot.save_record("orders", "ORD0001")
+    summary = bot.stats_summary()
+    assert "₦12,000 confirmed/delivered" in summary
+    assert "confirmed 1" in summary
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+
+def _order(bot, rid, name="Ada", status="pending_confirmation"):
+    bot.orders[rid] = bot.Order(1, "ada", name, "battery", {"model": "HP", "total": 12000}, status=status)
+    bot.save_record("orders", rid)
+
+
+def test_reload_picks_up_another_process(bot, new_bot):
+    bot.load_all()
+    other = new_bot()
+    other.load_all()
+    _order(other, "ORD0000001")
+
+    assert asyncio.run(bot.refresh_data()) is None
+    assert bot.orders["ORD0000001"].name == "Ada"
+    assert bot.request_registry.get("ORD0000001")[0] == "orders"
+
+
+def test_concurrent_edits_to_different_fields_are_merged(bot, new_bot):
+    bot.load_all()
+    _order(bot, "ORD0000001")
+    other = new_bot()
+    other.load_all()
+    other.orders["ORD0000001"].status = "confirmed"
+    other.save_record("orders", "ORD0000001")
+
+    async def edit_here():
+        bot.orders["ORD0000001"].name = "Ada Lovelace"
+        bot.save_record("orders", "ORD0000001")
+        await bot.refresh_data()
+        bot.flush_saves()
+
+    asyncio.run(edit_here())
+    merged = bot.orders["ORD0000001"]
+    assert (merged.name, merged.status) == ("Ada Lovelace", "confirmed")
+    fresh = new_bot()
+    fresh.load_all()
+    assert (fresh.orders["ORD0000001"].name, fresh.orders["ORD0000001"].status) == ("Ada Lovelace", "confirmed")
+
+
+def test_refresh_does_not_block_the_loop_on_a_slow_write(bot, monkeypatch):
+    bot.load_all()
+    write_batch = bot._write_batch
+
+    def slow_write(batch):
+        time.sleep(0.5)
+        return write_batch(batch)
+
+    monkeypatch.setattr(bot, "_write_batch", slow_write)
+
+    async def scenario():
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        tick = asyncio.create_task(ticker())
+        _order(bot, "ORD0000001")
+        await bot.refresh_data()
+        tick.cancel()
+        return max(gaps)
+
+    assert asyncio.run(scenario()) < 0.2
+    bot.flush_saves()
+    assert bot.SHARDS["orders"].sigs() == bot.SHARDS["orders"].seen
+
+
+def test_compaction_from_the_loop_keeps_every_record(bot, new_bot, monkeypatch):
+    bot.load_all()
+    monkeypatch.setattr(bot, "JOURNAL_COMPACT_BYTES", 2000)
+
+    async def scenario():
+        for i in range(200):
+            _order(bot, f"ORD{i:07d}", name=f"Student {i}")
+            if i % 20 == 0:
+                bot.save_scheduler.flush()
+                await asyncio.sleep(0.01)
+        await bot.refresh_data()
+        while bot._compaction_task is not None and not bot._compaction_task.done():
+            await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    bot.flush_saves()
+    if bot._compaction_thread is not None:
+        bot._compaction_thread.join()
+    assert bot._compaction_thread is not None  # a compaction did run
+    fresh = new_bot()
+    fresh.load_all()
+    assert len(fresh.orders) == 200
+    assert fresh.orders["ORD0000199"].name == "Student 199"
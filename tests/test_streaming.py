@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+
+def _collect(entries):
+    """Rebuild the document from streamed (section, key, value[, text]) entries"""
+    data = {}
+    for section, key, value, *raw in entries:
+        if key is None:
+            data[section] = value
+        else:
+            data[section][key] = value
+            if raw:
+                assert json.loads(raw[0]) == value
+    return data
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, 64 * 1024])
+def test_indented_legacy_file_streams_like_json_load(bot, legacy_data, write_legacy, monkeypatch, chunk):
+    path = write_legacy(legacy_data)
+    stream = bot._JsonStream
+    monkeypatch.setattr(bot, "_JsonStream", lambda f: stream(f, chunk=chunk))
+    with open(path, encoding="utf-8") as f:
+        assert _collect(bot._iter_snapshot(f)) == legacy_data
+
+
+def test_buffer_stays_bounded_on_a_large_file(bot, legacy_data, write_legacy, monkeypatch):
+    order = legacy_data["orders"]["ORD1234"]
+    legacy_data["orders"] = {f"ORD{i:04d}": dict(order, name=f"Student {i}") for i in range(5000)}
+    path = write_legacy(legacy_data)
+    peak = []
+    fill = bot._JsonStream._fill
+
+    def measuring(self):
+        filled = fill(self)
+        peak.append(len(self.buf))
+        return filled
+
+    monkeypatch.setattr(bot._JsonStream, "_fill", measuring)
+    with open(path, encoding="utf-8") as f:
+        count = sum(1 for _, key, *_ in bot._iter_snapshot(f) if key is not None)
+    others = sum(len(legacy_data[section]) for section in bot.KEYED_SECTIONS if section != "orders")
+    assert count == 5000 + others
+    assert max(peak) <= 2 * bot.STREAM_CHUNK < path.stat().st_size / 4
+
+
+def test_values_larger_than_a_chunk_are_read_whole(bot, tmp_path):
+    big = {"a": "x" * 1000, "b": [list(range(300))], "c": 12345678901234567890}
+    path = tmp_path / "big.json"
+    path.write_text(json.dumps(big, indent=2), encoding="utf-8")
+    with open(path, encoding="utf-8") as f:
+        s = bot._JsonStream(f, chunk=16)
+        assert _collect(bot._iter_object(s, "big")) == {"big": big}
+
+
+def test_indented_shard_loads_into_the_stores(bot, new_bot, legacy_data, tmp_path):
+    (tmp_path / bot.DATA_DIR).mkdir()
+    with open(tmp_path / bot.DATA_DIR / "orders.json", "w", encoding="utf-8") as f:
+        json.dump(legacy_data["orders"], f, indent=2)
+    bot.load_all()
+    assert sorted(bot.orders) == ["ORD1234", "ORD5678"]
+    assert bot.orders["ORD1234"].details == {"model": "HP", "total": 12000}
+    assert list(bot.user_requests.ids(7, "orders")) == ["ORD5678", "ORD1234"]